@@ -0,0 +1,756 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JARVIS — Benchmark lar
+Ishlatish:
+  python bench.py             → hammasi
+  python bench.py scheduler   → faqat bittasi
+  python bench.py nlu --update-baseline   → NLU bazasini yangilash
+  python bench.py nlu --seed              → logs/*.log dan yangi gaplar
+"""
+import os, sys, time, tempfile, threading, tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def _line(title: str):
+    print("\n" + "=" * 55)
+    print(f"  {title}")
+    print("=" * 55)
+
+
+# ══════════════════════════════════════════════════════════
+#  SCHEDULER — 10k eslatma, thread soni va xotira
+# ══════════════════════════════════════════════════════════
+def bench_scheduler(n: int = 10_000):
+    from modules import reminders
+    from modules.reminders import set_reminder, list_reminders, cancel_reminder
+    # Haqiqiy data/reminders.jsonl ga tegmaslik uchun
+    reminders.REMINDERS_FILE = os.path.join(tempfile.mkdtemp(), "reminders.jsonl")
+
+    _line(f"Scheduler: {n} ta kutilayotgan eslatma")
+    threads_before = threading.active_count()
+    tracemalloc.start()
+
+    t0  = time.perf_counter()
+    ids = [set_reminder(3600 + i, f"eslatma {i}") for i in range(n)]
+    t_set = time.perf_counter() - t0
+
+    threads_after = threading.active_count()
+    mem_cur, mem_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    t0 = time.perf_counter()
+    for _ in range(20):
+        rows = list_reminders()
+    t_list = (time.perf_counter() - t0) / 20
+
+    t0 = time.perf_counter()
+    for rid in ids[::2]:
+        cancel_reminder(rid)
+    t_cancel = time.perf_counter() - t0
+    left = len(list_reminders())
+    for rid in ids[1::2]:
+        cancel_reminder(rid)
+
+    print(f"  set_reminder      : {t_set / n * 1e6:8.2f} µs/ta")
+    print(f"  cancel_reminder   : {t_cancel / (n // 2) * 1e6:8.2f} µs/ta")
+    print(f"  list_reminders    : {t_list * 1e3:8.2f} ms ({len(rows)} qator)")
+    print(f"  thread lar        : {threads_before} → {threads_after}")
+    print(f"  xotira            : {mem_cur / n:8.0f} bayt/eslatma "
+          f"(peak {mem_peak / 1024 / 1024:.1f} MB)")
+    print(f"  bekor qilingandan keyin: {left} ta qoldi")
+    assert threads_after - threads_before <= 1, "Thread soni o'smasligi kerak"
+    assert [r[0] for r in rows] == sorted(ids), "Tartib buzilgan"
+
+
+def bench_recurring(n: int = 5_000):
+    from modules import reminders
+    from modules.reminders import set_recurring, cancel_reminder
+    from modules.scheduler import Recurrence
+    reminders.REMINDERS_FILE = os.path.join(tempfile.mkdtemp(), "reminders.jsonl")
+
+    _line(f"Takroriy eslatmalar: {n} ta qoida")
+    rules = [Recurrence.parse_cron(f"{i % 60} {i % 24} * * {i % 7}") if i % 2
+             else Recurrence.every(60 + i) for i in range(n)]
+    threads_before = threading.active_count()
+
+    t0  = time.perf_counter()
+    ids = [set_recurring(rule, f"qoida {i}") for i, rule in enumerate(rules)]
+    t_set = time.perf_counter() - t0
+
+    ts = time.time()
+    t0 = time.perf_counter()
+    for rule in rules:
+        rule.next_after(ts)
+    t_next = time.perf_counter() - t0
+
+    threads_after = threading.active_count()
+    for rid in ids:
+        cancel_reminder(rid)
+
+    print(f"  set_recurring     : {t_set / n * 1e6:8.2f} µs/ta")
+    print(f"  next_after        : {t_next / n * 1e6:8.2f} µs/ta")
+    print(f"  thread lar        : {threads_before} → {threads_after}")
+    assert threads_after - threads_before <= 1, "Thread soni o'smasligi kerak"
+
+    # Noto'g'ri qadam — jim "hech qachon" emas, ValueError
+    for spec in ("*/-1 * * * *", "*/0 * * * *", "*/x * * * *"):
+        try:
+            Recurrence.parse_cron(spec)
+        except ValueError:
+            continue
+        raise AssertionError(f"Qabul qilinmasligi kerak edi: {spec!r}")
+
+
+# ══════════════════════════════════════════════════════════
+#  MATCHER — Aho-Corasick vs ketma-ket "kw in cmd" sikllari
+# ══════════════════════════════════════════════════════════
+def _loop_first(tables, cmd):
+    """Eski usul: har jadval, har yorliq, har kalit so'z"""
+    out = {}
+    for table, entries in tables:
+        for label, keywords in entries:
+            if any(kw in cmd for kw in keywords):
+                out[table] = label
+                break
+    return out
+
+
+def _time_per_call(fn, cmds, rounds):
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for c in cmds:
+            fn(c)
+    return (time.perf_counter() - t0) / (rounds * len(cmds))
+
+
+def bench_matcher(n_keywords: int = 3_000, rounds: int = 200):
+    import random
+    from modules import nlu
+    from modules.matcher import Automaton
+
+    cmds = ["dollar kursi qancha", "toshkentda ob-havo qanday", "chrome och",
+            "keyingi qo'shiq", "5 daqiqadan keyin eslatib qo'y", "github och",
+            "kompyuterni o'chir", "menga bir hazil aytib ber", "yangiliklarni o'qi",
+            "vazifalarni ko'rsat", "telegram och", "ekran surat ol"]
+
+    # 1) Haqiqiy jadvallar
+    tables = [("intent", nlu._INTENTS), ("realtime", nlu._REALTIME),
+              ("system", [("system", nlu.SYSTEM_WORDS)]),
+              ("site", [(s, [s]) for s in nlu.SITES]),
+              ("app", nlu._apps_table())]
+    ac = nlu.compile_keywords()
+    for c in cmds:
+        assert ac.best(c) == _loop_first(tables, c), f"Natija farq qiladi: {c!r}"
+    n_real = sum(len(kw) for _, e in tables for _, kw in e)
+    _line(f"Matcher: haqiqiy jadvallar ({n_real} kalit so'z)")
+    t_loop = _time_per_call(lambda c: _loop_first(tables, c), cmds, rounds)
+    t_ac   = _time_per_call(ac.best, cmds, rounds)
+    print(f"  sikllar           : {t_loop * 1e6:8.2f} µs/buyruq")
+    print(f"  Aho-Corasick      : {t_ac * 1e6:8.2f} µs/buyruq  ({t_loop / t_ac:.0f}x)")
+
+    # 2) Sintetik: n_keywords ta kalit so'z, 200 ta yorliq
+    rnd   = random.Random(42)
+    alpha = "abdefghijklmnopqrstuvxyz'"
+    words = list({"".join(rnd.choice(alpha) for _ in range(rnd.randint(4, 12)))
+                  for _ in range(n_keywords)})
+    entries = [(f"intent_{i}", words[i::200]) for i in range(200)]
+    big     = [("intent", entries)]
+    ac_big  = Automaton()
+    ac_big.add_table("intent", entries)
+    t0 = time.perf_counter(); ac_big.build(); t_build = time.perf_counter() - t0
+    big_cmds = cmds + [f"{rnd.choice(words)} va {rnd.choice(words)} qil" for _ in range(12)]
+    for c in big_cmds:
+        assert ac_big.best(c) == _loop_first(big, c), f"Natija farq qiladi: {c!r}"
+    _line(f"Matcher: sintetik ({len(words)} kalit so'z, 200 yorliq)")
+    t_loop = _time_per_call(lambda c: _loop_first(big, c), big_cmds, rounds // 4)
+    t_ac   = _time_per_call(ac_big.best, big_cmds, rounds // 4)
+    print(f"  kompilyatsiya     : {t_build * 1e3:8.2f} ms")
+    print(f"  sikllar           : {t_loop * 1e6:8.2f} µs/buyruq")
+    print(f"  Aho-Corasick      : {t_ac * 1e6:8.2f} µs/buyruq  ({t_loop / t_ac:.0f}x)")
+
+
+# ══════════════════════════════════════════════════════════
+#  NORMALIZE — translate jadvali + regex + LRU vs eski sikl
+# ══════════════════════════════════════════════════════════
+def _normalize_legacy(text: str) -> str:
+    """Eski normalize_text (taqqoslash uchun, o'zgarishsiz nusxa)"""
+    import re
+    from modules.nlu import _CYR
+    text = text.replace('\u2019', "'").replace('\u2018', "'").replace('\u02bc', "'")
+    text = re.sub(r'\s+', ' ', ''.join(_CYR.get(ch, ch) for ch in text.lower())).strip()
+    STT_FIXES = {"tayyor qo'y": "taymer qo'y", "tayyor qoy": "taymer qo'y",
+                 "tayyor koy": "taymer qo'y", "tayyor ko'y": "taymer qo'y"}
+    for wrong, correct in STT_FIXES.items():
+        if wrong in text and any(w in text for w in ["daqiqa","soat","sekund","minut"]):
+            text = text.replace(wrong, correct)
+    if "tayyor" in text and any(w in text for w in ["daqiqa","soat","sekund","minut"]):
+        text = text.replace("tayyor", "taymer")
+    return text
+
+
+def _log_utterances() -> list[str]:
+    import glob
+    out = []
+    for path in glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                       "logs", "*.log")):
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            out += [line.split("USER:", 1)[1].strip() for line in f if "USER:" in line]
+    return out
+
+
+def bench_normalize(rounds: int = 200):
+    from modules.nlu import normalize_text, normalize_batch, _normalize
+
+    corpus = _log_utterances() + [
+        "Джарвис, ОБ-ХАВО қандай", "  5 дақиқадан кейин   eslatib qo\u2019y ",
+        "tayyor qoy 10 daqiqa", "Tayyor  ko'y 3 minut", "tayyor bo'ldim",
+        "ТЕЛЕГРАМНИ ОЧ", "ovozni 40 ga qo\u02bcy", "soat nechchi bo'ldi",
+    ]
+    for t in corpus:
+        assert _normalize(t) == _normalize_legacy(t), f"Natija farq qiladi: {t!r}"
+
+    _line(f"normalize_text: {len(corpus)} ta gap × {rounds}")
+    t_old  = _time_per_call(_normalize_legacy, corpus, rounds)
+    t_new  = _time_per_call(_normalize, corpus, rounds)
+    normalize_text.cache_clear()
+    t_memo = _time_per_call(normalize_text, corpus, rounds)
+    big    = corpus * rounds
+    t0 = time.perf_counter(); normalize_batch(big); t_batch = (time.perf_counter() - t0) / len(big)
+    print(f"  eski (sikl)       : {t_old * 1e6:8.2f} µs/gap")
+    print(f"  translate + regex : {t_new * 1e6:8.2f} µs/gap  ({t_old / t_new:.1f}x)")
+    print(f"  + LRU (takroriy)  : {t_memo * 1e6:8.2f} µs/gap  ({t_old / t_memo:.0f}x)")
+    print(f"  normalize_batch   : {t_batch * 1e6:8.2f} µs/gap  ({len(big)} ta)")
+
+
+# ══════════════════════════════════════════════════════════
+#  CONTACTS — bitta trie-regex vs har kontakt uchun contact_match
+# ══════════════════════════════════════════════════════════
+def bench_contacts(n: int = 5_000):
+    import random
+    from modules.nlu import ContactIndex, contact_match
+
+    rnd   = random.Random(7)
+    names = list(dict.fromkeys("".join(rnd.choice("abdefgijklmnoqrstuvxyz")
+                                       for _ in range(rnd.randint(3, 9)))
+                               for _ in range(n)))
+    cmds  = ([f"{rnd.choice(names)}{rnd.choice(['ga', 'ni', 'ning', 'imga', ''])} telegram yoz"
+              for _ in range(200)] + ["bugun ob-havo qanday"] * 50)
+
+    _line(f"Kontaktlar: {len(names)} ta ism")
+    t0 = time.perf_counter(); idx = ContactIndex(names); t_build = time.perf_counter() - t0
+    for c in cmds[:40]:
+        assert idx.find(c) == next((nm for nm in names if contact_match(nm, c)), None), c
+    t_new = _time_per_call(idx.find, cmds, 20)
+    t_old = _time_per_call(lambda c: next((nm for nm in names if contact_match(nm, c)), None),
+                           cmds[:10], 1)
+    print(f"  indeks qurish     : {t_build * 1e3:8.2f} ms")
+    print(f"  eski (har ism)    : {t_old * 1e3:8.2f} ms/buyruq")
+    print(f"  ContactIndex.find : {t_new * 1e6:8.2f} µs/buyruq")
+
+
+# ══════════════════════════════════════════════════════════
+#  FUZZY — AI dan oldingi tiklash qatlami kechikishi
+# ══════════════════════════════════════════════════════════
+_FUZZY_NEVER = ["qayta yoz", "kompyuterni o'chma", "shu kompyuterni ochib ber",
+                "uxla", "restrat"]
+
+
+def bench_fuzzy(rounds: int = 50):
+    from modules.fuzzy import correct_command
+    from modules.nlu import normalize_batch
+
+    corpus = normalize_batch(_log_utterances()) + [
+        "chorme och", "instagrm och", "eslatip qo'y 5 daqiqa", "menga hazil aytib ber"]
+    correct_command(corpus[0])                      # Indeksni qurish
+    _line(f"Fuzzy: {len(corpus)} ta buyruq")
+    t = _time_per_call(correct_command, corpus, rounds)
+    fixed = [(c, r[0]) for c in corpus if (r := correct_command(c))]
+    print(f"  correct_command   : {t * 1e6:8.2f} µs/buyruq")
+    print(f"  tiklangan         : {len(fixed)} ta")
+    for c, r in dict(fixed).items():
+        print(f"    {c!r:26} → {r!r}")
+    assert t < 1e-3, "Fuzzy qatlam 1 ms dan tez bo'lishi kerak"
+
+    # Tizim buyruqlari fuzzy orqali hech qachon tiklanmaydi (tasdiqsiz bajarilardi)
+    unsafe = {c: r for c in _FUZZY_NEVER if (r := correct_command(c))}
+    print(f"  tizimga tiklanmadi: {len(_FUZZY_NEVER) - len(unsafe)}/{len(_FUZZY_NEVER)}")
+    for c, r in unsafe.items():
+        print(f"    ❌ {c!r} → {r!r}")
+    assert not unsafe, "Fuzzy buyruqni tizim intentiga aylantirdi"
+
+
+# ══════════════════════════════════════════════════════════
+#  CLASSIFIER — held-out precision/recall va predict kechikishi
+# ══════════════════════════════════════════════════════════
+def _synthetic_samples(per_keyword: int = 8, seed: int = 0) -> list[tuple[str, str, float]]:
+    """_INTENTS kalit so'zlari + qo'shimcha so'zlar + STT ga o'xshash buzilishlar"""
+    import random
+    from modules.nlu import _INTENTS
+    rnd    = random.Random(seed)
+    fillers = ["", "iltimos", "jarvis", "menga", "tezroq", "hozir", "ber", "qil",
+               "qilib ber", "iltimos jarvis", "bir", "endi"]
+    alpha  = "abdefghijklmnopqrstuvxyz"
+
+    def noisy(w: str) -> str:
+        if len(w) < 5 or rnd.random() < 0.5:
+            return w
+        i = rnd.randrange(1, len(w) - 1)
+        op = rnd.choice("dsi")
+        return (w[:i] + w[i + 1:] if op == "d" else
+                w[:i] + rnd.choice(alpha) + w[i + 1:] if op == "s" else
+                w[:i] + rnd.choice(alpha) + w[i:])
+
+    out = []
+    for intent, keywords in _INTENTS:
+        for kw in keywords:
+            for _ in range(per_keyword):
+                words = [rnd.choice(fillers), noisy(kw), rnd.choice(fillers)]
+                out.append((" ".join(w for w in words if w), intent,
+                            float(rnd.randint(1, 5))))
+    return out
+
+
+def bench_classifier():
+    from modules import classifier as clf
+    if not clf.NP_OK:
+        print("numpy o'rnatilmagan — pip install numpy"); return
+
+    samples = clf.load_samples()
+    source  = "learned_commands.json"
+    if len(samples) < 200:
+        samples, source = _synthetic_samples(), "sintetik (_INTENTS + shovqin)"
+    _line(f"Klassifikator: {len(samples)} misol — {source}")
+    t0 = time.perf_counter()
+    r  = clf.evaluate(samples, test_frac=0.2)
+    t_total = time.perf_counter() - t0
+    print(f"  o'qitish+baholash : {t_total:8.2f} s  (train {r['train']}, test {r['test']})")
+    print(f"  accuracy          : {r['accuracy']:8.3f}")
+    print(f"  makro precision   : {r['precision']:8.3f}")
+    print(f"  makro recall      : {r['recall']:8.3f}")
+    print(f"  qamrov (p>={clf._MIN_PROB}) : {r['coverage']:6.3f}  "
+          f"shundagi precision: {r['precision_at_threshold']:.3f}")
+    print(f"  predict           : {r['latency_us']:8.1f} µs/chaqiruv")
+    worst = sorted(r["per_intent"].items(), key=lambda kv: kv[1]["recall"])[:5]
+    print("  eng past recall   : " + ", ".join(f"{l} {v['recall']:.2f}" for l, v in worst))
+
+
+# ══════════════════════════════════════════════════════════
+#  SLOTS — golden korpus + bitta o'tish vs handler lar regex lari
+# ══════════════════════════════════════════════════════════
+SLOTS_GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "slots.jsonl")
+
+
+def _slots_legacy(cmd: str):
+    """Eski handler lar har biri buyruqni alohida skanerlardi (taqqoslash uchun)"""
+    import re
+    from modules.slots import CURRENCY_NAMES, LANG_MAP
+    re.search(r"soat\s+(\d{1,2})(?::(\d{2}))?\s*da", cmd)
+    for pat in (r"(\d+)\s*soat", r"(\d+)\s*daqiqa", r"(\d+)\s*soniya", r"(\d+)\s*minut",
+                r"(\d+)\s*hour", r"(\d+)\s*minute", r"(\d+)\s*second"):
+        if re.search(pat, cmd):
+            break
+    re.search(r'(\d[\d\s,.]*)', cmd)
+    found = [code for name, code in CURRENCY_NAMES.items() if name in cmd]
+    lang  = next((code for name, code in LANG_MAP.items() if name in cmd), "en")
+    re.search(r'\b(\d{1,3})\b', cmd)
+    re.search(r'\b(\d+)\b', cmd)
+    return found, lang
+
+
+def bench_slots(rounds: int = 200):
+    import json
+    from modules.slots import extract
+    from modules.nlu import normalize_batch
+
+    with open(SLOTS_GOLDEN, encoding="utf-8") as f:
+        golden = [json.loads(line) for line in f if line.strip()]
+    bad = [(g["cmd"], g["slots"], got) for g in golden
+           if (got := extract(g["cmd"]).as_dict()) != g["slots"]]
+
+    corpus = [g["cmd"] for g in golden] + normalize_batch(_log_utterances())
+    _line(f"Slots: {len(golden)} ta golden, {len(corpus)} ta buyruq × {rounds}")
+    t_old = _time_per_call(_slots_legacy, corpus, rounds)
+    t_new = _time_per_call(extract.__wrapped__, corpus, rounds)
+    t_hit = _time_per_call(extract, corpus, rounds)
+    print(f"  eski (6 handler)  : {t_old * 1e6:8.2f} µs/buyruq")
+    print(f"  extract (1 o'tish): {t_new * 1e6:8.2f} µs/buyruq")
+    print(f"  + kesh (takroriy) : {t_hit * 1e6:8.2f} µs/buyruq")
+    print(f"  golden            : {len(golden) - len(bad)}/{len(golden)} to'g'ri")
+    for cmd, want, got in bad:
+        print(f"    ❌ {cmd!r}\n       kutilgan {want}\n       olingan  {got}")
+    assert not bad, "Slot ajratuvchi golden korpusdan chetga chiqdi"
+
+
+# ══════════════════════════════════════════════════════════
+#  NUMBERS — so'z bilan aytilgan sonlar: golden + AI ga ketishlar
+# ══════════════════════════════════════════════════════════
+NUMBERS_GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "numbers.jsonl")
+
+
+def _numeric_slot(s):
+    """Handler oladigan son: vaqt (soniya) yoki birinchi butun son"""
+    return s.seconds() if (s.duration or s.clock) else s.number
+
+
+def bench_numbers(rounds: int = 200):
+    import re, json
+    from modules.slots import extract
+    from modules.numwords import read_number
+    from modules.nlu import normalize_text, normalize_batch
+
+    with open(NUMBERS_GOLDEN, encoding="utf-8") as f:
+        golden = [json.loads(line) for line in f if line.strip()]
+    cmds = [normalize_text(g["cmd"]) for g in golden]
+    bad  = [(g["cmd"], g["value"], got) for g, c in zip(golden, cmds)
+            if (got := _numeric_slot(extract(c))) != g["value"]]
+
+    # Raqam regexi topa olmagan sonli buyruq — mahalliy handler uddalamaydi, AI ga ketadi
+    numeric  = [c for g, c in zip(golden, cmds) if g["value"] is not None]
+    fb_old   = sum(1 for c in numeric if not re.search(r"\d+", c))
+    fb_new   = sum(1 for c in numeric if _numeric_slot(extract(c)) is None)
+    log      = normalize_batch(_log_utterances())
+    log_new  = [c for c in log if not re.search(r"\d", c) and _numeric_slot(extract(c)) is not None]
+
+    words = [c.split() for c in cmds]
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        for w in words:
+            for i in range(len(w)):
+                read_number(w, i)
+    t_read = (time.perf_counter() - t0) / (rounds * sum(map(len, words)))
+
+    _line(f"Sonlar: {len(golden)} ta golden, {len(log)} ta log buyrug'i")
+    print(f"  golden            : {len(golden) - len(bad)}/{len(golden)} to'g'ri")
+    print(f"  AI ga ketadigan   : {fb_old} → {fb_new} ({len(numeric)} ta sonli buyruqdan)")
+    print(f"  logda yangi son   : {len(log_new)} ta {log_new[:5]}")
+    print(f"  read_number       : {t_read * 1e9:8.0f} ns/so'z")
+    for cmd, want, got in bad:
+        print(f"    ❌ {cmd!r}: kutilgan {want}, olingan {got}")
+    assert not bad, "Son o'quvchi golden korpusdan chetga chiqdi"
+
+
+# ══════════════════════════════════════════════════════════
+#  PLANNER — ko'p buyruqli gaplar: golden reja + parallel bajarish
+# ══════════════════════════════════════════════════════════
+PLANS_GOLDEN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus", "plans.jsonl")
+
+
+def bench_planner(step_delay: float = 0.2):
+    import json
+    from modules.planner import plan_command, run_plan, summarize
+    from modules.nlu import normalize_text
+
+    with open(PLANS_GOLDEN, encoding="utf-8") as f:
+        golden = [json.loads(line) for line in f if line.strip()]
+
+    def as_texts(p):
+        return None if p is None else [[st.text for st in stage] for stage in p]
+
+    bad = [(g["cmd"], g["plan"], got) for g in golden
+           if (got := as_texts(plan_command(normalize_text(g["cmd"])))) != g["plan"]]
+
+    cmds = [normalize_text(g["cmd"]) for g in golden]
+    t_plan = _time_per_call(plan_command, cmds, 50)
+
+    # Har qadam step_delay soniya "ishlaydi" — ketma-ket vs reja bo'yicha
+    def fake_step(text: str) -> list[str]:
+        time.sleep(step_delay)
+        return [f"{text} bajarildi"]
+
+    plans = [p for c in cmds if (p := plan_command(c))]
+    n_steps = sum(len(st) for p in plans for st in p)
+    t0 = time.perf_counter()
+    said = [summarize(run_plan(p, fake_step)) for p in plans]
+    t_run = time.perf_counter() - t0
+
+    _line(f"Planner: {len(golden)} ta gap, {len(plans)} ta reja, {n_steps} ta qadam")
+    print(f"  golden            : {len(golden) - len(bad)}/{len(golden)} to'g'ri")
+    print(f"  plan_command      : {t_plan * 1e6:8.2f} µs/gap")
+    print(f"  ketma-ket bo'lsa  : {n_steps * step_delay:8.2f} s")
+    print(f"  reja bo'yicha     : {t_run:8.2f} s")
+    print(f"  misol javob       : {said[0]!r}")
+    for cmd, want, got in bad:
+        print(f"    ❌ {cmd!r}\n       kutilgan {want}\n       olingan  {got}")
+    assert not bad, "Rejalashtiruvchi golden korpusdan chetga chiqdi"
+
+
+# ══════════════════════════════════════════════════════════
+#  ROUTER — reyestr bo'yicha nomzod qidirish
+# ══════════════════════════════════════════════════════════
+def bench_router(rounds: int = 200):
+    import modules.plugins  # noqa: F401 — manifest reyestrni to'ldiradi
+    from modules import command_router, nlu
+    from modules.nlu_eval import load_corpus
+
+    cmds = [nlu.normalize_text(r["cmd"]) for r in load_corpus()]
+    command_router.candidates(cmds[0])          # Avtomat kompilyatsiyasi
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        nlu._last = ("", {})
+        for c in cmds:
+            command_router.candidates(c)
+    per = (time.perf_counter() - t0) / (rounds * len(cmds))
+    sizes = [len(command_router.candidates(c)) for c in cmds]
+
+    _line(f"Router: {len(command_router._handlers)} ta handler, {len(cmds)} ta buyruq")
+    print(f"  candidates()      : {per * 1e6:8.2f} µs/buyruq")
+    print(f"  nomzodlar         : o'rtacha {sum(sizes) / len(sizes):.1f}, max {max(sizes)}")
+
+
+# ══════════════════════════════════════════════════════════
+#  DISPATCH — sekin handler tinglash tsiklini bloklamaydi
+# ══════════════════════════════════════════════════════════
+def bench_dispatch(delay: float = 0.3):
+    from modules import command_router as router
+    from modules.core import executor            # noqa: F401 — import vaqti o'lchovga kirmasin
+    from modules.scheduler import scheduler      # noqa: F401
+
+    @router.register("benchslow", name="bench_slow", deadline=delay * 4)
+    def slow(cmd):
+        time.sleep(delay)
+        return f"tayyor: {cmd}"
+
+    @router.register("benchhang", name="bench_hang", deadline=delay / 3)
+    def hang(cmd):
+        time.sleep(delay * 3)
+        return "kech"
+
+    @router.register("benchpass", name="bench_pass", deadline=delay * 4, priority=1)
+    def passes(cmd):                                # Fonda "meniki emas"
+        time.sleep(delay / 10)
+        return router.SKIP
+
+    @router.register("benchpass", name="bench_pass_next", priority=2)
+    def pass_next(cmd):
+        return f"keyingi: {cmd}"
+
+    said, lock = [], threading.Lock()
+    def speak(text):
+        with lock: said.append(text)
+    record = lambda cmd, resp: None
+
+    t0 = time.perf_counter()
+    router.route("benchslow 1", speak, record, wait=True)
+    t_inline = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    router.route("benchslow 2", speak, record)
+    t_async = time.perf_counter() - t0
+    router.route("benchslow 3", speak, record)      # 2 ni eskirtiradi
+    router.route("benchhang 4", speak, record)      # deadline dan o'tadi
+    router.route("benchpass", speak, record)        # SKIP → keyingi nomzod
+    time.sleep(delay * 4)
+    fell = []                                       # SKIP, nomzod yo'q → fallback
+    router.dispatch("bench_pass", "benchpass 5", speak, record, fallback=fell.append)
+    time.sleep(delay)
+
+    st = {r["name"]: r for r in router.stats()}
+    _line(f"Dispatch: {delay * 1000:.0f} ms li handler")
+    print(f"  inline (wait=True) : {t_inline * 1000:8.1f} ms gacha bloklaydi")
+    print(f"  fonda              : {t_async * 1000:8.2f} ms da qaytadi")
+    print(f"  aytildi            : {said}")
+    print(f"  eskirgan / kech    : {st['bench_slow']['dropped']} / {st['bench_hang']['late']}")
+    assert said[0] == "tayyor: benchslow 1", said
+    assert sorted(said[1:]) == sorted(["tayyor: benchslow 3", "keyingi: benchpass",
+                                       "Javob kechikdi, keyinroq urinib ko'ring"]), said
+    assert fell == ["benchpass 5"], fell
+    assert t_async < delay / 10
+
+
+# ══════════════════════════════════════════════════════════
+#  PREFETCH — gap boshi bo'yicha oldindan yuklash
+# ══════════════════════════════════════════════════════════
+_PREFETCH_GOLDEN = [
+    ("samarqandda ob-havo",        "weather:samarqand"),
+    ("ob-havo qanday",             "weather:tashkent"),
+    ("dollar kursi",               "currency:USD"),
+    ("100 evro necha",             "currency:EUR"),
+    ("sport haqida yangilik",      "news:sport"),
+    ("havo",                       None),        # yolg'iz — ishonchsiz
+    ("xabar yubor",                None),        # xabar — yangilik emas
+    ("soat necha",                 None),        # mahalliy
+    ("eslab qol mashinam qora",    None),        # intent bilan to'qnashuv
+    ("telegramdan xabar yoz",      None),
+]
+
+
+def bench_prefetch(fetch: float = 0.4, stt_tail: float = 0.6):
+    from modules.core import SmartCache, executor    # noqa: F401 — import o'lchovga kirmasin
+    from modules.nlu import normalize_text
+    from modules.prefetch import Prefetcher, Fetch, plan_fetch
+
+    bad = [(t, want, got and got.key) for t, want in _PREFETCH_GOLDEN
+           for got in [plan_fetch(normalize_text(t))] if (got and got.key) != want]
+
+    cache = SmartCache()
+    def http(key):
+        time.sleep(fetch)
+        return key
+    def load(key):
+        return cache.get_or_compute(key, "weather", lambda: http(key))
+    def planner(text):
+        f = plan_fetch(text)
+        return f and Fetch(f.key, load, (f.key,))
+    pf = Prefetcher(planner=planner)
+
+    # Sovuq: yakuniy transkriptdan keyin so'rov
+    t0 = time.perf_counter(); load("weather:buxoro"); cold = time.perf_counter() - t0
+    # Prefetch: gap boshi stt_tail oldin keldi
+    pf.feed("samarqandda ob-havo")
+    time.sleep(stt_tail)
+    final = "samarqandda ob-havo qanday"
+    pf.settle([final])
+    t0 = time.perf_counter(); load(planner(final).key); warm = time.perf_counter() - t0
+    # Behuda: gap boshi ob-havo, yakuniy — valyuta
+    pf.feed("ob-havo")
+    pf.settle(["dollar kursi"])
+    time.sleep(fetch * 1.5)
+    st = pf.stats()
+
+    _line(f"Prefetch: so'rov {fetch * 1000:.0f} ms, STT dumi {stt_tail * 1000:.0f} ms")
+    print(f"  golden            : {len(_PREFETCH_GOLDEN) - len(bad)}/{len(_PREFETCH_GOLDEN)} to'g'ri")
+    print(f"  prefetch siz      : {cold * 1000:8.1f} ms (yakuniy transkriptdan keyin)")
+    print(f"  prefetch bilan    : {warm * 1000:8.1f} ms")
+    print(f"  boshlangan/foydali/behuda : {st['started']}/{st['used']}/{st['wasted']}")
+    for t, want, got in bad:
+        print(f"    ❌ {t!r}: kutilgan {want}, olingan {got}")
+    assert not bad, "Prefetch ishonch qoidasi golden ro'yxatdan chetga chiqdi"
+    assert (st["used"], st["wasted"]) == (1, 1), st
+    assert warm < fetch / 4
+
+
+# ══════════════════════════════════════════════════════════
+#  AI POYGA — mahalliy bosqichlar va Claude parallel
+# ══════════════════════════════════════════════════════════
+class _FakeClaude:
+    """messages.create: `delay` soniya, qat'iy usage (tarmoqsiz o'lchov uchun)"""
+    def __init__(self, delay: float, usage: tuple[int, int]):
+        from types import SimpleNamespace as NS
+        self.messages = self
+        self._delay, self._resp = delay, NS(
+            usage=NS(input_tokens=usage[0], output_tokens=usage[1]),
+            content=[NS(text='{"type":"answer","speak":"Salom","confidence":0.9}')])
+
+    def create(self, **kw):
+        time.sleep(self._delay)
+        return self._resp
+
+
+def bench_race(ai_delay: float = 0.5, local: float = 0.15, grace: float = 0.05):
+    from modules import ai_client
+    from modules.ai_client import AIRequest, DeferredAI, usage_stats
+    from modules.scheduler import scheduler      # noqa: F401 — import o'lchovga kirmasin
+
+    saved = ai_client._precheck, ai_client._get_client
+    fake = _FakeClaude(ai_delay, (120, 40))
+    ai_client._precheck, ai_client._get_client = (lambda: None), (lambda: fake)
+    try:
+        before = usage_stats()
+        # Ketma-ket: mahalliy bosqichlar tanimadi, keyin Claude
+        t0 = time.perf_counter(); time.sleep(local); AIRequest("a").result()
+        seq = time.perf_counter() - t0
+        # Poyga: Claude darhol, mahalliy bosqichlar parallel
+        t0 = time.perf_counter(); req = AIRequest("b"); time.sleep(local); req.result()
+        race = time.perf_counter() - t0
+        # Mahalliy yutdi: javob kelmasdan bekor (tokenlar kelganda behuda deb yoziladi)
+        req = AIRequest("c"); time.sleep(local); req.cancel()
+        # Mahalliy yutdi, lekin javob allaqachon kelgan
+        req = AIRequest("d"); time.sleep(ai_delay * 1.3)
+        hist = len(ai_client._history)
+        peeked = req.peek()                      # Yon ta'sirsiz: tarix o'zgarmaydi
+        untouched = len(ai_client._history) == hist
+        req.cancel()
+        # Kechiktirilgan: mahalliy grace ichida yutdi — so'rov umuman yuborilmaydi
+        early = DeferredAI("e", grace); early.cancel(); time.sleep(grace * 2)
+        # Kechiktirilgan: mahalliy sekin — grace dan keyin boshlandi, keyin yutqazdi
+        late = DeferredAI("f", grace); time.sleep(grace * 2); late.cancel()
+        time.sleep(ai_delay)
+        after = usage_stats()
+    finally:
+        ai_client._precheck, ai_client._get_client = saved
+        ai_client.clear_history()
+
+    d = {k: after[k] - before[k] for k in after}
+    _line(f"AI poyga: Claude {ai_delay * 1000:.0f} ms, mahalliy bosqichlar {local * 1000:.0f} ms")
+    print(f"  ketma-ket          : {seq * 1000:8.1f} ms")
+    print(f"  poyga              : {race * 1000:8.1f} ms")
+    print(f"  grace ichida yutdi : {'yuborilmadi' if early.request is None else 'yuborildi'}")
+    print(f"  chaqiruv / bekor   : {d['calls']} / {d['cancelled']}")
+    print(f"  token (jami)       : {d['input_tokens']}+{d['output_tokens']}")
+    print(f"  token (behuda)     : {d['wasted_input_tokens']}+{d['wasted_output_tokens']}")
+    assert race < seq - local * 0.8
+    assert early.request is None and late.request is not None
+    assert peeked and peeked["speak"] == "Salom" and untouched
+    assert (d["calls"], d["cancelled"]) == (5, 3), d
+    assert (d["wasted_input_tokens"], d["wasted_output_tokens"]) == (360, 120), d
+
+
+# ══════════════════════════════════════════════════════════
+#  NLU — butun mahalliy marshrutlash stegi: aniqlik + buyruq/s
+# ══════════════════════════════════════════════════════════
+def bench_nlu():
+    from modules import nlu_eval
+
+    if "--seed" in FLAGS:
+        n = nlu_eval.seed_from_logs()
+        print(f"  logdan {n} ta yangi gap qo'shildi (\"review\": true — tekshiring)")
+    report = nlu_eval.evaluate(nlu_eval.load_corpus())
+    assert report, f"Korpus bo'sh: {nlu_eval.CORPUS_FILE}"
+
+    _line(f"NLU: {report['n']} ta gap (korpus + log)")
+    print(f"  intent aniqligi   : {report['accuracy'] * 100:6.1f} %")
+    print(f"  slot aniqligi     : {report['slot_accuracy'] * 100:6.1f} %")
+    print(f"  o'tkazuvchanlik   : {report['commands_per_sec']:8.0f} buyruq/s (sovuq kesh)")
+    print(f"  qatlamlar         : " + ", ".join(f"{k} {v}" for k, v in
+                                                 sorted(report["stages"].items(), key=lambda x: -x[1])))
+    print("  intent bo'yicha   :")
+    for label, p in report["per_intent"].items():
+        if p["accuracy"] < 1:
+            print(f"    {label:<15} {p['correct']:>3}/{p['support']:<3} {p['accuracy'] * 100:5.0f} %")
+    if report["confusion"]:
+        print("  chalkashliklar    :")
+        for gold, pred, n in report["confusion"]:
+            print(f"    {gold:>13} → {pred:<13} ×{n}")
+    for cmd, want, got in report["errors"]:
+        print(f"    ❌ {cmd!r}: kutilgan {want}, olingan {got}")
+
+    if "--update-baseline" in FLAGS:
+        nlu_eval.save_baseline(report)
+        print(f"  baza yangilandi   : {nlu_eval.BASELINE_FILE}")
+        return
+    fails = nlu_eval.check_regression(report, nlu_eval.load_baseline())
+    for f in fails:
+        print(f"    📉 {f}")
+    assert not fails, "NLU bazadan yomonlashdi"
+
+
+BENCHES = {
+    "scheduler": bench_scheduler,
+    "recurring": bench_recurring,
+    "matcher":   bench_matcher,
+    "normalize": bench_normalize,
+    "contacts":  bench_contacts,
+    "fuzzy":     bench_fuzzy,
+    "classifier": bench_classifier,
+    "slots":     bench_slots,
+    "numbers":   bench_numbers,
+    "planner":   bench_planner,
+    "router":    bench_router,
+    "dispatch":  bench_dispatch,
+    "prefetch":  bench_prefetch,
+    "race":      bench_race,
+    "nlu":       bench_nlu,
+}
+FLAGS: set[str] = set()
+
+
+if __name__ == "__main__":
+    FLAGS = {a for a in sys.argv[1:] if a.startswith("--")}
+    names = [a for a in sys.argv[1:] if not a.startswith("--")] or list(BENCHES)
+    for name in names:
+        if name not in BENCHES:
+            print(f"❌ Noma'lum benchmark: {name}  (bor: {', '.join(BENCHES)})")
+            sys.exit(1)
+        BENCHES[name]()
@@ -27,6 +27,10 @@ WEATHER_API_KEY       = os.environ.get("WEATHER_API_KEY", "")
 SPOTIFY_CLIENT_ID     = os.environ.get("SPOTIFY_CLIENT_ID", "")
 SPOTIFY_CLIENT_SECRET = os.environ.get("SPOTIFY_CLIENT_SECRET", "")
 
+# Mahalliy router buyruqni tanimasa Claude darhol (fuzzy/klassifikator bilan
+# parallel) boshlanadi; mahalliy bosqich yutsa bekor qilinadi. 0 — ketma-ket
+AI_RACE = os.environ.get("AI_RACE", "1") != "0"
+
 
 
 # ============================================================
@@ -41,6 +45,9 @@ WEATHER_LANG = "uz"
 # ============================================================
 WAKE_WORD   = "jarvis"
 LISTEN_LANG = "uz-UZ"
+# Gap boshi alohida tanib olinadi → ob-havo/valyuta/yangilik oldindan yuklanadi
+# (har buyruqqa qo'shimcha bitta STT so'rovi)
+PARTIAL_STT = os.environ.get("PARTIAL_STT", "1") != "0"
 
 # edge-tts ovozlari:
 #   uz-UZ-MadinaNeural  → Ayol ovozi (tavsiya)
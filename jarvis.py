@@ -6,12 +6,21 @@
 ║   Modulli arxitektura  |  12 bug tuzatilgan                         ║
 ╚══════════════════════════════════════════════════════════════════════╝
 Fayllar:
-  modules/core.py            — State, Cache, RateLimiter, TempManager
+  modules/core.py            — State, Cache, RateLimiter, Tracer, TempManager
   modules/nlu.py             — NLU, intent, contact matching
+  modules/slots.py           — Turlangan slotlar (vaqt, valyuta, til, son)
+  modules/numwords.py        — So'z bilan aytilgan sonlar (o'zbek, rus)
+  modules/planner.py         — Ko'p buyruqli gaplar: reja + parallel bajarish
+  modules/command_router.py  — Handler reyestri, ustuvorlik, statistika
+  modules/plugins/           — Handler plaginlari: manifest + kechiktirilgan yuklash
+  modules/prefetch.py        — Gap boshi bo'yicha ob-havo/valyuta/yangilik prefetch
+  modules/fuzzy.py           — Noto'g'ri eshitilgan buyruqlarni tiklash
+  modules/classifier.py      — Oflayn NumPy intent klassifikatori
   modules/tts.py             — TTS (asyncio bug fix)
   modules/stt.py             — STT (MicGuard)
-  modules/ai_client.py       — Claude singleton
+  modules/ai_client.py       — Claude singleton, poyga (AIRequest), token hisobi
   modules/computer_control.py— Volume, shutdown, apps, Telegram
+  modules/contacts_import.py — Telegram / vCard kontakt importi
   modules/animation.py       — HUD, sozlamalar, tarixi
   modules/history.py         — Buyruqlar tarixi
   modules/logger.py          — Loglash
@@ -22,7 +31,9 @@ Fayllar:
   modules/file_manager.py    — Fayl, jarayonlar, statistika
   config.py                  — Sozlamalar
 """
-import os, sys, re, time, threading, socket, webbrowser
+import os, sys, time, threading, socket
+
+_T0 = time.perf_counter()        # --profile-startup: jarayon boshidan hisob
 
 # ── Yagona nusxa ─────────────────────────────────────────
 _LOCK_SOCKET = None
@@ -43,244 +54,27 @@ def ensure_single_instance():
 # ── Modullar ─────────────────────────────────────────────
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from modules.core             import State, state_manager, temp_manager
-from modules.nlu              import (is_stop_command, needs_realtime,
-                                      match_local_intent, contact_match)
-from modules.tts              import speak, stop_speaking, play_beep, shutdown_tts
+from modules.core             import (State, state_manager, temp_manager, tracer,
+                                      executor, run_as_background)
+from modules.nlu              import is_stop_command
+from modules.tts              import speak, play_beep, shutdown_tts, collect_speech
 from modules.stt              import listen_command, listen_wake_word
-from modules.ai_client        import ask_ai
-from modules.computer_control import (control_volume, control_computer,
-                                      take_screenshot, open_app,
-                                      load_contacts, open_telegram_contact)
-from modules.animation        import (start_animation, open_settings_window,
-                                      open_history_window, open_dashboard_window)
+from modules.fuzzy            import correct_command
+from modules.learner          import learn_command
+from modules.planner          import plan_command, run_plan, summarize
+from modules.prefetch         import prefetcher
+from modules.command_router   import route, dispatch, loaded
+import modules.plugins        # Manifest reyestrga yoziladi (plaginlar — birinchi chaqiruvda)
 from modules import history
 from modules.logger           import logger
-from modules.memory_manager   import (save_memory, get_memory, get_all_memory,
-                                      add_journal, get_journal,
-                                      add_task, complete_task,
-                                      get_tasks, format_tasks_text)
-from modules.reminders        import (set_reminder, list_reminders,
-                                      parse_duration, parse_reminder_message,
-                                      format_time_left)
-from modules.media_control    import (media_play_pause, media_next, media_prev,
-                                      media_stop, minimize_window,
-                                      maximize_window, close_window,
-                                      minimize_all_windows, get_clipboard)
-from modules.web_services     import (parse_currency_cmd, get_news_rss,
-                                      parse_translate_cmd, check_internet_speed)
-from modules.file_manager     import (open_folder, parse_folder_from_cmd,
-                                      get_recent_download, kill_process,
-                                      get_top_processes, format_system_stats,
-                                      get_system_stats as fm_get_stats,
-                                      DESKTOP, FOLDER_MAP)
-from config                   import CITY_NAME, WAKE_WORD
-
-import datetime
-
-# ── Vaqt/sana ────────────────────────────────────────────
-_MONTHS = ["","yanvar","fevral","mart","aprel","may","iyun",
-           "iyul","avgust","sentabr","oktabr","noyabr","dekabr"]
-_DAYS   = ["dushanba","seshanba","chorshanba","payshanba",
-           "juma","shanba","yakshanba"]
-
-def _time_str() -> str:
-    n = datetime.datetime.now()
-    p = ("tong" if 5<=n.hour<12 else "kunduz" if n.hour<17
-         else "kechqurun" if n.hour<21 else "tun")
-    return f"Hozir soat {n.hour}:{n.minute:02d}. {p.capitalize()}."
-
-def _date_str() -> str:
-    n = datetime.datetime.now()
-    return f"Bugun {_DAYS[n.weekday()]}, {n.day} {_MONTHS[n.month]}, {n.year} yil."
-
-# ── Ob-havo (cache) ───────────────────────────────────────
-def _weather(city: str = CITY_NAME) -> str:
-    from modules.core import smart_cache
-    import requests
-    from config import WEATHER_API_KEY
-
-    key    = f"weather_{city.lower()}"
-    cached = smart_cache.get(key, "weather")
-    if cached: return cached
-
-    if not WEATHER_API_KEY:
-        return "Ob-havo API sozlanmagan"
-    try:
-        url  = (f"https://api.openweathermap.org/data/2.5/weather"
-                f"?q={city}&appid={WEATHER_API_KEY}&units=metric&lang=uz")
-        data = requests.get(url, timeout=5).json()
-        t    = round(data["main"]["temp"])
-        desc = data["weather"][0]["description"]
-        wind = round(data["wind"]["speed"])
-        result = f"{city}da hozir {t} daraja, {desc}. Shamol {wind} m/s."
-        smart_cache.set(key, result, "weather")
-        return result
-    except Exception:
-        return "Ob-havo ma'lumotini olib bo'lmadi"
-
-
-# ══════════════════════════════════════════════════════════
-#  MAHALLIY INTENT BAJARISH
-# ══════════════════════════════════════════════════════════
-def _exec(intent: str, cmd: str) -> bool:
-    """Mahalliy intent → amal"""
-
-    if intent == "date":
-        resp = _date_str(); speak(resp); history.record(cmd, resp); return True
-
-    if intent == "screenshot":
-        take_screenshot(); history.record(cmd, "screenshot"); return True
-
-    if intent == "stats":
-        resp = format_system_stats(fm_get_stats())
-        speak(resp); history.record(cmd, resp); return True
-
-    if intent == "internet":
-        resp = check_internet_speed(); speak(resp); history.record(cmd, resp); return True
-
-    if intent == "volume":
-        return control_volume(cmd)
-
-    if intent in ("shutdown","restart","sleep","lock"):
-        return control_computer(cmd)
-
-    if intent == "media_next":
-        media_next(); speak("Keyingi qo'shiq"); history.record(cmd, "next"); return True
-
-    if intent == "media_prev":
-        media_prev(); speak("Oldingi qo'shiq"); history.record(cmd, "prev"); return True
-
-    if intent in ("media_pause","media_play"):
-        media_play_pause(); speak("Bajarildi"); history.record(cmd, intent); return True
-
-    if intent == "win_min_all":
-        resp = minimize_all_windows(); speak(resp); history.record(cmd, resp); return True
-
-    if intent == "win_minimize":
-        name = re.sub(r'\b(minimlashtir|kichrayt)\b','',cmd).strip() or "Chrome"
-        resp = minimize_window(name); speak(resp); history.record(cmd,resp); return True
-
-    if intent == "win_maximize":
-        name = re.sub(r"\b(to'liq ekran|kattalashtir|maximize)\b",'',cmd).strip() or "Chrome"
-        resp = maximize_window(name); speak(resp); history.record(cmd,resp); return True
-
-    if intent == "win_close":
-        name = re.sub(r"\b(oynani yop|oynani o'chir)\b",'',cmd).strip() or "Chrome"
-        resp = close_window(name); speak(resp); history.record(cmd,resp); return True
-
-    if intent == "folder_open":
-        folder = parse_folder_from_cmd(cmd)
-        resp   = open_folder(folder or DESKTOP)
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "file_recent":
-        resp = get_recent_download(); speak(resp); history.record(cmd,resp); return True
-
-    if intent == "reminder_list":
-        rows = list_reminders()
-        resp = ("Hech qanday eslatma yo'q" if not rows
-                else "Eslatmalar: " + ", ".join(f"{i}. {format_time_left(s)}: {m}"
-                                                 for i,(rid,s,m) in enumerate(rows,1)))
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "reminder":
-        dur = parse_duration(cmd)
-        if dur:
-            msg  = parse_reminder_message(cmd)
-            set_reminder(dur, msg, speak)
-            resp = f"Eslatma o'rnatildi: {format_time_left(dur)} dan keyin «{msg}»"
-            speak(resp); history.record(cmd, resp)
-        else:
-            speak("Qancha vaqtdan keyin eslatish kerak?")
-        return True
-
-    if intent == "task_add":
-        text = re.sub(r"\b(vazifa|todo|qo'sh|qosh|task)\b",'',cmd).strip(" ,.-")
-        if text:
-            add_task(text); resp = f"Vazifa qo'shildi: {text[:50]}"
-        else:
-            resp = "Qanday vazifa?"
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "task_list":
-        resp = format_tasks_text(get_tasks())
-        speak(resp[:200]); history.record(cmd,resp); return True
-
-    if intent == "task_done":
-        num = re.search(r'\b(\d+)\b', cmd)
-        if num:
-            tid = int(num.group(1))
-            resp = (f"{tid}-vazifa bajarildi" if complete_task(tid)
-                    else "Bunday vazifa topilmadi")
-        else:
-            resp = "Qaysi vazifa raqamini ayting"
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "journal_add":
-        text = re.sub(r"\b(kundalikka|yoz|qo'y|journal)\b",'',cmd).strip(" ,.-")
-        if text: add_journal(text); resp = "Kundalikka yozildi"
-        else:    resp = "Nima yozishni aytmadingiz"
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "journal_read":
-        entries = get_journal()
-        resp    = ("Bugun kundalikda hech narsa yo'q" if not entries
-                   else "Bugungi kundalik: " + ". ".join(e["text"] for e in entries[:3]))
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "memory_save":
-        m = re.search(r'(mening\s+)?(.+?)\s+(eslab|yodlab|xotirla)', cmd)
-        if m:
-            raw = m.group(2).strip().split()
-            key = raw[0]; val = " ".join(raw[1:]) if len(raw)>1 else m.group(2)
-            save_memory(key, val); resp = f"Eslab qolindi: {key} = {val}"
-        else:
-            resp = "Nima eslab qolishimni aytmadingiz"
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "memory_read":
-        data = get_all_memory()
-        resp = ("Xotiramda: " + ", ".join(f"{k}: {v}" for k,v in list(data.items())[:5])
-                if data else "Xotiramda hech narsa yo'q")
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "translate":
-        resp = parse_translate_cmd(cmd); speak(resp); history.record(cmd,resp); return True
-
-    if intent == "youtube":
-        q = cmd
-        for w in ["youtube","yutub","utub"]: q = q.replace(w,"")
-        q = re.sub(r"\b(ga|da|kir|och|ni)\b",'',q).strip()
-        if q:
-            webbrowser.open(f"https://www.youtube.com/results?search_query={q.replace(' ','+')}")
-            speak(f"YouTube da {q} ochilmoqda")
-        else:
-            webbrowser.open("https://www.youtube.com"); speak("YouTube ochilmoqda")
-        history.record(cmd,"youtube"); return True
+from modules.reminders        import load_reminders
+# ai_client, classifier, computer_control, animation — kerak bo'lganda yoki
+# warm-up da (fonda) yuklanadi: wake word tinglash ulardan oldin boshlanadi
 
-    if intent == "clipboard":
-        text = get_clipboard()
-        resp = f"Clipboardda: {text[:80]}" if text else "Clipboard bo'sh"
-        speak(resp); history.record(cmd,resp); return True
-
-    if intent == "processes":
-        resp = get_top_processes(); speak(resp[:200]); history.record(cmd,resp); return True
-
-    if intent == "settings":
-        threading.Thread(target=open_settings_window, daemon=True).start()
-        speak("Sozlamalar ochildi"); history.record(cmd,"settings"); return True
-
-    if intent == "history":
-        threading.Thread(target=open_history_window, daemon=True).start()
-        speak("Buyruqlar tarixi ochildi"); history.record(cmd,"history"); return True
-
-    if intent == "dashboard":
-        threading.Thread(target=open_dashboard_window, daemon=True).start()
-        speak("Dashboard ochildi"); history.record(cmd,"dashboard"); return True
-
-    return False
+_T_IMPORTS = time.perf_counter()
 
+_AI_CONFIDENT = 0.75       # Shundan past — tasdiqlash so'raladi, poygada yutmaydi
+_AI_GRACE     = 0.15       # Mahalliy bosqichlar shundan sekin bo'lsa — Claude parallel
 
 # ══════════════════════════════════════════════════════════
 #  AI JAVOBINI BAJARISH  — Bug #7 fix
@@ -300,12 +94,14 @@ def _exec_ai(resp_dict: dict, original: str):
             history.record(original, f"BLOCKED: {reason}"); return
 
         # Ishonch past → tasdiqlash
-        if confidence < 0.75:
+        if confidence < _AI_CONFIDENT:
             speak(f"{speak_text} qilayinmi?")
             confirm = listen_command(timeout=5)
             if not confirm or "ha" not in confirm:
                 speak("Bekor qilindi"); return
 
+        from modules.computer_control import control_computer, take_screenshot, open_app
+        from modules.file_manager     import kill_process
         if   action == "open_app":     open_app(params.get("app",""))
         elif action == "screenshot":   take_screenshot(); return
         elif action == "shutdown":     control_computer("kompyuterni o'chir"); return
@@ -321,6 +117,17 @@ def _exec_ai(resp_dict: dict, original: str):
     history.record(original, speak_text)
 
 
+def _learn(cmd: str, intent: str):
+    """Kalit so'z bilan topilgan buyruq — klassifikator uchun misol"""
+    from modules.classifier import classifier
+    learn_command(cmd, intent, True)
+    classifier.note_learned()
+
+
+def _on_handled(handler, cmd: str):
+    executor.submit(run_as_background, _learn, cmd, handler.name)
+
+
 # ══════════════════════════════════════════════════════════
 #  ASOSIY BUYRUQ QAYTA ISHLASH
 # ══════════════════════════════════════════════════════════
@@ -329,91 +136,98 @@ def process_command(cmd: str) -> bool:
     True  → davom et (ACTIVE yoki BACKGROUND)
     False → BACKGROUND ga o't (stop buyruq)
     """
-    if not cmd: return True
-    cmd = cmd.strip()
+    with tracer.span("process_command"):
+        stages = plan_command(cmd.strip()) if cmd else None
+        # Gap boshi bo'yicha boshlangan prefetch lar: foydali yoki behuda
+        prefetcher.settle([cmd.strip()] if stages is None else
+                          [s.text for st in stages for s in st])
+        if stages is None:
+            return _process_command(cmd)
+        n = sum(len(st) for st in stages)
+        logger.info(f"PLAN: {cmd} → " + " | ".join(" + ".join(s.text for s in st)
+                                                   for st in stages))
+        with tracer.span("plan", steps=n, stages=len(stages)):
+            said = run_plan(stages, _run_step)
+        resp = summarize(said) or "Bajarildi"
+        speak(resp); history.record(cmd, resp)
+        return True
 
-    # ── Stop ──────────────────────────────────────────────
-    if is_stop_command(cmd):
-        speak("Xop, fonga o'tdim. Kerak bo'lsa chaqiring.")
-        history.record(cmd, "BACKGROUND"); return False
 
-    # ── To'xtat (nutq) ────────────────────────────────────
-    if any(w in cmd for w in ["toxta","to'xta","jim bo'l","bas","yetarli"]):
-        stop_speaking(); history.record(cmd,"STOP"); return True
+def _run_step(text: str) -> list[str]:
+    """Reja qadami — alohida thread da, gaplari yig'ib qaytariladi"""
+    with collect_speech() as said, tracer.span("plan.step"):
+        _process_command(text, wait=True)
+    return said
 
-    # ── Ovoz — BIRINCHI (shutdown bilan konflikt yo'q) ────
-    if "ovoz" in cmd and control_volume(cmd):
-        return True
 
-    # ── Kompyuter ─────────────────────────────────────────
-    SYSTEM_WORDS = ["kompyuterni o'chir","hozir o'chir","restart",
-                    "qayta yoq","uxlat","qulfla","o'chirishni bekor"]
-    if any(w in cmd for w in SYSTEM_WORDS):
-        if control_computer(cmd): return True
-
-    # ── Real-time (internet kerak) ────────────────────────
-    rt = needs_realtime(cmd)
-    if rt == "weather":
-        city_m = re.search(r'(\w+)da\s+(?:ob-havo|havo)', cmd)
-        resp   = _weather(city_m.group(1).capitalize() if city_m else CITY_NAME)
-        speak(resp); history.record(cmd, resp); return True
-
-    if rt == "time":
-        resp = _time_str(); speak(resp); history.record(cmd, resp); return True
-
-    if rt == "currency":
-        resp = parse_currency_cmd(cmd); speak(resp); history.record(cmd, resp); return True
-
-    if rt == "news":
-        topic = re.sub(r'\b(yangilik|xabar|news|haqida)\b','',cmd).strip()
-        resp  = get_news_rss(topic if len(topic)>3 else None)
-        speak(resp); history.record(cmd, resp); return True
-
-    # ── Mahalliy intent ───────────────────────────────────
-    intent = match_local_intent(cmd)
-    if intent and _exec(intent, cmd):
-        return True
+def _process_command(cmd: str, fuzzy: bool = True, wait: bool = False) -> bool:
+    """wait=True — sekin handler'lar ham shu thread da (reja qadami javobni yig'adi)"""
+    if not cmd: return True
+    cmd = cmd.strip()
 
-    # ── Saytlar ───────────────────────────────────────────
-    SITES = {
-        "google":    "https://www.google.com",
-        "gmail":     "https://mail.google.com",
-        "instagram": "https://www.instagram.com",
-        "github":    "https://www.github.com",
-        "chatgpt":   "https://chat.openai.com",
-        "tiktok":    "https://www.tiktok.com",
-    }
-    for site, url in SITES.items():
-        if site in cmd:
-            # Google qidiruv
-            if site == "google":
-                m = re.search(r'google(?:\s+da)?\s+(.+?)\s*(?:qidir|search)?$', cmd)
-                if m:
-                    webbrowser.open(f"https://www.google.com/search?q={m.group(1).replace(' ','+')}")
-                    speak(f"{m.group(1)} qidirilmoqda"); history.record(cmd,"google"); return True
-            webbrowser.open(url)
-            speak(f"{site.capitalize()} ochilmoqda")
-            history.record(cmd, site); return True
-
-    # ── Ilova ochish ──────────────────────────────────────
-    if open_app(cmd):
-        history.record(cmd, "app open"); return True
-
-    # ── Telegram kontakt ─────────────────────────────────
-    contacts = load_contacts()
-    if "telegram" in cmd or any(contact_match(n, cmd) for n in contacts):
-        if any(contact_match(n, cmd) for n in contacts):
-            return open_telegram_contact(cmd)
-        open_app("telegram"); return True
-
-    # ── AI fallback ───────────────────────────────────────
-    speak("Bir daqiqa...")
+    # ── Reyestr: stop, ovoz, tizim, real-time, intent, sayt, ilova, kontakt ──
+    with tracer.span("route"):
+        done = route(cmd, speak, history.record, on_handled=_on_handled, wait=wait,
+                     fallback=lambda c: _unrouted(c, fuzzy, wait))
+    if done is not None:
+        return done
+    return _unrouted(cmd, fuzzy, wait)
+
+
+def _unrouted(cmd: str, fuzzy: bool, wait: bool) -> bool:
+    """Reyestr mos kelmadi (yoki fondagi handler SKIP qaytardi) — fuzzy → klassifikator → AI"""
+    # ── Poyga: fuzzy/klassifikator _AI_GRACE da hal qilmasa Claude fonda boshlanadi ──
+    race = None
+    if fuzzy and _ai_race():
+        from modules.ai_client import DeferredAI
+        race = DeferredAI(cmd, _AI_GRACE)
+
+    # ── Fuzzy: noto'g'ri eshitilgan kalit so'z (AI dan oldin, <1 ms) ──
+    if fuzzy:
+        with tracer.span("fuzzy"):
+            fixed = correct_command(cmd)
+        if fixed:
+            logger.info(f"FUZZY: {cmd} → {fixed[0]} ({fixed[1]}: {fixed[2]})")
+            if race: race.cancel()
+            return _process_command(fixed[0], fuzzy=False, wait=wait)
+
+    # ── Oflayn klassifikator — ikkinchi bosqich router ────
+    if fuzzy and not _ai_won(race):
+        from modules.classifier import classifier
+        with tracer.span("classifier"):
+            guess = classifier.predict(cmd)
+        if guess and dispatch(guess[0], cmd, speak, history.record, wait=wait,
+                              fallback=_ask_ai):
+            logger.info(f"CLASSIFIER: {cmd} → {guess[0]} ({guess[1]:.2f})")
+            if race: race.cancel()
+            return True
+
+    # ── AI fallback: fuzzy nomzodi yo'q, klassifikator ishonchi past ──
+    return _ask_ai(cmd, race)
+
+
+def _ask_ai(cmd: str, race=None) -> bool:
+    from modules.ai_client import AIRequest
+    ai = (race and race.start()) or AIRequest(cmd)
+    if not ai.done():
+        speak("Bir daqiqa...")
     state_manager.set(State.PROCESSING)
-    ai_resp = ask_ai(cmd)
+    ai_resp = ai.result()
     _exec_ai(ai_resp, cmd)
     return True
 
 
+def _ai_race() -> bool:
+    from config import AI_RACE
+    return AI_RACE
+
+
+def _ai_won(race) -> bool:
+    """Claude mahalliy bosqichlardan oldin ishonchli javob berdimi (yon ta'sirsiz)"""
+    resp = race.peek() if race else None
+    return resp is not None and float(resp.get("confidence", 0)) >= _AI_CONFIDENT
+
+
 # ══════════════════════════════════════════════════════════
 #  ASOSIY TSIKL
 # ══════════════════════════════════════════════════════════
@@ -431,8 +245,14 @@ def main_loop():
         if current == State.BACKGROUND:
             print("👂 'Jarvis' deng...")
 
+            _first_listen()
             if not listen_wake_word():
-                time.sleep(0.05); continue
+                # Gapirayotgan bo'lsa — tugashi bilan uyg'onish (polling yo'q)
+                if state_manager.is_speaking.is_set():
+                    state_manager.wait_until_not_speaking(timeout=15)
+                else:
+                    time.sleep(0.05)
+                continue
 
             now = time.time()
             if now - _last_wake < _COOLDOWN:
@@ -448,6 +268,8 @@ def main_loop():
         # avtomatik qayta tinglashga kiradi (conversational mode)
         if state_manager.get() in (State.LISTENING, State.IDLE):
             print("🎤 Gapiring...")
+            if tracer.current() is None:          # Davomiy rejim — wake word siz
+                tracer.begin()
             cmd = listen_command(timeout=6, phrase_limit=10)
 
             if cmd:
@@ -455,20 +277,20 @@ def main_loop():
                     # is_stop_command → BACKGROUND
                     state_manager.set(State.BACKGROUND)
                 else:
-                    # Buyruqdan keyin 3s kutib yangi buyruq tinglash
-                    # Javob tugashini kutish
-                    _speech_wait_start = time.time()
-                    while state_manager.is_speaking.is_set():
-                        if time.time() - _speech_wait_start > 15:
-                            break
-                        time.sleep(0.1)
+                    # Javob tugashi bilan darhol yangi buyruq tinglash
+                    state_manager.wait_until_not_speaking(timeout=15)
                     state_manager.set(State.LISTENING)
+                tracer.end()
             else:
                 # Buyruq kelinmadi → BACKGROUND
+                tracer.discard()
                 play_beep(400, 150)
                 state_manager.set(State.BACKGROUND)
 
-        time.sleep(0.05)
+        # ── SPEAKING / PROCESSING: tinglash holatigacha kutish (band sikl yo'q) ──
+        else:
+            state_manager.wait_for_state((State.BACKGROUND, State.LISTENING, State.IDLE),
+                                         timeout=1.0)
 
 
 def main_keyboard():
@@ -479,11 +301,14 @@ def main_keyboard():
 
     while True:
         try:
+            _first_listen()
             cmd = input("👤 Buyruq: ").lower().strip()
             if not cmd: continue
             if is_stop_command(cmd):
                 speak("Xayr! Ko'rishguncha."); break
+            tracer.begin()
             process_command(cmd)
+            tracer.end()
         except KeyboardInterrupt:
             speak("Xayr!"); break
 
@@ -491,14 +316,102 @@ def main_keyboard():
 # ══════════════════════════════════════════════════════════
 #  ISHGA TUSHIRISH
 # ══════════════════════════════════════════════════════════
+_T_LISTEN: float = 0.0
+
+
+def _first_listen():
+    """Birinchi tinglash lahzasi — --profile-startup bo'lsa hisobot va chiqish"""
+    global _T_LISTEN
+    if _T_LISTEN:
+        return
+    _T_LISTEN = time.perf_counter()
+    logger.info(f"Birinchi tinglash: {(_T_LISTEN - _T0) * 1000:.0f} ms")
+    if "--profile-startup" in sys.argv:
+        print_startup_profile()
+        os._exit(0)
+
+
+def _slow_imports(top: int = 12) -> list[tuple[float, str]]:
+    """Alohida jarayonda `python -X importtime -c "import jarvis"` — eng sekin modullar"""
+    import subprocess
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import jarvis"],
+                             cwd=here, capture_output=True, text=True, timeout=60).stderr
+    except (OSError, subprocess.TimeoutExpired):
+        return []
+    rows = []
+    for line in out.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        rows.append((int(parts[1]) / 1000, parts[2].rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def print_startup_profile():
+    """--profile-startup: importlar, init va birinchi tinglashgacha vaqt"""
+    imp  = (_T_IMPORTS - _T0) * 1000
+    init = (_T_LISTEN - _T_IMPORTS) * 1000
+    print(f"\n{'BOSQICH':<36}{'ms':>9}")
+    print(f"{'importlar':<36}{imp:>9.1f}")
+    print(f"{'init (eslatmalar, TTS, warm-up start)':<36}{init:>9.1f}")
+    print(f"{'birinchi tinglashgacha':<36}{imp + init:>9.1f}")
+
+    plugins = loaded()
+    print(f"\n{'PLAGIN / MODUL':<36}{'ms':>9}  yuklanish")
+    for mod, (ms, how) in sorted(plugins.items(), key=lambda kv: -kv[1][0]):
+        print(f"{mod:<36}{ms:>9.1f}  {how}")
+    if not plugins:
+        print("  (hali hech biri — hammasi talab yoki warm-up da)")
+
+    print(f"\n{'ENG SEKIN IMPORTLAR (kumulyativ)':<36}{'ms':>9}")
+    for ms, name in _slow_imports():
+        print(f"{name.strip():<36}{ms:>9.1f}")
+
+
+def _warm_up():
+    """Fonda: plaginlar + AI/klassifikator, keyin klassifikatorni qayta o'qitish"""
+    from modules.plugins import warm_up
+    warm_up(("modules.ai_client", "modules.classifier"))
+    from modules.classifier import classifier
+    classifier.retrain_async()   # learned_commands.json dan, fonda
+
+
+def print_trace_summary():
+    """--trace-summary: logs/traces.jsonl bo'yicha bosqichlar kechikishi"""
+    stats = tracer.summarize_file()
+    if not stats:
+        print("Trace yozuvlari yo'q"); return
+    print(f"{'BOSQICH':<28}{'SONI':>6}{'p50':>9}{'p95':>9}{'p99':>9}{'MAX':>9}  (ms)")
+    for stage, row in sorted(stats.items(), key=lambda kv: -kv[1]["p50"]):
+        print(f"{stage:<28}{row['count']:>6}{row['p50']:>9.1f}{row['p95']:>9.1f}"
+              f"{row['p99']:>9.1f}{row['max']:>9.1f}")
+
+
 if __name__ == "__main__":
+    if "--trace-summary" in sys.argv:
+        print_trace_summary(); sys.exit(0)
+    if "--import-contacts" in sys.argv:
+        from modules.contacts_import import import_contacts
+        i = sys.argv.index("--import-contacts")
+        if i + 1 >= len(sys.argv):
+            print("Foydalanish: python jarvis.py --import-contacts <result.json|kontaktlar.vcf>")
+            sys.exit(1)
+        st = import_contacts(sys.argv[i + 1])
+        print(f"✅ O'qildi: {st['read']}  qo'shildi: {st['added']}  takror: {st['duplicates']}")
+        sys.exit(0)
     ensure_single_instance()
     keyboard_mode = "--keyboard" in sys.argv
+    load_reminders(speak)   # Restartdan oldingi eslatmalar + catch-up
+    executor.submit(run_as_background, _warm_up)
 
     if keyboard_mode:
         main_keyboard()
     else:
         # Animatsiyani alohida threadda ishga tushirish
+        from modules.animation import start_animation
         anim_thread = threading.Thread(target=start_animation, daemon=True)
         anim_thread.start()
         time.sleep(0.8)  # Animatsiya tayyor bo'lguncha kutish
@@ -79,7 +79,7 @@ except Exception:
 sys.path.insert(0, os.path.dirname(__file__))
 
 from modules.core import (
-    State, StateManager, MicGuard, with_timeout,
+    State, StateManager, MicGuard, with_timeout, current_token,
     RateLimiter, SmartCache, TempFileManager,
     state_manager, rate_limiter, smart_cache, temp_manager
 )
@@ -393,17 +393,21 @@ def ask_ai_safe(question: str) -> dict:
 
     def _call_ai():
         client = get_ai_client()  # singleton
+        token  = current_token()
+        token.raise_if_cancelled()
+        left   = token.remaining()
         ai_history.append({"role": "user", "content": question})
         resp = client.messages.create(
             model="claude-haiku-4-5-20251001",
             max_tokens=300,
             system=AI_SYSTEM_PROMPT_V4,
-            messages=ai_history[-8:]  # oxirgi 8 ta
+            messages=ai_history[-8:],  # oxirgi 8 ta
+            timeout=12 if left is None else max(left, 0.1),
         )
         return resp.content[0].text
 
     try:
-        # Bug #2: Timeout — 12 sekunddan ortiq kutmaydi
+        # Bug #2: Timeout — 12 sekunddan ortiq kutmaydi (umumiy executor da)
         raw = with_timeout(_call_ai, timeout_sec=12, default=None)
 
         if raw is None:
@@ -1,9 +1,14 @@
 """
 JARVIS — AI Client
 Claude singleton, rate limiting, timeout, xavfsiz bajarish
+AIRequest — fonda so'rov, DeferredAI — mahalliy router bilan poyga, token hisobi
 """
-import threading
-from modules.core import State, state_manager, rate_limiter, with_timeout
+import threading, time
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeout
+from typing import Optional
+
+from modules.core import (State, state_manager, limiters, executor, current_token, tracer,
+                          Cancelled)
 from modules.nlu import parse_ai_json, validate_ai_response
 
 try:
@@ -15,6 +20,8 @@ _client      = None
 _client_lock = threading.Lock()
 _history     : list[dict] = []
 
+AI_TIMEOUT   = 12.0          # Bug #2: so'rov + HTTP deadline (soniya)
+
 AI_SYSTEM_PROMPT = """Siz JARVIS — Windows kompyuter yordamchisiz.
 Har doim FAQAT JSON formatida javob bering.
 
@@ -53,59 +60,203 @@ def _get_client():
     return _client
 
 
-def ask_ai(question: str) -> dict:
-    """
-    Xavfsiz AI chaqiruv
-    Bug #2: 12s timeout
-    Bug #12: rate limiting
-    """
+def _precheck() -> Optional[dict]:
+    """So'rov yuborib bo'lmasa — tayyor javob (kutubxona, kalit, rate limit)"""
     from config import CLAUDE_API_KEY
-    from modules.logger import logger
-
     if not AN_OK:
         return {"type": "answer", "speak": "AI moduli o'rnatilmagan", "confidence": 0}
     if not CLAUDE_API_KEY or CLAUDE_API_KEY in ("", "YOUR_ANTHROPIC_API_KEY"):
         return {"type": "answer", "speak": "Claude API kaliti sozlanmagan", "confidence": 0}
-
     # Bug #12: Rate limit
-    if not rate_limiter.wait_if_needed(block=False):
+    if not limiters["claude"].try_acquire():
         return {"type": "answer", "speak": "Biroz kuting", "confidence": 0}
+    return None
+
+
+def _call(question: str, req: "AIRequest") -> str:
+    client = _get_client()
+    if not client:
+        raise RuntimeError("Client yo'q")
+    token = current_token()
+    token.raise_if_cancelled()             # Navbatda kutib qolgan: yuborishga arzimaydi
+    left = token.remaining()
+    resp = client.messages.create(
+        model="claude-haiku-4-5-20251001",
+        max_tokens=300,
+        system=AI_SYSTEM_PROMPT,
+        messages=_history[-7:] + [{"role": "user", "content": question}],
+        # HTTP ham deadline da uziladi (0 — "cheksiz" emas, eng kam 0.1 s)
+        timeout=AI_TIMEOUT if left is None else max(left, 0.1),
+    )
+    usage = getattr(resp, "usage", None)
+    req._spent(getattr(usage, "input_tokens", 0) or 0,
+               getattr(usage, "output_tokens", 0) or 0)
+    token.raise_if_cancelled()             # Kech kelgan / yutqazgan javob — tashlab yuboriladi
+    return resp.content[0].text
+
+
+def _error(e: Exception) -> dict:
+    from modules.logger import logger
+    logger.error(f"Claude xatosi: {e}")
+    err = str(e)
+    if "401" in err: return {"type": "answer", "speak": "API kalit noto'g'ri", "confidence": 0}
+    if "429" in err: return {"type": "answer", "speak": "Juda ko'p so'rov, kuting", "confidence": 0}
+    return {"type": "answer", "speak": "Texnik xato yuz berdi", "confidence": 0}
+
+
+# ── Token hisobi ──────────────────────────────────────────
+# wasted_* — javobi ishlatilmagan so'rovlar (poygada yutqazgan yoki kech kelgan)
+_usage = {"calls": 0, "input_tokens": 0, "output_tokens": 0,
+          "cancelled": 0, "cancelled_unsent": 0,
+          "wasted_input_tokens": 0, "wasted_output_tokens": 0}
+_usage_lock = threading.Lock()
+
+
+def _count(**deltas: int):
+    with _usage_lock:
+        for k, v in deltas.items():
+            _usage[k] += v
+
+
+def usage_stats() -> dict[str, int]:
+    """Claude chaqiruvlari va tokenlar, shu jumladan bekor qilinganlarniki"""
+    with _usage_lock:
+        return dict(_usage)
+
+
+class AIRequest:
+    """
+    Fonda ketayotgan Claude so'rovi — mahalliy bosqichlar bilan poyga uchun.
+      • done()   — javob (yoki xato) keldimi
+      • result() — kutish va javob dict i (ask_ai bilan bir xil shakl)
+      • cancel() — mahalliy bosqich yutdi: navbatda bo'lsa yuborilmaydi,
+        yuborilgan bo'lsa javobi tashlanadi va tokenlari behuda deb yoziladi
+    """
 
-    state_manager.set(State.PROCESSING)
-
-    def _call():
-        client = _get_client()
-        if not client:
-            raise RuntimeError("Client yo'q")
-        _history.append({"role": "user", "content": question})
-        resp = client.messages.create(
-            model="claude-haiku-4-5-20251001",
-            max_tokens=300,
-            system=AI_SYSTEM_PROMPT,
-            messages=_history[-8:]
-        )
-        return resp.content[0].text
-
-    try:
-        # Bug #2: 12s timeout
-        raw = with_timeout(_call, timeout_sec=12, default=None)
-
-        if raw is None:
-            return {"type": "answer", "speak": "Internet sekin, qayta urining", "confidence": 0}
-
-        result = parse_ai_json(raw)
-        _history.append({"role": "assistant", "content": raw})
-        logger.info(f"AI: {question[:40]} → {result.get('speak','')[:40]}")
-        return result
-
-    except Exception as e:
-        logger.error(f"Claude xatosi: {e}")
-        err = str(e)
-        if "401" in err: return {"type": "answer", "speak": "API kalit noto'g'ri", "confidence": 0}
-        if "429" in err: return {"type": "answer", "speak": "Juda ko'p so'rov, kuting", "confidence": 0}
-        return {"type": "answer", "speak": "Texnik xato yuz berdi", "confidence": 0}
-    finally:
-        state_manager.set(State.IDLE)
+    def __init__(self, question: str):
+        self.question  = question
+        self._early    = _precheck()
+        self._fut = self._token = None
+        self._result   : Optional[dict] = None
+        self._tokens   : Optional[tuple[int, int]] = None
+        self._cancelled = False
+        self._lock     = threading.Lock()
+        if self._early is None:
+            self._fut, self._token = executor.submit(_call, question, self, timeout=AI_TIMEOUT)
+
+    def done(self) -> bool:
+        return self._fut is None or self._fut.done()
+
+    def peek(self) -> Optional[dict]:
+        """Javob kelgan bo'lsa — uni (tarix/holatga tegmasdan), aks holda None"""
+        if self._early or self._result:
+            return self._early or self._result
+        if not self._fut.done() or self._fut.cancelled() or self._fut.exception():
+            return None
+        return parse_ai_json(self._fut.result())
+
+    def result(self) -> dict:
+        if self._result is None:
+            self._result = self._early or self._wait()
+        return self._result
+
+    def cancel(self):
+        with self._lock:
+            if self._cancelled or self._result is not None or self._fut is None:
+                return
+            self._cancelled = True
+            spent = self._tokens
+        if not self._fut.done():
+            executor.abandon(self._fut, self._token)
+        _count(cancelled=1, cancelled_unsent=int(self._fut.cancelled()))
+        if spent:                              # Javob kelgan, lekin kerak bo'lmadi
+            _count(wasted_input_tokens=spent[0], wasted_output_tokens=spent[1])
+
+    # ── Ichki ─────────────────────────────────────────────
+    def _spent(self, input_tokens: int, output_tokens: int):
+        """Worker thread: javob keldi — tokenlar hisobga"""
+        with self._lock:
+            self._tokens = (input_tokens, output_tokens)
+            wasted = self._cancelled or self._token.cancelled
+        _count(calls=1, input_tokens=input_tokens, output_tokens=output_tokens)
+        if wasted:
+            _count(wasted_input_tokens=input_tokens, wasted_output_tokens=output_tokens)
+
+    def _wait(self) -> dict:
+        from modules.logger import logger
+        state_manager.set(State.PROCESSING)
+        try:
+            # Bug #2: 12s timeout — umumiy executor, thread sizib chiqmaydi
+            with tracer.span("ask_ai"):
+                try:
+                    raw = self._fut.result(self._token.remaining())
+                except FutureTimeout:
+                    executor.abandon(self._fut, self._token)
+                    raw = None
+                except (CancelledError, Cancelled):
+                    raw = None
+
+            if raw is None:
+                return {"type": "answer", "speak": "Internet sekin, qayta urining", "confidence": 0}
+
+            result = parse_ai_json(raw)
+            _history.append({"role": "user", "content": self.question})
+            _history.append({"role": "assistant", "content": raw})
+            logger.info(f"AI: {self.question[:40]} → {result.get('speak','')[:40]}")
+            return result
+
+        except Exception as e:
+            return _error(e)
+        finally:
+            state_manager.set(State.IDLE)
+
+
+class DeferredAI:
+    """
+    Poyga uchun kechiktirilgan so'rov: mahalliy bosqichlar grace soniyada
+    hal qilolmasa, Claude fonda boshlanadi. Ular tez hal qilsa — cancel(),
+    hech narsa yuborilmaydi (token sarflanmaydi).
+    """
+
+    def __init__(self, question: str, grace: float):
+        from modules.scheduler import scheduler
+        self.question = question
+        self.request  : Optional[AIRequest] = None
+        self._closed  = False
+        self._lock    = threading.Lock()
+        self._key     = ("ai_race", id(self))
+        scheduler.schedule(self._key, time.time() + grace, self.start)
+
+    def start(self) -> Optional[AIRequest]:
+        """Hozir boshlash (grace tugadi yoki mahalliy ishonch past)"""
+        from modules.scheduler import scheduler
+        scheduler.cancel(self._key)
+        with self._lock:
+            if self.request is None and not self._closed:
+                self.request = AIRequest(self.question)
+            return self.request
+
+    def peek(self) -> Optional[dict]:
+        return self.request.peek() if self.request else None
+
+    def cancel(self):
+        """Mahalliy bosqich yutdi"""
+        from modules.scheduler import scheduler
+        scheduler.cancel(self._key)
+        with self._lock:
+            self._closed = True
+            req = self.request
+        if req:
+            req.cancel()
+
+
+def ask_ai(question: str) -> dict:
+    """
+    Xavfsiz AI chaqiruv
+    Bug #2: 12s timeout
+    Bug #12: rate limiting
+    """
+    return AIRequest(question).result()
 
 
 def clear_history():
@@ -670,6 +670,32 @@ class _JarvisAPI:
         return [{"time_left": format_time_left(s), "msg": msg}
                 for _, s, msg in list_reminders()]
 
+    def get_cache_stats(self):
+        from modules.core import smart_cache
+        return [dict(category=cat, **row)
+                for cat, row in sorted(smart_cache.stats().items())]
+
+    def get_prefetch_stats(self):
+        from modules.prefetch import prefetcher
+        return prefetcher.stats()
+
+    def get_ai_stats(self):
+        from modules.ai_client import usage_stats
+        return usage_stats()
+
+    def get_executor_stats(self):
+        from modules.core import executor
+        return executor.gauges()
+
+    def get_trace_stats(self):
+        from modules.core import tracer
+        return [dict(stage=stage, **row)
+                for stage, row in sorted(tracer.stats().items())]
+
+    def get_handler_stats(self):
+        from modules.command_router import stats
+        return stats()
+
     def get_tasks(self):
         from modules.memory_manager import get_tasks
         tasks = get_tasks(only_pending=False)
@@ -800,6 +826,41 @@ def _open_dashboard_tkinter(parent=None):
                 n2=(p.info.get("name")or"?")[:20]; m=round(p.info.get("memory_percent")or 0,1)
                 st.insert("end",f"  {n2:<20} RAM:{m}%\n",
                           "r" if m>10 else "w" if m>5 else "d")
+            from modules.core import smart_cache, executor, tracer
+            g = executor.gauges()
+            st.insert("end","── EXECUTOR ──\n","h")
+            st.insert("end",f"  ishlayapti:{g['running']}/{g['workers']}  navbat:{g['queued']}  "
+                            f"timeout:{g['timed_out']}  sizgan:{g['leaked']}\n",
+                      "r" if g["leaked"] else "d")
+            from modules.ai_client import usage_stats
+            u = usage_stats()
+            st.insert("end",f"  claude:{u['calls']}  token:{u['input_tokens']}+{u['output_tokens']}  "
+                            f"bekor:{u['cancelled']}  behuda:{u['wasted_input_tokens']}"
+                            f"+{u['wasted_output_tokens']}\n",
+                      "w" if u["wasted_output_tokens"] else "d")
+            st.insert("end","── KESH ──\n","h")
+            for cat,row in sorted(smart_cache.stats().items()):
+                tot=row["hits"]+row["misses"]
+                hr=round(100*row["hits"]/tot) if tot else 0
+                st.insert("end",f"  {cat:<10} {row['entries']:>3} ta  hit:{hr}%  "
+                                f"ev:{row['evictions']}  {row['bytes']//1024}KB\n",
+                          "g" if hr>=50 else "d")
+            from modules.prefetch import prefetcher
+            pf = prefetcher.stats()
+            st.insert("end",f"  prefetch   {pf['started']:>3} ta  foydali:{pf['used']}  "
+                            f"behuda:{pf['wasted']}\n",
+                      "w" if pf["wasted"] > pf["used"] else "d")
+            st.insert("end","── KECHIKISH (ms) ──\n","h")
+            for stage,row in sorted(tracer.stats().items()):
+                st.insert("end",f"  {stage[:24]:<24} p50:{row['p50']:.0f}  p95:{row['p95']:.0f}  "
+                                f"p99:{row['p99']:.0f}\n",
+                          "r" if row["p95"]>3000 else "w" if row["p95"]>1000 else "d")
+            from modules.command_router import stats as handler_stats
+            st.insert("end","── HANDLERLAR ──\n","h")
+            for row in handler_stats()[:10]:
+                st.insert("end",f"  {row['name'][:14]:<14} {row['calls']:>4}x  p50:{row['p50']:.0f}  "
+                                f"p95:{row['p95']:.0f}  xato:{row['errors']}  kech:{row['late']}\n",
+                          "r" if row["errors"] else "w" if row["p95"]>1000 else "d")
             st.config(state="disabled")
         except Exception as e:
             st.config(state="normal"); st.insert("end",f"Xato: {e}\n"); st.config(state="disabled")
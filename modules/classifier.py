@@ -0,0 +1,264 @@
+"""
+JARVIS — Oflayn intent klassifikatori (ikkinchi bosqich router)
+
+learned_commands.json dagi haqiqiy buyruqlardan o'rganadi:
+  • Vektorizator — hash lab qo'yilgan belgi n-gramlari (2–4), L2 normallangan
+  • Model       — ko'p sinfli logistik regressiya (softmax), NumPy da
+Kalit so'zlar topa olmagan buyruq Claude ga ketishidan oldin shu yerdan
+o'tadi; ishonch yetarli bo'lsa — mahalliy bajariladi.
+
+Qayta o'qitish fonda (executor, BACKGROUND ustuvorligi) — model tayyor
+bo'lgach atomar almashtiriladi.
+
+Foydalanish:
+    from modules.classifier import classifier
+    classifier.retrain_async()
+    classifier.predict("skrinshot olib ber")  → ("screenshot", 0.99) yoki None
+"""
+import os, json, time, zlib, random, threading
+from typing import Optional
+
+try:
+    import numpy as np
+    NP_OK = True
+except ImportError:
+    np = None; NP_OK = False
+
+from modules.logger import logger
+
+_DIM       = 1 << 14      # Hash fazosi
+_NGRAMS    = (2, 3, 4)
+_MIN_PROB  = 0.80         # Shundan past — Claude ga
+_RETRAIN_N = 20           # Shuncha yangi misoldan keyin fonda qayta o'qitish
+
+
+# ══════════════════════════════════════════════════════════
+#  VEKTORIZATOR
+# ══════════════════════════════════════════════════════════
+def _features(text: str) -> dict[int, float]:
+    """Belgi n-gramlari → {hash indeksi: og'irlik}; crc32 — jarayonlar orasida barqaror"""
+    s = f" {' '.join(text.lower().split())} "
+    feats: dict[int, float] = {}
+    for n in _NGRAMS:
+        for i in range(len(s) - n + 1):
+            h = zlib.crc32(s[i:i + n].encode("utf-8")) % _DIM
+            feats[h] = feats.get(h, 0.0) + 1.0
+    norm = sum(v * v for v in feats.values()) ** 0.5 or 1.0
+    return {h: v / norm for h, v in feats.items()}
+
+
+def _vectorize(texts: list[str]):
+    """Siyrak (CSR) ko'rinish: indptr, indices, values"""
+    indptr, indices, values = [0], [], []
+    for t in texts:
+        f = _features(t)
+        indices.extend(f.keys())
+        values.extend(f.values())
+        indptr.append(len(indices))
+    return (np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64),
+            np.asarray(values, dtype=np.float32))
+
+
+# ══════════════════════════════════════════════════════════
+#  MODEL
+# ══════════════════════════════════════════════════════════
+class _Softmax:
+    """W: (_DIM, C), b: (C,) — to'liq batch gradient + Adam, L2 regularizatsiya"""
+    def __init__(self, labels: list[str]):
+        self.labels = labels
+        self.W = np.zeros((_DIM, len(labels)), dtype=np.float32)
+        self.b = np.zeros(len(labels), dtype=np.float32)
+
+    @staticmethod
+    def _scores(W, b, X) -> "np.ndarray":
+        indptr, indices, values = X
+        rows = W[indices] * values[:, None]
+        out  = np.zeros((len(indptr) - 1, W.shape[1]), dtype=np.float32)
+        nz   = np.diff(indptr) > 0
+        out[nz] = np.add.reduceat(rows, indptr[:-1][nz], axis=0)
+        return out + b
+
+    @staticmethod
+    def _softmax(z):
+        z = z - z.max(axis=1, keepdims=True)
+        e = np.exp(z)
+        return e / e.sum(axis=1, keepdims=True)
+
+    def fit(self, X, y, weights, epochs: int = 300, lr: float = 0.2, l2: float = 1e-5):
+        indptr, indices, values = X
+        n, C = len(y), len(self.labels)
+        # Faqat o'qitishda uchragan hash lar o'zgaradi — ixcham W ustida ishlash
+        used, cols = np.unique(indices, return_inverse=True)
+        U  = len(used)
+        Xc = (indptr, cols, values)
+        W  = self.W[used].copy()
+        b  = self.b
+        Y  = np.zeros((n, C), dtype=np.float32)
+        Y[np.arange(n), y] = 1.0
+        sw   = (weights / weights.sum()).astype(np.float32)[:, None]
+        row  = np.repeat(np.arange(n), np.diff(indptr))
+        mW, vW = np.zeros_like(W), np.zeros_like(W)
+        mb, vb = np.zeros_like(b), np.zeros_like(b)
+        b1, b2, eps = 0.9, 0.999, 1e-8
+        for t in range(1, epochs + 1):
+            G  = (self._softmax(self._scores(W, b, Xc)) - Y) * sw    # (n, C)
+            Gv = G[row] * values[:, None]                            # (nnz, C)
+            gW = np.stack([np.bincount(cols, weights=Gv[:, c], minlength=U)
+                           for c in range(C)], axis=1).astype(np.float32)
+            gW += l2 * W
+            gb  = G.sum(axis=0)
+            for p, g, m, v in ((W, gW, mW, vW), (b, gb, mb, vb)):
+                m *= b1; m += (1 - b1) * g
+                v *= b2; v += (1 - b2) * g * g
+                p -= lr * (m / (1 - b1 ** t)) / (np.sqrt(v / (1 - b2 ** t)) + eps)
+        self.W[used] = W
+
+    def predict_proba(self, text: str) -> "np.ndarray":
+        f = _features(text)
+        if not f:
+            return self._softmax(self.b[None, :])[0]
+        idx = np.fromiter(f.keys(), dtype=np.int64, count=len(f))
+        val = np.fromiter(f.values(), dtype=np.float32, count=len(f))
+        z   = val @ self.W[idx] + self.b
+        return self._softmax(z[None, :])[0]
+
+
+# ══════════════════════════════════════════════════════════
+#  KLASSIFIKATOR
+# ══════════════════════════════════════════════════════════
+def load_samples(path: Optional[str] = None) -> list[tuple[str, str, float]]:
+    """learned_commands.json → [(buyruq, intent, og'irlik)]; muvaffaqiyatsizlar tashlanadi"""
+    from modules.learner import LEARNED_FILE
+    try:
+        with open(path or LEARNED_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return [(cmd, row["intent"], float(row.get("success", 0)))
+            for cmd, row in data.items()
+            if isinstance(row, dict) and row.get("intent") and row.get("success", 0) > 0]
+
+
+def train_model(samples: list[tuple[str, str, float]]) -> Optional[_Softmax]:
+    labels = sorted({s[1] for s in samples})
+    if not NP_OK or len(labels) < 2:
+        return None
+    model = _Softmax(labels)
+    pos   = {l: i for i, l in enumerate(labels)}
+    X = _vectorize([s[0] for s in samples])
+    y = np.asarray([pos[s[1]] for s in samples], dtype=np.int64)
+    # Ko'p takrorlangan buyruq ko'proq og'irlik oladi, lekin ustun kelmasin
+    w = np.log1p(np.asarray([s[2] for s in samples], dtype=np.float32))
+    model.fit(X, y, w)
+    return model
+
+
+def evaluate(samples: list[tuple[str, str, float]], test_frac: float = 0.2,
+             seed: int = 0) -> dict:
+    """
+    Ajratilgan (held-out) qism bo'yicha: har intent uchun precision/recall,
+    makro o'rtacha, ishonch chegarasidagi qamrov va bitta predict kechikishi.
+    """
+    rnd  = random.Random(seed)
+    rows = samples[:]
+    rnd.shuffle(rows)
+    cut   = max(1, int(len(rows) * test_frac))
+    test, train = rows[:cut], rows[cut:]
+    model = train_model(train)
+    if model is None:
+        return {}
+
+    tp: dict[str, int] = {}; fp: dict[str, int] = {}; fn: dict[str, int] = {}
+    covered = correct_cov = 0
+    t0 = time.perf_counter()
+    for text, gold, _ in test:
+        p    = model.predict_proba(text)
+        i    = int(p.argmax())
+        pred = model.labels[i]
+        if pred == gold: tp[gold] = tp.get(gold, 0) + 1
+        else:
+            fp[pred] = fp.get(pred, 0) + 1
+            fn[gold] = fn.get(gold, 0) + 1
+        if p[i] >= _MIN_PROB:
+            covered += 1
+            correct_cov += pred == gold
+    latency = (time.perf_counter() - t0) / len(test)
+
+    per = {}
+    for l in sorted({s[1] for s in test} | set(fp)):
+        t, f_p, f_n = tp.get(l, 0), fp.get(l, 0), fn.get(l, 0)
+        per[l] = {"precision": t / (t + f_p) if t + f_p else 0.0,
+                  "recall":    t / (t + f_n) if t + f_n else 0.0,
+                  "support":   t + f_n}
+    gold_labels = [l for l in per if per[l]["support"]]
+    return {
+        "train": len(train), "test": len(test),
+        "accuracy":  sum(tp.values()) / len(test),
+        "precision": sum(per[l]["precision"] for l in gold_labels) / len(gold_labels),
+        "recall":    sum(per[l]["recall"] for l in gold_labels) / len(gold_labels),
+        "coverage":  covered / len(test),                 # ishonch >= _MIN_PROB
+        "precision_at_threshold": correct_cov / covered if covered else 0.0,
+        "latency_us": latency * 1e6,
+        "per_intent": per,
+    }
+
+
+class IntentClassifier:
+    def __init__(self):
+        self._model   : Optional[_Softmax] = None
+        self._lock    = threading.Lock()
+        self._training = False
+        self._pending = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._model is not None
+
+    def predict(self, cmd: str, min_prob: float = _MIN_PROB) -> Optional[tuple[str, float]]:
+        """(intent, ehtimollik) — ishonch yetarli bo'lsa, aks holda None"""
+        model = self._model
+        if model is None:
+            return None
+        p = model.predict_proba(cmd)
+        i = int(p.argmax())
+        return (model.labels[i], float(p[i])) if p[i] >= min_prob else None
+
+    def retrain(self) -> bool:
+        """Sinxron o'qitish (fon thread ichida chaqiriladi)"""
+        t0 = time.perf_counter()
+        try:
+            samples = load_samples()
+            model   = train_model(samples)
+            if model is not None:
+                with self._lock:
+                    self._model = model  # Atomar almashtirish
+        finally:
+            with self._lock:
+                self._training = False   # Xatoda ham — keyingi retrain_async bloklanmasin
+        if model is not None:
+            logger.info(f"Klassifikator: {len(samples)} misol, {len(model.labels)} intent, "
+                        f"{(time.perf_counter() - t0) * 1e3:.0f} ms")
+        return model is not None
+
+    def retrain_async(self):
+        """Fonda qayta o'qitish; bir vaqtda faqat bittasi"""
+        if not NP_OK:
+            return
+        with self._lock:
+            if self._training:
+                return
+            self._training, self._pending = True, 0
+        from modules.core import executor, run_as_background
+        executor.submit(run_as_background, self.retrain)
+
+    def note_learned(self):
+        """learn_command dan keyin: yetarli yangi misol yig'ilsa — qayta o'qitish"""
+        with self._lock:
+            self._pending += 1
+            due = self._pending >= _RETRAIN_N
+        if due:
+            self.retrain_async()
+
+
+# ── Singleton ─────────────────────────────────────────────
+classifier = IntentClassifier()
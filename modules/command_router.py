@@ -1,13 +1,41 @@
 """
 JARVIS — Buyruq Router
 
-Handler'larni kalit so'zlar orqali ro'yxatdan o'tkazadi va buyruqni
-moslashtiradi. process_command() ni 50+ if/elif bloklardan xalos qiladi.
+Handler'larni nom, kalit so'zlar va ustuvorlik bilan ro'yxatdan o'tkazadi
+va buyruqni moslashtiradi. process_command() ni 50+ if/elif bloklardan
+xalos qiladi.
+
+Indekslar:
+  • nom → handler            — hash (intent nomi, klassifikator, AI)
+  • butun buyruq → handler   — hash (exact=True kalit so'zlar)
+  • substring kalit so'zlar  — bitta Aho-Corasick avtomati (modules/matcher)
+  • tashqi manbalar          — add_source(): masalan nlu.scan_keywords
+                               topgan intent/realtime yorliqlari → handler nomi
+  • when= predikatlar        — kalit so'z bilan ifodalab bo'lmaydiganlar
+                               (kontakt, stop juftliklari)
+Nomzodlar ustuvorlik bo'yicha (kichik — oldin) sinaladi; handler SKIP
+qaytarsa — keyingisiga o'tiladi.
+
+Har bir handler uchun: chaqiruvlar soni, xatolar, p50/p95 kechikish
+(oxirgi _WINDOW ta) — stats() orqali dashboard ga.
+
+Sekin handler'lar (deadline= berilgan: tarmoq so'rovlari) umumiy executor
+da bajariladi — route() darhol qaytadi, tinglash tsikli bloklanmaydi.
+Natija kelganda aytiladi, agar:
+  • deadline o'tmagan bo'lsa (kech natija tashlanadi; deadline da
+    "javob kechikdi" deyiladi va vazifa bekor qilinadi)
+  • eskirmagan bo'lsa — shu handler ga yangi buyruq yoki cancel_pending()
+    ("to'xta", stop) oldingi natijani bekor qiladi
+Bunday handler matn qaytarishi kerak (o'zi speak qilmaydi).
+
+plugin("modules.plugins.info:h_weather", ...) — handler moduli birinchi
+chaqiruvda import qilinadi (when= ham "modul:funksiya" bo'lishi mumkin);
+import vaqtlari loaded() da.
 
 Foydalanish:
-    from modules.command_router import register, route
+    from modules.command_router import register, route, SKIP
 
-    @register("soat", "vaqt", "nechchi")
+    @register("soat", "vaqt", "nechchi", name="time", priority=40)
     def handle_time(cmd: str) -> str | None:
         return get_time()
 
@@ -15,63 +43,400 @@ Foydalanish:
 """
 from __future__ import annotations
 
+import time
 import logging
-from typing import Callable
+import importlib
+import itertools
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Callable, Iterable, Optional
+
+from modules.matcher import Automaton
 
 logger = logging.getLogger("jarvis")
 
-# ── Handler turi ─────────────────────────────────────────────────────
-# (keywords_tuple, handler_fn, exact_match)
-# exact_match=True: faqat bitta kalit so'z bo'lsa emas, birorta bo'lsa
-_handlers: list[tuple[tuple[str, ...], Callable[[str], str | None | bool], bool]] = []
+SKIP = object()          # Handler: "bu buyruq menga emas" → keyingi nomzod
+_WINDOW = 512            # Kechikish statistikasi uchun oxirgi namunalar
+_DEFAULT_PRIORITY = 100
+
+
+class Handler:
+    __slots__ = ("name", "fn", "keywords", "exact", "priority", "when", "learn",
+                 "deadline", "order", "calls", "errors", "late", "dropped", "_lat", "_lock")
+
+    def __init__(self, name: str, fn: Callable, keywords: tuple[str, ...], exact: bool,
+                 priority: int, when: Optional[Callable[[str], object]], learn: bool,
+                 deadline: Optional[float], order: int):
+        self.name, self.fn, self.keywords, self.exact = name, fn, keywords, exact
+        self.priority, self.when, self.learn, self.order = priority, when, learn, order
+        self.deadline = deadline
+        self.calls = self.errors = self.late = self.dropped = 0
+        self._lat  : deque = deque(maxlen=_WINDOW)
+        self._lock = threading.Lock()
+
+    def observe(self, ms: float, failed: bool):
+        with self._lock:
+            self.calls += 1
+            self.errors += failed
+            self._lat.append(ms)
+
+    def count(self, field: str):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def stats(self) -> dict:
+        """{name, priority, calls, errors, late, dropped, p50, p95} — millisekundlarda"""
+        with self._lock:
+            v = sorted(self._lat)
+            row = {"name": self.name, "priority": self.priority, "calls": self.calls,
+                   "errors": self.errors, "late": self.late, "dropped": self.dropped}
+        pick = lambda q: round(v[min(len(v) - 1, int(q * len(v)))], 1) if v else 0.0
+        return dict(row, p50=pick(0.50), p95=pick(0.95))
+
+    def __repr__(self):
+        return f"Handler({self.name!r}, priority={self.priority})"
+
+
+class _Lazy:
+    """ "modul:funksiya" — birinchi chaqiruvda import qilinadi"""
+    __slots__ = ("target", "_fn")
+
+    def __init__(self, target: str):
+        self.target, self._fn = target, None
+
+    def __call__(self, *args):
+        fn = self._fn
+        if fn is None:
+            mod, attr = self.target.split(":")
+            fn = self._fn = getattr(load_module(mod), attr)
+        return fn(*args)
+
+    @property
+    def __name__(self) -> str:
+        return self.target.rsplit(":", 1)[-1]
+
 
+_loads      : dict[str, tuple[float, str]] = {}     # modul → (ms, "talab" | "fon")
+_loads_lock = threading.Lock()
 
-def register(*keywords: str, exact: bool = False):
+
+def load_module(mod: str, how: str = "talab"):
+    """Modulni import qilish va birinchi yuklanish vaqtini yozib qo'yish"""
+    t0 = time.perf_counter()
+    module = importlib.import_module(mod)
+    ms = (time.perf_counter() - t0) * 1000
+    with _loads_lock:
+        if mod not in _loads:
+            _loads[mod] = (ms, how)
+            logger.info(f"Plagin yuklandi: {mod} ({how}, {ms:.0f} ms)")
+    return module
+
+
+def loaded() -> dict[str, tuple[float, str]]:
+    with _loads_lock:
+        return dict(_loads)
+
+
+# ── Reyestr ──────────────────────────────────────────────────────────
+_handlers  : dict[str, Handler] = {}                 # nom → handler
+_exact     : dict[str, list[Handler]] = {}           # butun buyruq → handler lar
+_guarded   : list[Handler] = []                      # when= bor, kalit so'zsiz
+_sources   : list[Callable[[str], Iterable[str]]] = []
+_automaton : Optional[Automaton] = None
+_reg_lock  = threading.Lock()
+
+
+def register(*keywords: str, name: Optional[str] = None, priority: int = _DEFAULT_PRIORITY,
+             exact: bool = False, when: Optional[Callable[[str], object]] = None,
+             learn: bool = False, deadline: Optional[float] = None):
     """
-    Decorator: handler funksiyani belgilangan kalit so'zlar bilan bog'laydi.
+    Decorator: handler funksiyani kalit so'zlar / predikat bilan bog'laydi.
+
+      name     — reyestrdagi nom (intent nomi bilan bir xil bo'lsa,
+                 dispatch() va add_source() shu nom bilan topadi)
+      exact    — kalit so'z butun buyruqqa teng bo'lishi kerak
+      when     — qo'shimcha shart; kalit so'zsiz bo'lsa — har buyruqda sinaladi
+      learn    — muvaffaqiyatli bajarilsa route() ning on_handled ga xabar
+      deadline — soniya; berilsa handler executor da, natija kelganda aytiladi
 
     Handler qaytarishi mumkin:
       - str       → speak + record qilinadi
-      - None      → hech narsa qilmaydi (handler o'zi speak qiladi)
+      - None/True → bajarildi (handler o'zi speak qiladi)
       - False     → dasturni yopish signali (exit buyruqlari uchun)
+      - SKIP      → mos kelmadi, keyingi nomzod sinaladi
     """
     def decorator(fn: Callable) -> Callable:
-        _handlers.append((keywords, fn, exact))
+        global _automaton
+        key = name or fn.__name__
+        with _reg_lock:
+            if key in _handlers:
+                _unindex(_handlers[key])
+            h = Handler(key, fn, tuple(k.lower() for k in keywords), exact,
+                        priority, when, learn, deadline, len(_handlers))
+            _handlers[key] = h
+            if exact:
+                for kw in h.keywords:
+                    _exact.setdefault(kw, []).append(h)
+            elif not h.keywords and when is not None:
+                _guarded.append(h)
+                _guarded.sort(key=_rank)
+            _automaton = None                # Keyingi route() da qayta kompilyatsiya
         return fn
     return decorator
 
 
+def plugin(target: str, *keywords: str, name: Optional[str] = None, **opts):
+    """register() ning kechiktirilgan varianti: handler "modul:funksiya" qatori"""
+    when = opts.pop("when", None)
+    if isinstance(when, str):
+        when = _Lazy(when)
+    register(*keywords, name=name or target.rsplit(":", 1)[-1], when=when, **opts)(_Lazy(target))
+
+
+def _unindex(h: Handler):
+    for kw in h.keywords if h.exact else ():
+        _exact[kw] = [x for x in _exact.get(kw, []) if x is not h]
+    if h in _guarded:
+        _guarded.remove(h)
+
+
+def _rank(h: Handler) -> tuple[int, int]:
+    return (h.priority, h.order)
+
+
+def add_source(fn: Callable[[str], Iterable[str]]):
+    """Tashqi moslashtiruvchi: buyruq → handler nomlari (noma'lumlari e'tiborsiz)"""
+    _sources.append(fn)
+
+
+def _compile() -> Automaton:
+    global _automaton
+    with _reg_lock:
+        if _automaton is None:
+            ac = Automaton()
+            for h in _handlers.values():
+                if not h.exact:
+                    for kw in h.keywords:
+                        ac.add(kw, "handler", h.name, h.priority)
+            _automaton = ac.build()
+        return _automaton
+
+
+def get(name: str) -> Optional[Handler]:
+    return _handlers.get(name)
+
+
+def candidates(cmd: str) -> list[Handler]:
+    """Mos kelishi mumkin bo'lgan handler lar — ustuvorlik tartibida"""
+    low   = cmd.lower().strip()
+    found : dict[str, Handler] = {}
+    for h in _exact.get(low, ()):
+        found[h.name] = h
+    for _, label, _ in _compile().matches(low):
+        found.setdefault(label, _handlers[label])
+    for source in _sources:
+        for label in source(cmd):
+            h = _handlers.get(label)
+            if h is not None:
+                found.setdefault(label, h)
+    for h in _guarded:
+        found.setdefault(h.name, h)
+    return sorted(found.values(), key=_rank)
+
+
+def _invoke(h: Handler, cmd: str) -> tuple[object, Optional[Exception]]:
+    """Handler ni chaqirish + statistika; (natija, xato)"""
+    t0 = time.perf_counter()
+    result, error = None, None
+    try:
+        result = h.fn(cmd)
+    except Exception as e:
+        logger.error(f"Handler xatosi [{h.name}]: {e}")
+        error = e
+    h.observe((time.perf_counter() - t0) * 1000, error is not None)
+    return result, error
+
+
+def _deliver(cmd: str, result: object, error: Optional[Exception],
+             speak_fn: Callable[[str], None], record_fn: Callable[[str, str], None]):
+    if error is not None:
+        speak_fn("Buyruqni bajarishda xato yuz berdi")
+        record_fn(cmd, f"[xato: {error}]")
+        return True
+    if result is SKIP or result is False:
+        return result
+    if isinstance(result, str):
+        speak_fn(result)
+        record_fn(cmd, result)
+    return True
+
+
+def _call(h: Handler, cmd: str, speak_fn: Callable[[str], None],
+          record_fn: Callable[[str, str], None]):
+    return _deliver(cmd, *_invoke(h, cmd), speak_fn, record_fn)
+
+
+# ══════════════════════════════════════════════════════════
+#  FONDA BAJARISH — deadline + eskirish
+# ══════════════════════════════════════════════════════════
+class _Job:
+    __slots__ = ("id", "handler", "cmd", "fut", "token")
+
+    def __init__(self, id_: int, handler: Handler, cmd: str):
+        self.id, self.handler, self.cmd = id_, handler, cmd
+        self.fut = self.token = None
+
+
+_jobs      : dict[int, _Job] = {}
+_jobs_lock = threading.Lock()
+_job_ids   = itertools.count(1)
+
+
+def _start(h: Handler, cmd: str, speak_fn: Callable[[str], None],
+           record_fn: Callable[[str, str], None],
+           on_handled: Optional[Callable[[Handler, str], None]],
+           on_skip: Optional[Callable[[], None]] = None):
+    from modules.core import executor
+    from modules.scheduler import scheduler
+    _supersede(lambda j: j.handler is h)           # Shu handler ning eski natijasi kerak emas
+    job = _Job(next(_job_ids), h, cmd)
+
+    def done(fut: Future):
+        scheduler.cancel(("handler", job.id))
+        with _jobs_lock:
+            live = _jobs.pop(job.id, None) is job
+        if not live or fut.cancelled():            # Eskirgan / _expire allaqachon aytgan
+            return
+        if job.token.cancelled:                    # Deadline o'tdi, _expire hali ishlamadi
+            h.count("late")
+            logger.info(f"ROUTER: [{h.name}] '{cmd}' kech keldi — tashlandi")
+            return
+        try:
+            result, error = fut.result()
+        except Exception as e:                     # Cancelled va h.k.
+            result, error = None, e
+        delivered = _deliver(cmd, result, error, speak_fn, record_fn)
+        if delivered is SKIP:                      # Fonda "meniki emas" — keyingi yo'l
+            if on_skip is not None:
+                on_skip()
+        elif delivered is True and error is None:
+            if on_handled and h.learn:
+                on_handled(h, cmd)
+
+    with _jobs_lock:
+        _jobs[job.id] = job
+        job.fut, job.token = executor.submit(_invoke, h, cmd, timeout=h.deadline)
+    job.fut.add_done_callback(done)
+    scheduler.schedule(("handler", job.id), time.time() + h.deadline, _expire, job.id,
+                       speak_fn, record_fn)
+
+
+def _expire(job_id: int, speak_fn: Callable[[str], None],
+            record_fn: Callable[[str, str], None]):
+    """Deadline: hali ishlayotgan bo'lsa — bekor qilish va foydalanuvchiga aytish"""
+    from modules.core import executor
+    with _jobs_lock:
+        job = _jobs.pop(job_id, None)
+    if job is None:
+        return
+    executor.abandon(job.fut, job.token)
+    job.handler.count("late")
+    logger.warning(f"ROUTER: [{job.handler.name}] '{job.cmd}' {job.handler.deadline:.1f} s da tugamadi")
+    speak_fn("Javob kechikdi, keyinroq urinib ko'ring")
+    record_fn(job.cmd, f"[{job.handler.name}: deadline]")
+
+
+def _supersede(match: Callable[[_Job], bool]) -> int:
+    from modules.core import executor
+    with _jobs_lock:
+        stale = [j for j in _jobs.values() if match(j)]
+        for j in stale:
+            del _jobs[j.id]
+    for j in stale:
+        executor.abandon(j.fut, j.token)
+        j.handler.count("dropped")
+        logger.info(f"ROUTER: [{j.handler.name}] '{j.cmd}' — eskirdi")
+    return len(stale)
+
+
+def cancel_pending() -> int:
+    """Barcha kutilayotgan natijalarni bekor qilish ("to'xta", stop)"""
+    return _supersede(lambda j: True)
+
+
+def pending() -> list[tuple[str, str]]:
+    """[(handler, buyruq)] — hali javobi kelmaganlar"""
+    with _jobs_lock:
+        return [(j.handler.name, j.cmd) for j in _jobs.values()]
+
+
+def _walk(hs: list[Handler], cmd: str, speak_fn: Callable[[str], None],
+          record_fn: Callable[[str, str], None],
+          on_handled: Optional[Callable[[Handler, str], None]],
+          wait: bool, fallback: Optional[Callable[[str], object]]) -> bool | None:
+    for i, h in enumerate(hs):
+        if h.when is not None and not h.when(cmd):
+            continue
+        if h.deadline is not None and not wait:
+            rest = hs[i + 1:]
+            _start(h, cmd, speak_fn, record_fn, on_handled,
+                   lambda: _resume(rest, cmd, speak_fn, record_fn, on_handled, fallback))
+            return True
+        result = _call(h, cmd, speak_fn, record_fn)
+        if result is SKIP:
+            continue
+        if on_handled and h.learn and result is True:
+            on_handled(h, cmd)
+        return result
+    return None
+
+
+def _resume(rest: list[Handler], cmd: str, speak_fn: Callable[[str], None],
+            record_fn: Callable[[str, str], None],
+            on_handled: Optional[Callable[[Handler, str], None]],
+            fallback: Optional[Callable[[str], object]]):
+    """Fondagi handler SKIP qaytardi — qolgan nomzodlar, ular ham yo'q bo'lsa fallback"""
+    if _walk(rest, cmd, speak_fn, record_fn, on_handled, False, fallback) is None:
+        if fallback is not None:
+            fallback(cmd)
+
+
 def route(cmd: str, speak_fn: Callable[[str], None],
-          record_fn: Callable[[str, str], None]) -> bool | None:
+          record_fn: Callable[[str, str], None],
+          on_handled: Optional[Callable[[Handler, str], None]] = None,
+          wait: bool = False,
+          fallback: Optional[Callable[[str], object]] = None) -> bool | None:
     """
     Buyruqni mos handler'ga yo'naltiradi.
+    wait=True — deadline li handler ham shu thread da (reja qadamlari uchun).
+    fallback  — fonda boshlangan handler SKIP qaytarib, boshqa nomzod ham
+                topilmasa chaqiriladi (None qaytgandagi yo'l — AI fallback)
 
     Qaytaradi:
-      True  → buyruq topildi va bajarildi, davom et
+      True  → buyruq topildi va bajarildi (yoki fonda boshlandi), davom et
       False → chiqish kerak
       None  → hech bir handler mos kelmadi (AI fallback uchun)
     """
-    low = cmd.lower()
-    for keywords, fn, exact in _handlers:
-        if exact:
-            matched = any(low == kw for kw in keywords)
-        else:
-            matched = any(kw in low for kw in keywords)
-
-        if matched:
-            try:
-                result = fn(cmd)
-            except Exception as e:
-                logger.error(f"Handler xatosi [{fn.__name__}]: {e}")
-                speak_fn("Buyruqni bajarishda xato yuz berdi")
-                record_fn(cmd, f"[xato: {e}]")
-                return True
-
-            if result is False:
-                return False
-            if isinstance(result, str):
-                speak_fn(result)
-                record_fn(cmd, result)
-            return True
+    return _walk(candidates(cmd), cmd, speak_fn, record_fn, on_handled, wait, fallback)
+
+
+def dispatch(name: str, cmd: str, speak_fn: Callable[[str], None],
+             record_fn: Callable[[str, str], None], wait: bool = False,
+             fallback: Optional[Callable[[str], object]] = None) -> bool | None:
+    """Nomi ma'lum handler (klassifikator / AI tanlagan intent) — kalit so'zsiz"""
+    h = _handlers.get(name)
+    if h is None:
+        return None
+    if h.deadline is not None and not wait:
+        _start(h, cmd, speak_fn, record_fn, None,
+               fallback and (lambda: fallback(cmd)))
+        return True
+    result = _call(h, cmd, speak_fn, record_fn)
+    return None if result is SKIP else result
+
 
-    return None  # Hech narsa mos kelmadi
+def stats() -> list[dict]:
+    """Chaqirilgan handler lar statistikasi — ko'p chaqirilgani birinchi"""
+    rows = [h.stats() for h in _handlers.values() if h.calls]
+    return sorted(rows, key=lambda r: -r["calls"])
@@ -1,10 +1,11 @@
 """
 JARVIS — Kompyuter, Ilova va Telegram boshqaruvi
 """
-import os, re, glob, json, subprocess, webbrowser, datetime
+import os, re, glob, json, subprocess, threading, webbrowser, datetime
 
 from modules.logger import logger
 from modules.tts   import speak
+from modules.slots import extract
 
 try:
     import pyautogui
@@ -48,34 +49,52 @@ def set_volume_level(percent: int):
         v.SetMasterVolumeLevelScalar(max(0,min(100,percent)) / 100, None)
 
 
-def control_volume(cmd: str) -> bool:
+def volume_action(cmd: str) -> tuple | None:
+    """
+    Buyruqdan ovoz amali (yon ta'sirsiz — marshrutlash va NLU harness uchun):
+    ("mute",) | ("unmute",) | ("set", foiz) | ("up",) | ("down",) | None
+    """
     if "ovoz" not in cmd:
+        return None
+    if any(w in cmd for w in ["o'chir", "jim", "mute"]):
+        return ("mute",)
+    if any(w in cmd for w in ["yoq", "unmute"]):
+        return ("unmute",)
+    num = extract(cmd).number
+    if num is not None:
+        return ("set", max(0, min(100, num)))
+    if any(w in cmd for w in ["oshir", "baland", "kattaroq"]):
+        return ("up",)
+    if any(w in cmd for w in ["kamayt", "past", "kichikroq"]):
+        return ("down",)
+    return None
+
+
+def control_volume(cmd: str) -> bool:
+    act = volume_action(cmd)
+    if act is None:
         return False
     v = _vol()
 
-    if any(w in cmd for w in ["o'chir", "jim", "mute"]):
+    if act[0] == "mute":
         if v: v.SetMute(1, None)
         speak("Ovoz o'chirildi"); return True
 
-    if any(w in cmd for w in ["yoq", "unmute"]):
+    if act[0] == "unmute":
         if v: v.SetMute(0, None)
         speak("Ovoz yoqildi"); return True
 
-    num = re.search(r'\b(\d{1,3})\b', cmd)
-    if num:
-        lvl = max(0, min(100, int(num.group(1))))
+    if act[0] == "set":
+        lvl = act[1]
         if v: v.SetMasterVolumeLevelScalar(lvl / 100, None)
         speak(f"Ovoz {lvl} foiz"); return True
 
-    if any(w in cmd for w in ["oshir", "baland", "kattaroq"]):
+    if act[0] == "up":
         if v: v.SetMasterVolumeLevelScalar(min(1.0, v.GetMasterVolumeLevelScalar() + 0.15), None)
         speak("Ovoz oshirildi"); return True
 
-    if any(w in cmd for w in ["kamayt", "past", "kichikroq"]):
-        if v: v.SetMasterVolumeLevelScalar(max(0.0, v.GetMasterVolumeLevelScalar() - 0.15), None)
-        speak("Ovoz kamaytirildi"); return True
-
-    return False
+    if v: v.SetMasterVolumeLevelScalar(max(0.0, v.GetMasterVolumeLevelScalar() - 0.15), None)
+    speak("Ovoz kamaytirildi"); return True
 
 
 # ══════════════════════════════════════════════════════════
@@ -128,57 +147,94 @@ def take_screenshot():
 #  ILOVALAR
 # ══════════════════════════════════════════════════════════
 def open_app(cmd: str) -> bool:
-    for key, path in _apps().items():
-        if key in cmd:
-            try:
-                if path.startswith("ms-"):
-                    os.startfile(path)
-                elif "*" in path:
-                    matches = glob.glob(path)
-                    if matches: subprocess.Popen(matches[0], shell=True)
-                    else: speak(f"{key} topilmadi"); return True
-                else:
-                    subprocess.Popen(path, shell=True)
-                speak(f"{key.capitalize()} ochilmoqda")
-            except Exception as e:
-                logger.error(f"App {key}: {e}")
-                speak(f"{key} ochib bo'lmadi")
-            return True
-    return False
+    from modules.nlu import match_app
+    key  = match_app(cmd)
+    path = _apps().get(key) if key else None
+    if not path:
+        return False
+    try:
+        if path.startswith("ms-"):
+            os.startfile(path)
+        elif "*" in path:
+            matches = glob.glob(path)
+            if matches: subprocess.Popen(matches[0], shell=True)
+            else: speak(f"{key} topilmadi"); return True
+        else:
+            subprocess.Popen(path, shell=True)
+        speak(f"{key.capitalize()} ochilmoqda")
+    except Exception as e:
+        logger.error(f"App {key}: {e}")
+        speak(f"{key} ochib bo'lmadi")
+    return True
 
 
 # ══════════════════════════════════════════════════════════
 #  TELEGRAM
 # ══════════════════════════════════════════════════════════
+_CONTACTS_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                              "contacts.json")
+_contacts_lock  = threading.Lock()
+_contacts_cache : tuple = (None, {}, None)     # (mtime lar, contacts, ContactIndex)
+
+
+def _contacts() -> tuple:
+    """
+    contacts.json + data/contacts_imported.jsonl — faqat mtime o'zgarganda
+    qayta o'qiladi va indekslanadi. Qo'lda yozilganlar ustun.
+    """
+    global _contacts_cache
+    from modules.nlu import ContactIndex
+    from modules.contacts_import import IMPORTED_FILE, iter_imported
+    mtime = []
+    for path in (_CONTACTS_FILE, IMPORTED_FILE):
+        try: mtime.append(os.stat(path).st_mtime_ns)
+        except OSError: mtime.append(None)
+    mtime = tuple(mtime)
+    cache = _contacts_cache
+    if cache[2] is not None and cache[0] == mtime:
+        return cache
+    with _contacts_lock:
+        if _contacts_cache[2] is not None and _contacts_cache[0] == mtime:
+            return _contacts_cache
+        try:
+            with open(_CONTACTS_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            contacts = {k: v for k, v in data.items() if not k.startswith("_")}
+        except Exception:
+            contacts = {}
+        for key, info in iter_imported():
+            contacts.setdefault(key, info)
+        _contacts_cache = (mtime, contacts, ContactIndex(contacts))
+        return _contacts_cache
+
+
 def load_contacts() -> dict:
-    base  = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    cfile = os.path.join(base, "contacts.json")
-    try:
-        with open(cfile, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return {k: v for k, v in data.items() if not k.startswith("_")}
-    except Exception:
-        return {}
-
-
-def open_telegram_contact(cmd: str) -> bool:
-    from modules.nlu import contact_match
-    contacts = load_contacts()
-
-    for name, info in contacts.items():
-        if contact_match(name, cmd):
-            display = info.get("display", name)
-            try:
-                if info.get("type") == "username":
-                    os.startfile(f"tg://resolve?domain={info['username']}")
-                else:
-                    phone = info.get("phone", "").replace("+", "")
-                    os.startfile(f"https://t.me/{phone}")
-                speak(f"Telegramda {display} chati ochilmoqda")
-            except Exception:
-                webbrowser.open("https://web.telegram.org/")
-                speak("Telegram ochilmoqda")
-            return True
+    return _contacts()[1]
+
+
+def find_contact(cmd: str) -> str | None:
+    """Buyruqdagi kontakt kaliti — barcha kontaktlar bo'yicha bitta o'tish"""
+    return _contacts()[2].find(cmd)
+
+
+def open_telegram_contact(cmd: str, name: str | None = None) -> bool:
+    _, contacts, index = _contacts()
+    name = name or index.find(cmd)
+
+    if name:
+        info    = contacts[name]
+        display = info.get("display", name)
+        try:
+            if info.get("type") == "username":
+                os.startfile(f"tg://resolve?domain={info['username']}")
+            else:
+                phone = info.get("phone", "").replace("+", "")
+                os.startfile(f"https://t.me/{phone}")
+            speak(f"Telegramda {display} chati ochilmoqda")
+        except Exception:
+            webbrowser.open("https://web.telegram.org/")
+            speak("Telegram ochilmoqda")
+        return True
 
     speak("Bu kontakt topilmadi")
     return True
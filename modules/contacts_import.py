@@ -0,0 +1,210 @@
+"""
+JARVIS — Kontaktlarni ommaviy import qilish
+
+Manbalar:
+  • Telegram eksporti (Settings → Export Telegram data → result.json)
+  • vCard (.vcf) — telefon kontaktlari eksporti
+
+Ikkalasi ham oqim (streaming) tarzida o'qiladi: fayl butunligicha xotiraga
+yuklanmaydi. Ismlar normalize_text dan o'tadi, takrorlar tashlab yuboriladi,
+natija data/contacts_imported.jsonl ga qator-qator yoziladi.
+contacts.json (qo'lda yozilgan) har doim ustun turadi.
+
+Foydalanish:
+    python jarvis.py --import-contacts result.json
+    python jarvis.py --import-contacts contacts.vcf
+"""
+import os, json, quopri
+from typing import Iterator, Optional
+
+from modules.nlu import normalize_text
+
+_BASE         = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTED_FILE = os.path.join(_BASE, "data", "contacts_imported.jsonl")
+
+_CHUNK = 64 * 1024
+_BATCH = 500           # Shuncha yozuvdan keyin flush
+
+
+# ══════════════════════════════════════════════════════════
+#  TELEGRAM JSON — oqimli o'qish
+# ══════════════════════════════════════════════════════════
+def _iter_json_array(path: str, keys: tuple[str, ...]) -> Iterator[dict]:
+    """
+    {"k1": {"k2": [ {...}, {...} ]}} dagi massiv elementlarini birma-bir
+    qaytaradi. Xotirada faqat joriy bo'lak + bitta element turadi.
+    Fayl massivdan boshlansa — to'g'ridan-to'g'ri o'sha massiv.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buf, eof = "", False
+
+        def more() -> bool:
+            nonlocal buf, eof
+            chunk = f.read(_CHUNK)
+            if not chunk:
+                eof = True
+                return False
+            buf += chunk
+            return True
+
+        more()
+        pos = len(buf) - len(buf.lstrip())
+        if not buf[pos:pos + 1] == "[":
+            # Kalitlarni ketma-ket izlash: "contacts" → "list" → '['
+            for key in keys:
+                marker = f'"{key}"'
+                while True:
+                    i = buf.find(marker, pos)
+                    if i >= 0:
+                        pos = i + len(marker)
+                        break
+                    # Marker bo'lak chegarasida bo'linib qolmasin
+                    keep = max(pos, len(buf) - len(marker))
+                    buf, pos = buf[keep:], 0
+                    if not more():
+                        return
+            while True:
+                i = buf.find("[", pos)
+                if i >= 0:
+                    pos = i
+                    break
+                buf, pos = "", 0
+                if not more():
+                    return
+        pos += 1
+
+        while True:
+            # Bo'shliq va vergullarni o'tkazish
+            while True:
+                while pos < len(buf) and buf[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buf):
+                    break
+                buf, pos = "", 0
+                if not more():
+                    break
+            if pos >= len(buf) or buf[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    return              # Uzilgan fayl
+                buf, pos = buf[pos:], 0
+                more()
+                continue
+            yield item
+            pos = end
+
+
+def iter_telegram_export(path: str) -> Iterator[dict]:
+    """result.json → {"name", "phone"}"""
+    for c in _iter_json_array(path, ("contacts", "list")):
+        if not isinstance(c, dict):
+            continue
+        name  = " ".join(p for p in (c.get("first_name", ""),
+                                     c.get("last_name", "")) if p).strip()
+        phone = str(c.get("phone_number", "")).replace(" ", "")
+        if name and phone:
+            yield {"name": name, "phone": phone}
+
+
+# ══════════════════════════════════════════════════════════
+#  vCARD — qatorma-qator
+# ══════════════════════════════════════════════════════════
+def _vcard_lines(f) -> Iterator[str]:
+    """Buklangan qatorlarni (RFC 6350) va QP yumshoq uzilishlarini birlashtirish"""
+    cur: Optional[str] = None
+    for raw in f:
+        line = raw.rstrip("\r\n")
+        if cur is not None and line[:1] in (" ", "\t"):
+            cur += line[1:]
+            continue
+        if cur is not None and cur.endswith("=") and "QUOTED-PRINTABLE" in cur.upper():
+            cur = cur[:-1] + line
+            continue
+        if cur is not None:
+            yield cur
+        cur = line
+    if cur is not None:
+        yield cur
+
+
+def _vcard_value(prop: str, value: str) -> str:
+    params = prop.upper().split(";")[1:]
+    if "ENCODING=QUOTED-PRINTABLE" in params:
+        charset = next((p.split("=", 1)[1] for p in params
+                        if p.startswith("CHARSET=")), "utf-8")
+        value = quopri.decodestring(value.encode("ascii", "ignore")).decode(charset, "ignore")
+    return value.replace("\\,", ",").replace("\\;", ";").replace("\\n", " ").strip()
+
+
+def iter_vcard(path: str) -> Iterator[dict]:
+    """.vcf → {"name", "phone"} (birinchi TEL)"""
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        card: dict = {}
+        for line in _vcard_lines(f):
+            prop, sep, value = line.partition(":")
+            if not sep:
+                continue
+            tag = prop.split(";", 1)[0].split(".")[-1].upper()
+            if tag == "BEGIN":
+                card = {}
+            elif tag == "FN":
+                card["name"] = _vcard_value(prop, value)
+            elif tag == "N" and "n" not in card:
+                last, _, rest = _vcard_value(prop, value).partition(";")
+                card["n"] = " ".join(p for p in (rest.split(";")[0], last) if p)
+            elif tag == "TEL" and "phone" not in card:
+                card["phone"] = "".join(ch for ch in value if ch.isdigit() or ch == "+")
+            elif tag == "END":
+                name = card.get("name") or card.get("n", "")
+                if name and card.get("phone"):
+                    yield {"name": name, "phone": card["phone"]}
+                card = {}
+
+
+# ══════════════════════════════════════════════════════════
+#  IMPORT
+# ══════════════════════════════════════════════════════════
+def iter_imported(path: str = IMPORTED_FILE) -> Iterator[tuple[str, dict]]:
+    """contacts_imported.jsonl → (kalit, info); uzilgan qatorlar o'tkaziladi"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+                yield row.pop("key"), row
+            except (ValueError, KeyError, AttributeError):
+                continue
+
+
+def import_contacts(path: str, out_path: str = IMPORTED_FILE) -> dict[str, int]:
+    """
+    Eksport faylini import qilish. Qaytaradi: {"read", "added", "duplicates"}.
+    Mavjud kalitlar (contacts.json + avvalgi importlar) qayta yozilmaydi.
+    """
+    from modules.computer_control import load_contacts
+    source = (iter_vcard(path) if path.lower().endswith((".vcf", ".vcard"))
+              else iter_telegram_export(path))
+
+    seen  = {normalize_text(k) for k in load_contacts()}
+    stats = {"read": 0, "added": 0, "duplicates": 0}
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    with open(out_path, "a", encoding="utf-8") as out:
+        for c in source:
+            stats["read"] += 1
+            key = normalize_text(c["name"])
+            if not key or key in seen:
+                stats["duplicates"] += 1
+                continue
+            seen.add(key)
+            out.write(json.dumps({"key": key, "display": c["name"],
+                                  "phone": c["phone"], "type": "phone"},
+                                 ensure_ascii=False) + "\n")
+            stats["added"] += 1
+            if stats["added"] % _BATCH == 0:
+                out.flush()
+    return stats
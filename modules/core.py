@@ -1,9 +1,14 @@
 """
-JARVIS — Core: State, MicGuard, Cache, RateLimiter, TempManager
+JARVIS — Core: State, MicGuard, Cache, RateLimiter, Tracer, TempManager
 """
-import os, time, threading, tempfile, atexit
-from enum import Enum
-from typing import Any, Callable, Optional
+import os, sys, json, time, uuid, queue, asyncio, logging, sqlite3, threading, tempfile, atexit
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import (ThreadPoolExecutor, Future, CancelledError,
+                                TimeoutError as FutureTimeout)
+from enum import Enum, IntEnum
+from typing import Any, Callable, Iterator, Optional
 
 
 # ══════════════════════════════════════════════════════════
@@ -17,14 +22,56 @@ class State(Enum):
     BACKGROUND = "background"
 
 
+class _SpeakingFlag:
+    """
+    threading.Event bilan mos (set/clear/is_set/wait), qo'shimcha ravishda
+    tozalanishini kutish mumkin — polling kerak emas.
+    """
+    def __init__(self, cond: threading.Condition):
+        self._cond = cond
+        self._flag = False
+
+    def set(self):
+        with self._cond:
+            self._flag = True
+            self._cond.notify_all()
+
+    def clear(self):
+        with self._cond:
+            self._flag = False
+            self._cond.notify_all()
+
+    def is_set(self) -> bool:
+        return self._flag
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: self._flag, timeout)
+
+    def wait_clear(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._flag, timeout)
+
+
 class StateManager:
+    """
+    Holat + kutish primitivlari (Condition asosida).
+    on_change callback lari alohida thread da chaqiriladi; tez-tez
+    almashinuvlar birlashtiriladi — callback faqat oxirgi holatni oladi.
+    """
     def __init__(self):
         self._lock       = threading.RLock()
+        self._cond       = threading.Condition(self._lock)
         self._state      = State.BACKGROUND
         self._changed_at = time.time()
         self._callbacks  : list[Callable] = []
         # Bug #1 fix: gapirish davomida wake word bloki
-        self.is_speaking = threading.Event()
+        self.is_speaking = _SpeakingFlag(self._cond)
+        # Callback dispatch
+        self._pending    : Optional[State] = None
+        self._delivered  : Optional[State] = None
+        self._wake       = threading.Event()
+        self._dispatcher : Optional[threading.Thread] = None
 
     def set(self, new: State):
         with self._lock:
@@ -34,22 +81,56 @@ class StateManager:
             self._changed_at = time.time()
             if new == State.SPEAKING:
                 self.is_speaking.set()
-        for cb in self._callbacks:
-            try: cb(new)
-            except Exception: pass
+            self._cond.notify_all()
+            if self._callbacks:
+                self._pending = new
+                self._wake.set()
 
     def get(self) -> State:
         with self._lock:
             return self._state
 
     def on_change(self, cb: Callable):
-        self._callbacks.append(cb)
+        with self._lock:
+            self._callbacks.append(cb)
+            if self._dispatcher is None:
+                self._dispatcher = threading.Thread(target=self._dispatch,
+                                                    name="state-dispatch",
+                                                    daemon=True)
+                self._dispatcher.start()
+
+    def wait_for_state(self, states, timeout: Optional[float] = None) -> Optional[State]:
+        """states dan biriga o'tguncha kutish. Timeout → None"""
+        if isinstance(states, State):
+            states = (states,)
+        with self._cond:
+            if self._cond.wait_for(lambda: self._state in states, timeout):
+                return self._state
+        return None
+
+    def wait_until_not_speaking(self, timeout: Optional[float] = None) -> bool:
+        """Gapirish tugashi bilan uyg'onadi. Timeout → False"""
+        return self.is_speaking.wait_clear(timeout)
 
     def elapsed(self) -> float:
         """Joriy holatda qancha vaqt o'tdi (soniya)"""
         with self._lock:
             return time.time() - self._changed_at
 
+    def _dispatch(self):
+        while True:
+            self._wake.wait()
+            with self._lock:
+                self._wake.clear()
+                new, self._pending = self._pending, None
+                if new is None or new == self._delivered:
+                    continue
+                self._delivered = new
+                callbacks = list(self._callbacks)
+            for cb in callbacks:
+                try: cb(new)
+                except Exception: pass
+
 
 # ══════════════════════════════════════════════════════════
 #  MIC GUARD  — Bug #3 fix
@@ -72,90 +153,786 @@ class MicGuard:
 
 
 # ══════════════════════════════════════════════════════════
-#  TIMEOUT — Bug #2 fix
+#  EXECUTOR + TIMEOUT — Bug #2 fix
 # ══════════════════════════════════════════════════════════
-def with_timeout(func: Callable, timeout_sec: float, default: Any = None) -> Any:
-    """Thread orqali timeout bilan chaqirish"""
-    result = [default]
-    exc    = [None]
+_tls = threading.local()     # Thread bo'yicha kontekst: token, ustuvorlik
+
+
+class Cancelled(Exception):
+    """Vazifa bekor qilindi (deadline yoki cancel())"""
+
+
+class CancelToken:
+    """Kooperativ bekor qilish: vazifa o'zi vaqti-vaqti bilan tekshiradi"""
+    __slots__ = ("_event", "deadline")
+
+    def __init__(self, deadline: Optional[float] = None):
+        self._event   = threading.Event()
+        self.deadline = deadline          # time.monotonic() bo'yicha
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self._event.set()
+        return self._event.is_set()
+
+    def remaining(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
 
-    def _run():
-        try:    result[0] = func()
-        except Exception as e: exc[0] = e
+    def raise_if_cancelled(self):
+        if self.cancelled:
+            raise Cancelled()
 
-    t = threading.Thread(target=_run, daemon=True)
-    t.start()
-    t.join(timeout_sec)
+    def sleep(self, seconds: float) -> bool:
+        """Bekor qilinsa darhol uyg'onadi. True → bekor qilindi"""
+        return self._event.wait(seconds)
 
-    if t.is_alive():
-        return default
-    if exc[0]:
-        raise exc[0]
-    return result[0]
+
+_NO_TOKEN = CancelToken()
+
+
+def current_token() -> CancelToken:
+    """Executor ichida ishlayotgan vazifaning tokeni (tashqarida — hech qachon bekor bo'lmaydi)"""
+    return getattr(_tls, "token", _NO_TOKEN)
+
+
+class TaskExecutor:
+    """
+    Umumiy, chegaralangan thread pool.
+      • Har vazifaga deadline va CancelToken
+      • Timeout bo'lsa: navbatdagisi bekor qilinadi, ishlayotganiga
+        token orqali "to'xta" deyiladi
+      • gauges(): running / queued / timed_out / leaked (timeoutdan keyin
+        hali ham ishlayotganlar) — yangi thread ochilmaydi, pool hajmi o'smaydi
+    """
+
+    def __init__(self, max_workers: int = 8, name: str = "jarvis-exec"):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._g    = {"queued": 0, "running": 0, "completed": 0, "failed": 0,
+                      "timed_out": 0, "cancelled": 0, "leaked": 0}
+        self._abandoned: set[int] = set()
+        self.max_workers = max_workers
+
+    def submit(self, fn: Callable, *args: Any,
+               timeout: Optional[float] = None,
+               token: Optional[CancelToken] = None) -> tuple[Future, CancelToken]:
+        if token is None:
+            token = CancelToken()
+        if timeout is not None:
+            token.deadline = time.monotonic() + timeout
+        with self._lock:
+            self._g["queued"] += 1
+        fut = self._pool.submit(self._wrap, fn, args, token)
+        fut.add_done_callback(self._on_cancel)
+        return fut, token
+
+    def run(self, fn: Callable, timeout: float, default: Any = None,
+            token: Optional[CancelToken] = None) -> Any:
+        """fn() ni pool da bajarib, ko'pi bilan timeout soniya kutish"""
+        fut, token = self.submit(fn, timeout=timeout, token=token)
+        try:
+            return fut.result(timeout)
+        except FutureTimeout:
+            self.abandon(fut, token)
+            return default
+        except CancelledError:
+            return default
+        except Cancelled:
+            return default
+
+    def abandon(self, fut: Future, token: CancelToken):
+        """Natija endi kerak emas: token bekor, navbatda bo'lsa — olib tashlash"""
+        token.cancel()
+        with self._lock:
+            self._g["timed_out"] += 1
+        if not fut.cancel():
+            with self._lock:
+                if not fut.done():
+                    self._abandoned.add(id(token))
+                    self._g["leaked"] += 1
+
+    def gauges(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._g, workers=self.max_workers)
+
+    def _on_cancel(self, fut: Future):
+        if fut.cancelled():
+            with self._lock:
+                self._g["queued"] -= 1
+                self._g["cancelled"] += 1
+
+    def _wrap(self, fn: Callable, args: tuple, token: CancelToken) -> Any:
+        with self._lock:
+            self._g["queued"]  -= 1
+            self._g["running"] += 1
+        prev = getattr(_tls, "token", None)
+        _tls.token = token
+        ok = False
+        try:
+            token.raise_if_cancelled()
+            result = fn(*args)
+            ok = True
+            return result
+        finally:
+            _tls.token = prev
+            with self._lock:
+                self._g["running"] -= 1
+                self._g["completed" if ok else "failed"] += 1
+                if id(token) in self._abandoned:
+                    self._abandoned.discard(id(token))
+                    self._g["leaked"] -= 1
+
+
+def with_timeout(func: Callable, timeout_sec: float, default: Any = None) -> Any:
+    """Umumiy executor orqali timeout bilan chaqirish (har chaqiruvga yangi thread yo'q)"""
+    return executor.run(func, timeout_sec, default)
 
 
 # ══════════════════════════════════════════════════════════
 #  RATE LIMITER — Bug #12 fix
 # ══════════════════════════════════════════════════════════
+class Priority(IntEnum):
+    USER       = 0     # Foydalanuvchi buyrug'i
+    BACKGROUND = 1     # Fon yangilash / prefetch
+
+
+def current_priority() -> Priority:
+    """Joriy thread ning ustuvorligi (fon thread lar BACKGROUND qo'yadi)"""
+    return getattr(_tls, "priority", Priority.USER)
+
+
+def run_as_background(fn: Callable, *args: Any) -> Any:
+    """fn ni BACKGROUND ustuvorligida bajarish (limiter lar shuni ko'radi)"""
+    prev = current_priority()
+    _tls.priority = Priority.BACKGROUND
+    try:
+        return fn(*args)
+    finally:
+        _tls.priority = prev
+
+
 class RateLimiter:
-    def __init__(self, max_calls: int = 15, window_sec: float = 60.0):
-        self._max    = max_calls
-        self._window = window_sec
-        self._calls  : list[float] = []
-        self._lock   = threading.Lock()
+    """
+    Token bucket: sig'im = max_calls, to'ldirish = max_calls / window_sec.
+      • reserve() — O(1), joy band qilib ETA (soniya) qaytaradi
+      • acquire() / acquire_async() — ETA ni lock TASHQARISIDA kutadi
+      • BACKGROUND so'rovlar oxirgi _HEADROOM ulushga tegmaydi va joy
+        band qilmaydi: token faqat vaqti kelganda olinadi, oraliqda
+        kelgan foydalanuvchi buyrug'i ularning orqasida turmaydi
+    USER navbati adolatli: har bir reservation keyingi bo'sh slotni oladi (FIFO).
+    """
+    _HEADROOM = 0.25
+
+    def __init__(self, max_calls: int = 15, window_sec: float = 60.0,
+                 name: str = ""):
+        self.name      = name
+        self._capacity = float(max_calls)
+        self._rate     = max_calls / window_sec
+        self._floor    = {Priority.USER: 0.0,
+                          Priority.BACKGROUND: max(1.0, max_calls * self._HEADROOM)}
+        self._tokens   = float(max_calls)
+        self._last     = time.monotonic()
+        self._lock     = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self._capacity,
+                           self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def reserve(self, priority: Optional[Priority] = None) -> float:
+        """Bitta chaqiruvni band qilish → necha soniyadan keyin ruxsat"""
+        floor = self._floor[current_priority() if priority is None else priority]
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1.0
+            return max(0.0, floor - self._tokens) / self._rate
 
-    def wait_if_needed(self, block: bool = True) -> bool:
+    def release(self):
+        """Ishlatilmagan reservation ni qaytarish"""
         with self._lock:
-            now = time.time()
-            self._calls = [c for c in self._calls if now - c < self._window]
+            self._tokens = min(self._capacity, self._tokens + 1.0)
 
-            if len(self._calls) < self._max:
-                self._calls.append(now)
-                return True
+    def eta(self, priority: Optional[Priority] = None) -> float:
+        """Band qilmasdan: hozir so'ralsa necha soniya kutiladi"""
+        floor = self._floor[current_priority() if priority is None else priority]
+        with self._lock:
+            self._refill(time.monotonic())
+            return max(0.0, floor + 1.0 - self._tokens) / self._rate
 
-            if not block:
+    def _poll(self) -> float:
+        """BACKGROUND: token yetarli bo'lsa olish → 0, aks holda qayta urinishgacha soniya"""
+        floor = self._floor[Priority.BACKGROUND]
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens - 1.0 >= floor:
+                self._tokens -= 1.0
+                return 0.0
+            return max(floor + 1.0 - self._tokens, 1e-3) / self._rate
+
+    def _plan(self, priority: Optional[Priority],
+              timeout: Optional[float]) -> Iterator[float]:
+        """Kutish bosqichlari (soniya); StopIteration.value — ruxsat berildimi"""
+        if (current_priority() if priority is None else priority) is Priority.USER:
+            wait = self.reserve(Priority.USER)
+            if timeout is not None and wait > timeout:
+                self.release()
                 return False
-
-            wait = self._window - (now - self._calls[0])
             if wait > 0:
-                time.sleep(min(wait, 5.0))
-            self._calls = [c for c in self._calls
-                           if time.time() - c < self._window]
-            self._calls.append(time.time())
+                yield wait
             return True
+        give_up = None if timeout is None else time.monotonic() + timeout
+        while (wait := self._poll()) > 0:
+            if give_up is not None and time.monotonic() + wait > give_up:
+                return False
+            yield wait
+        return True
+
+    def try_acquire(self, priority: Optional[Priority] = None) -> bool:
+        return self.acquire(priority, timeout=0)
+
+    def acquire(self, priority: Optional[Priority] = None,
+                timeout: Optional[float] = None) -> bool:
+        plan = self._plan(priority, timeout)
+        while True:
+            try:
+                time.sleep(next(plan))
+            except StopIteration as done:
+                return done.value
+
+    async def acquire_async(self, priority: Optional[Priority] = None,
+                            timeout: Optional[float] = None) -> bool:
+        plan = self._plan(priority, timeout)
+        while True:
+            try:
+                await asyncio.sleep(next(plan))
+            except StopIteration as done:
+                return done.value
+
+    def wait_if_needed(self, block: bool = True) -> bool:
+        """Eski API: block=False → darhol javob, block=True → ruxsatgacha kutadi (doim True)"""
+        return self.acquire(timeout=None if block else 0)
+
+
+class RateLimited(Exception):
+    """Limiter ruxsat bermadi"""
+
+
+# Har bir tashqi xizmat uchun alohida limiter
+limiters: dict[str, RateLimiter] = {
+    "claude":      RateLimiter(max_calls=15, window_sec=60,  name="claude"),
+    "openweather": RateLimiter(max_calls=50, window_sec=60,  name="openweather"),
+    "er-api":      RateLimiter(max_calls=30, window_sec=60,  name="er-api"),
+    "google-rss":  RateLimiter(max_calls=20, window_sec=60,  name="google-rss"),
+}
 
 
 # ══════════════════════════════════════════════════════════
 #  SMART CACHE — Bug #9 fix
 # ══════════════════════════════════════════════════════════
 class SmartCache:
-    _TTL = {"weather": 600, "currency": 300, "news": 120, "default": 60}
-
-    def __init__(self):
-        self._data : dict[str, tuple] = {}
+    """
+    Kategoriya bo'yicha LRU kesh.
+      • Har kategoriya — alohida OrderedDict: get/set/evict O(1)
+      • _LIMIT — kategoriya bo'yicha yozuvlar soni chegarasi
+      • max_bytes — umumiy hajm chegarasi (eng eski yozuvdan boshlab chiqariladi)
+      • Eskirgan yozuv: o'qilganda (lazy) + har _SWEEP_SEC da to'liq tozalash
+      • stats() — kategoriya bo'yicha hit/miss/eviction hisoblagichlari
+      • get_or_compute() — single-flight yuklash, stale-while-revalidate,
+        xatolarni qisqa muddat keshlash (negative cache)
+      • disk_path — ikkinchi qatlam (SQLite): _PERSIST kategoriyalari
+        restartdan keyin ham saqlanadi. Birinchi murojaatda bir so'rovda
+        yuklanadi, yozish fonda (write-behind). Muddat — o'sha _TTL/_STALE.
+    """
+    _TTL   = {"weather": 600, "currency": 300, "news": 120, "default": 60}
+    _STALE = {"weather": 3600, "currency": 1800, "news": 600, "default": 0}
+    _LIMIT = {"weather": 32,  "currency": 64,  "news": 32,  "default": 256}
+    _SWEEP_SEC = 30.0
+    _NEG_TTL   = 15.0     # Xato bo'lsa shu vaqt ichida qayta so'ralmaydi
+    _PERSIST   = {"weather", "currency", "news"}
+
+    def __init__(self, max_bytes: int = 4 * 1024 * 1024,
+                 disk_path: Optional[str] = None):
+        # {category: OrderedDict[key, (value, ts, size)]}
+        self._cats  : dict[str, OrderedDict] = {}
+        self._where : dict[str, str] = {}      # key → category
+        self._bytes = 0
+        self._max_bytes  = max_bytes
+        self._last_sweep = time.time()
+        self._stats : dict[str, dict[str, int]] = {}
+        self._inflight : dict[str, _Flight] = {}
+        self._failed   : dict[str, tuple[BaseException, float]] = {}
+        self._disk     = _DiskTier(disk_path) if disk_path else None
+        self._disk_loaded = self._disk is None
         self._lock = threading.Lock()
 
+    # ── Public API ────────────────────────────────────────
     def get(self, key: str, category: str = "default") -> Optional[Any]:
         with self._lock:
-            if key in self._data:
-                value, ts, cat = self._data[key]
-                ttl = self._TTL.get(cat, 60)
-                if time.time() - ts < ttl:
-                    return value
-                del self._data[key]
+            fresh, value, cat = self._lookup(key, time.time())
+            if fresh:
+                self._count(cat, "hits")
+                return value
+            self._count(cat or category, "misses")
         return None
 
+    def get_or_compute(self, key: str, category: str,
+                       loader: Callable[[], Any]) -> Any:
+        """
+        Keshdan olish, bo'lmasa loader() orqali yuklash.
+          • Bir vaqtda bir nechta chaqiruv → loader faqat bir marta ishlaydi,
+            qolganlar natijani kutadi (single-flight)
+          • Eskirgan, lekin _STALE oynasidagi qiymat darhol qaytariladi,
+            yangilash fonda boradi (stale-while-revalidate)
+          • loader xatosi _NEG_TTL davomida keshlanadi va qayta ko'tariladi
+        """
+        with self._lock:
+            now = time.time()
+            fresh, value, cat = self._lookup(key, now)
+            if fresh:
+                self._count(cat, "hits")
+                return value
+
+            failed = self._failed.get(key)
+            if failed and now - failed[1] >= self._NEG_TTL:
+                del self._failed[key]
+                failed = None
+            flight = self._inflight.get(key)
+
+            if cat is not None:                     # Eskirgan, lekin yaroqli
+                self._count(cat, "stale")
+                if flight is None and failed is None:
+                    flight = self._inflight[key] = _Flight()
+                    executor.submit(run_as_background, self._load,
+                                    key, category, loader, flight)
+                return value
+
+            if failed:
+                self._count(category, "negative")
+                raise failed[0]
+
+            self._count(category, "misses")
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self._count(category, "coalesced")
+
+        if leader:
+            self._load(key, category, loader, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
     def set(self, key: str, value: Any, category: str = "default"):
+        now = time.time()
         with self._lock:
-            self._data[key] = (value, time.time(), category)
+            self._ensure_loaded()
+            self._insert(key, value, category, now)
+            if now - self._last_sweep >= self._SWEEP_SEC:
+                self._sweep(now)
+        if self._disk and category in self._PERSIST:
+            self._disk.put(key, category, now, value)
 
     def clear(self, category: Optional[str] = None):
+        if self._disk:
+            self._disk.delete(category)
         with self._lock:
             if category:
-                self._data = {k: v for k, v in self._data.items()
-                              if v[2] != category}
+                for key, (_, _, size) in self._cats.pop(category, {}).items():
+                    del self._where[key]
+                    self._bytes -= size
             else:
-                self._data.clear()
+                self._cats.clear()
+                self._where.clear()
+                self._bytes = 0
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        """{category: {entries, bytes, hits, misses, stale, evictions, expired, ...}}"""
+        with self._lock:
+            self._sweep(time.time())
+            out = {}
+            for cat in set(self._cats) | set(self._stats):
+                bucket = self._cats.get(cat, {})
+                row = {"entries": len(bucket),
+                       "bytes":   sum(v[2] for v in bucket.values()),
+                       "hits": 0, "misses": 0, "stale": 0,
+                       "evictions": 0, "expired": 0}
+                row.update(self._stats.get(cat, {}))
+                out[cat] = row
+            return out
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._where)
+
+    # ── Ichki ─────────────────────────────────────────────
+    def _load(self, key: str, category: str, loader: Callable, flight: "_Flight"):
+        """Lock tashqarisida: loader ni ishga tushirish va kutayotganlarni uyg'otish"""
+        try:
+            flight.value = loader()
+            self.set(key, flight.value, category)
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self._failed[key] = (e, time.time())
+                self._count(category, "failures")
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    # ── Ichki (lock ostida) ───────────────────────────────
+    def _lookup(self, key: str, now: float) -> tuple[bool, Any, Optional[str]]:
+        """
+        (True,  value, cat) — yangi
+        (False, value, cat) — eskirgan, lekin _STALE oynasida
+        (False, None,  None) — yo'q
+        """
+        self._ensure_loaded()
+        cat = self._where.get(key)
+        if cat is None:
+            return False, None, None
+        bucket = self._cats[cat]
+        value, ts, _ = bucket[key]
+        age = now - ts
+        ttl = self._TTL.get(cat, 60)
+        if age < ttl:
+            bucket.move_to_end(key)
+            return True, value, cat
+        if age < ttl + self._STALE.get(cat, 0):
+            return False, value, cat
+        self._drop(cat, key)
+        self._count(cat, "expired")
+        return False, None, None
+
+    def _insert(self, key: str, value: Any, category: str, ts: float):
+        old = self._where.get(key)
+        if old is not None:
+            self._drop(old, key)
+        size   = _sizeof(value) + _sizeof(key)
+        bucket = self._cats.setdefault(category, OrderedDict())
+        bucket[key] = (value, ts, size)
+        self._where[key] = category
+        self._bytes += size
+
+        limit = self._LIMIT.get(category, self._LIMIT["default"])
+        while len(bucket) > limit:
+            self._evict(category)
+        while self._bytes > self._max_bytes and len(self._where) > 1:
+            self._evict(self._oldest_category())
+
+    def _ensure_loaded(self):
+        """Disk qatlamini birinchi murojaatda bitta SELECT bilan yuklash"""
+        if self._disk_loaded:
+            return
+        self._disk_loaded = True
+        now  = time.time()
+        dead = []
+        for key, cat, ts, value in self._disk.load():
+            if now - ts >= self._TTL.get(cat, 60) + self._STALE.get(cat, 0):
+                dead.append(key)
+            elif key not in self._where:
+                self._insert(key, value, cat, ts)
+        if dead:
+            self._disk.delete_keys(dead)
+
+    def _count(self, cat: str, field: str):
+        row = self._stats.setdefault(cat, {})
+        row[field] = row.get(field, 0) + 1
+
+    def _drop(self, cat: str, key: str):
+        bucket = self._cats[cat]
+        self._bytes -= bucket.pop(key)[2]
+        del self._where[key]
+        if not bucket:
+            del self._cats[cat]
+
+    def _evict(self, cat: str):
+        key = next(iter(self._cats[cat]))
+        self._drop(cat, key)
+        self._count(cat, "evictions")
+
+    def _oldest_category(self) -> str:
+        """Eng uzoq ishlatilmagan yozuvi bor kategoriya (kategoriyalar kam)"""
+        return min(self._cats,
+                   key=lambda c: next(iter(self._cats[c].values()))[1])
+
+    def _sweep(self, now: float):
+        self._last_sweep = now
+        for cat in list(self._cats):
+            ttl  = self._TTL.get(cat, 60) + self._STALE.get(cat, 0)
+            dead = [k for k, (_, ts, _) in self._cats[cat].items()
+                    if now - ts >= ttl]
+            for key in dead:
+                self._drop(cat, key)
+                self._count(cat, "expired")
+        for key in [k for k, (_, ts) in self._failed.items()
+                    if now - ts >= self._NEG_TTL]:
+            del self._failed[key]
+
+
+class _DiskTier:
+    """
+    SmartCache ning SQLite qatlami.
+    Yozish — navbat + bitta fon thread (batch, bitta tranzaksiya);
+    o'qish — faqat ishga tushganda, bir marta.
+    """
+    _BATCH = 64
+
+    def __init__(self, path: str):
+        self._path   = path
+        self._queue  : queue.Queue = queue.Queue()
+        self._thread : Optional[threading.Thread] = None
+        self._tlock  = threading.Lock()
+        atexit.register(self.flush)
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=5)
+        conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                     "key TEXT PRIMARY KEY, category TEXT, ts REAL, value TEXT)")
+        return conn
+
+    def load(self) -> list[tuple[str, str, float, Any]]:
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT key, category, ts, value FROM cache").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            from modules.logger import logger
+            logger.warning(f"Disk kesh o'qilmadi: {e}")
+            return []
+        out = []
+        for key, cat, ts, raw in rows:
+            try:
+                out.append((key, cat, ts, json.loads(raw)))
+            except (TypeError, ValueError):
+                continue
+        return out
+
+    def put(self, key: str, category: str, ts: float, value: Any):
+        try:
+            raw = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError):
+            return                          # JSON ga sig'maydigan qiymat — faqat xotirada
+        self._submit(("INSERT OR REPLACE INTO cache VALUES (?, ?, ?, ?)",
+                      (key, category, ts, raw)))
+
+    def delete(self, category: Optional[str] = None):
+        if category:
+            self._submit(("DELETE FROM cache WHERE category = ?", (category,)))
+        else:
+            self._submit(("DELETE FROM cache", ()))
+
+    def delete_keys(self, keys: list[str]):
+        for key in keys:
+            self._submit(("DELETE FROM cache WHERE key = ?", (key,)))
+
+    def flush(self, timeout: float = 2.0):
+        """Navbatdagi yozuvlarni diskka tushirish (atexit)"""
+        with self._tlock:
+            thread = self._thread
+        if thread and thread.is_alive():
+            self._queue.put(None)
+            thread.join(timeout)
+
+    def _submit(self, op: tuple):
+        self._queue.put(op)
+        with self._tlock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._writer, daemon=True,
+                                                name="cache-writer")
+                self._thread.start()
+
+    def _writer(self):
+        try:
+            conn = self._connect()
+        except sqlite3.Error as e:
+            from modules.logger import logger
+            logger.warning(f"Disk kesh ochilmadi: {e}")
+            return
+        while True:
+            op = self._queue.get()
+            batch = [op]
+            while op is not None and len(batch) < self._BATCH:
+                try:
+                    op = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(op)
+            try:
+                with conn:
+                    for item in batch:
+                        if item is not None:
+                            conn.execute(*item)
+            except sqlite3.Error as e:
+                from modules.logger import logger
+                logger.warning(f"Disk keshga yozilmadi: {e}")
+            if batch[-1] is None:
+                conn.close()
+                return
+
+
+class _Flight:
+    """Bitta kalit uchun ketayotgan yuklash"""
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done  = threading.Event()
+        self.value = None
+        self.error : Optional[BaseException] = None
+
+
+def _sizeof(obj: Any) -> int:
+    """Taxminiy hajm (bayt): konteynerlar uchun bir daraja ichkariga"""
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(v) for v in obj)
+    return size
+
+
+# ══════════════════════════════════════════════════════════
+#  TRACER — buyruq bo'yicha kechikish (wake word → ijro tugashi)
+# ══════════════════════════════════════════════════════════
+class Tracer:
+    """
+    Har bir gap (utterance) uchun trace ID; har bir bosqich — span.
+    Vaqtlar time.monotonic() da, JSONL ga yoziladi (RotatingFileHandler).
+    Xotirada har bosqich uchun oxirgi _WINDOW ta davomiylik → p50/p95/p99.
+
+    Joriy trace bitta (bir vaqtda bitta buyruq tinglanadi), shuning uchun
+    u thread lar orasida umumiy: TTS thread ham shu ID ga yozadi.
+    """
+    _WINDOW = 512
+
+    def __init__(self, path: Optional[str] = None,
+                 max_bytes: int = 2 * 1024 * 1024, backups: int = 3):
+        self._lock    = threading.Lock()
+        self._current : Optional[str] = None
+        self._started : dict[str, float] = {}
+        self._samples : dict[str, deque] = {}
+        self._path    = path
+        self._log     : Optional[logging.Logger] = None
+        self._max_bytes, self._backups = max_bytes, backups
+
+    # ── Trace ────────────────────────────────────────────
+    def begin(self, t0: Optional[float] = None) -> str:
+        """Yangi trace; t0 — boshlanish (monotonic), masalan wake word tinglash boshi"""
+        tid = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._current = tid
+            self._started[tid] = time.monotonic() if t0 is None else t0
+        return tid
+
+    def current(self) -> Optional[str]:
+        return self._current
+
+    def end(self, trace_id: Optional[str] = None):
+        """Trace ni yopish — "total" span (boshidan hozirgacha) yoziladi"""
+        with self._lock:
+            tid = trace_id or self._current
+            t0  = self._started.pop(tid, None) if tid else None
+            if tid == self._current:
+                self._current = None
+        if t0 is not None:
+            self.record("total", t0, time.monotonic(), tid)
+
+    def discard(self):
+        """Buyruqsiz tugagan trace — "total" yozilmaydi"""
+        with self._lock:
+            if self._current:
+                self._started.pop(self._current, None)
+            self._current = None
+
+    # ── Span ─────────────────────────────────────────────
+    @contextmanager
+    def span(self, stage: str, trace_id: Optional[str] = None, **attrs):
+        """with tracer.span("ask_ai"): ...  — xato bo'lsa ham yoziladi"""
+        t0 = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            attrs["error"] = type(e).__name__
+            raise
+        finally:
+            self.record(stage, t0, time.monotonic(), trace_id, **attrs)
+
+    def record(self, stage: str, start: float, end: float,
+               trace_id: Optional[str] = None, **attrs):
+        tid = trace_id or self._current
+        ms  = (end - start) * 1000
+        with self._lock:
+            dq = self._samples.get(stage)
+            if dq is None:
+                dq = self._samples[stage] = deque(maxlen=self._WINDOW)
+            dq.append(ms)
+        log = self._logger()
+        if log:
+            row = {"trace": tid, "stage": stage, "start": round(start, 4),
+                   "end": round(end, 4), "ms": round(ms, 1), **attrs}
+            log.info(json.dumps(row, ensure_ascii=False))
+
+    # ── Statistika ───────────────────────────────────────
+    def stats(self) -> dict[str, dict[str, float]]:
+        """{stage: {count, p50, p95, p99, max}} — millisekundlarda"""
+        with self._lock:
+            snap = {stage: list(dq) for stage, dq in self._samples.items()}
+        return {stage: _percentiles(v) for stage, v in snap.items() if v}
+
+    def summarize_file(self, path: Optional[str] = None) -> dict[str, dict[str, float]]:
+        """CLI uchun: JSONL va aylantirilgan nusxalari (.1, .2, ...) dan statistika"""
+        path = path or self._path
+        samples: dict[str, list[float]] = {}
+        for p in [path] + [f"{path}.{i}" for i in range(1, self._backups + 1)]:
+            if not os.path.exists(p):
+                continue
+            with open(p, encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        row = json.loads(line)
+                        samples.setdefault(row["stage"], []).append(float(row["ms"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue     # Uzilgan qator
+        return {stage: _percentiles(v) for stage, v in samples.items()}
+
+    def _logger(self) -> Optional[logging.Logger]:
+        if self._log is None and self._path:
+            try:
+                os.makedirs(os.path.dirname(self._path), exist_ok=True)
+                fh = RotatingFileHandler(self._path, maxBytes=self._max_bytes,
+                                         backupCount=self._backups, encoding="utf-8")
+                fh.setFormatter(logging.Formatter("%(message)s"))
+                log = logging.getLogger("jarvis.trace")
+                log.setLevel(logging.INFO)
+                log.propagate = False      # Asosiy log ga tushmasin
+                if not log.handlers:
+                    log.addHandler(fh)
+                self._log = log
+            except OSError:
+                self._path = None          # Yozib bo'lmasa — faqat xotirada
+        return self._log
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    v = sorted(values)
+    n = len(v)
+    pick = lambda q: v[min(n - 1, int(q * n))]
+    return {"count": n, "p50": round(pick(0.50), 1), "p95": round(pick(0.95), 1),
+            "p99": round(pick(0.99), 1), "max": round(v[-1], 1)}
 
 
 # ══════════════════════════════════════════════════════════
@@ -189,7 +966,13 @@ class TempFileManager:
 
 
 # ── Singletonlar ──────────────────────────────────────────
+_BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DATA_DIR = os.path.join(_BASE_DIR, "data")
+TRACE_FILE = os.path.join(_BASE_DIR, "logs", "traces.jsonl")
+
 state_manager = StateManager()
-rate_limiter  = RateLimiter(max_calls=15, window_sec=60)
-smart_cache   = SmartCache()
+rate_limiter  = limiters["claude"]
+executor      = TaskExecutor(max_workers=8)
+smart_cache   = SmartCache(disk_path=os.path.join(_DATA_DIR, "cache.sqlite3"))
+tracer        = Tracer(TRACE_FILE)
 temp_manager  = TempFileManager()
@@ -0,0 +1,170 @@
+"""
+JARVIS — Noto'g'ri eshitilgan buyruqlarni tiklash (fuzzy)
+
+STT ba'zan so'zni buzadi: "yutib och" (yutub), "abdulazini ochi" (abdulaziz).
+Bunday buyruq hech qaysi jadvalga tushmaydi va 2–12 s lik AI chaqiruviga
+ketadi. Bu qatlam AI dan oldin ishlaydi:
+
+  1. Barcha kalit so'zlar (intent, ilova, sayt, kontakt) trigramlar
+     bo'yicha indekslanadi — tizim intentlari (o'chirish, restart,
+     uxlatish, qulflash) bundan mustasno.
+  2. Buyruqdagi 1–3 so'zli oynalar uchun nomzodlar trigram indeksidan
+     olinadi (q-gram chegarasi — to'g'ri nomzod tushib qolmaydi).
+  3. Nomzodlar chegaralangan Levenshtein masofasi bilan tekshiriladi.
+  4. Ishonchli bo'lsa — buzilgan oyna to'g'ri kalit so'z bilan
+     almashtiriladi va buyruq qayta marshrutlanadi.
+
+Foydalanish:
+    from modules.fuzzy import correct_command
+    correct_command("yutib och")   → ("yutub och", "intent", "youtube")
+"""
+from typing import Hashable, Optional
+
+# Kontakt/ilova nomidan keyin kelishi mumkin bo'lgan qo'shimchalar
+_SUFFIXES = ("", "ga", "ni", "da", "dan", "ning", "ka", "im", "imga", "imni",
+             "ing", "ingga", "ingni", "ng", "ngga", "ngni", "m", "mga", "mni",
+             "si", "siga", "sini", "lar", "larni", "larga", "i")
+
+_MIN_LEN   = 5        # Bundan qisqa kalit so'zlar fuzzy ga kirmaydi ("ram", "cpu")
+_MAX_WORDS = 3
+# Tizim intentlari indeksga kirmaydi: "qayta yoz" → "qayta yoq" (restart),
+# "kompyuterni o'chma" → shutdown — tasdiqsiz bajarilardi. Ular faqat aniq
+# kalit so'z bilan ishlaydi
+_UNSAFE = {"shutdown", "restart", "sleep", "lock"}
+
+
+def max_distance(term: str) -> int:
+    """Kalit so'z uzunligiga qarab ruxsat etilgan xato soni"""
+    n = len(term)
+    return 0 if n < _MIN_LEN else 1 if n < 10 else 2
+
+
+def _trigrams(s: str) -> set[str]:
+    s = f" {s} "
+    return {s[i:i + 3] for i in range(len(s) - 2)}
+
+
+def bounded_levenshtein(a: str, b: str, k: int) -> int:
+    """
+    Tahrir masofasi (Damerau/OSA: qo'shni harflar almashinuvi = 1 xato);
+    k dan oshishi aniq bo'lsa — darhol k + 1
+    """
+    if abs(len(a) - len(b)) > k:
+        return k + 1
+    pprev: list[int] = []
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            v = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                v = min(v, pprev[j - 2] + 1)
+            cur.append(v)
+        if min(cur) > k:
+            return k + 1
+        pprev, prev = prev, cur
+    return min(prev[-1], k + 1)
+
+
+class TrigramIndex:
+    """
+    _post[trigram] → kalit so'z indekslari
+    _terms[i]      → (kalit so'z, so'zlar soni, trigramlar soni, max xato, payload)
+    """
+    def __init__(self):
+        self._post  : dict[str, list[int]] = {}
+        self._terms : list[tuple[str, int, int, int, Hashable]] = []
+        self._seen  : set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._terms)
+
+    def add(self, term: str, payload: Hashable):
+        term = term.lower().strip()
+        k = max_distance(term)
+        if not k or term in self._seen:
+            return
+        self._seen.add(term)
+        grams = _trigrams(term)
+        idx = len(self._terms)
+        self._terms.append((term, len(term.split()), len(grams), k, payload))
+        for g in grams:
+            self._post.setdefault(g, []).append(idx)
+
+    def search(self, cmd: str) -> Optional[tuple[int, int, str, Hashable, int]]:
+        """
+        Eng yaxshi moslik: (boshlanish so'zi, tugash so'zi, kalit so'z, payload, masofa).
+        Ikki xil payload bir xil masofada chiqsa — ishonchsiz, None.
+        """
+        words = cmd.lower().split()
+        best  = None
+        tie   = False
+        for n in range(1, _MAX_WORDS + 1):
+            for s in range(len(words) - n + 1):
+                window = " ".join(words[s:s + n])
+                counts: dict[int, int] = {}
+                for g in _trigrams(window):
+                    for t in self._post.get(g, ()):
+                        counts[t] = counts.get(t, 0) + 1
+                for t, shared in counts.items():
+                    term, nw, ng, k, payload = self._terms[t]
+                    # q-gram chegarasi: har bir xato ko'pi bilan 3 ta trigramni
+                    # buzadi, qo'shimcha (suffiks) esa yana 2 tasini
+                    if nw != n or shared < ng - 3 * k - 2:
+                        continue
+                    d = min(bounded_levenshtein(window[:len(window) - len(suf)], term, k)
+                            for suf in _SUFFIXES if window.endswith(suf))
+                    if d > k:
+                        continue
+                    key = (d, -len(term))
+                    if best is None or key < best[0]:
+                        best, tie = (key, (s, s + n, term, payload, d)), False
+                    elif key == best[0] and payload != best[1][3]:
+                        tie = True
+        if best is None or tie:
+            return None
+        return best[1]
+
+
+# ══════════════════════════════════════════════════════════
+#  BUYRUQNI TIKLASH
+# ══════════════════════════════════════════════════════════
+_index    : Optional[TrigramIndex] = None
+_contacts : Optional[dict] = None
+
+
+def _build(contacts: dict) -> TrigramIndex:
+    from modules import nlu
+    idx = TrigramIndex()
+    for intent, keywords in nlu._INTENTS:
+        if intent in _UNSAFE:
+            continue
+        for kw in keywords:
+            idx.add(kw, ("intent", intent))
+    for site in nlu.SITES:
+        idx.add(site, ("site", site))
+    for app, _ in nlu._apps_table():
+        idx.add(app, ("app", app))
+    for name in contacts:
+        idx.add(name, ("contact", name))
+    return idx
+
+
+def correct_command(cmd: str) -> Optional[tuple[str, str, str]]:
+    """
+    Buzilgan buyruqni tiklash: (tuzatilgan buyruq, tur, yorliq) yoki None.
+    tur: "intent" | "app" | "site" | "contact"
+    """
+    global _index, _contacts
+    from modules.computer_control import load_contacts
+    contacts = load_contacts()
+    if _index is None or contacts is not _contacts:    # contacts.json o'zgardi
+        _index, _contacts = _build(contacts), contacts
+    hit = _index.search(cmd)
+    if hit is None:
+        return None
+    s, e, term, (kind, label), dist = hit
+    if dist == 0:
+        return None          # Aniq moslik — bu yerga kelmasligi kerak edi
+    words = cmd.split()
+    return " ".join(words[:s] + [term] + words[e:]), kind, label
@@ -5,7 +5,7 @@ JARVIS — O'z-o'zini o'rgatish moduli
 - STT xatolarini o'rganadi
 - Offline cache
 """
-import json, os
+import json, os, threading
 from datetime import datetime
 
 _BASE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -16,6 +16,8 @@ LEARNED_FILE  = os.path.join(_DATA, "learned_commands.json")
 STT_FIX_FILE  = os.path.join(_DATA, "stt_patterns.json")
 OFFLINE_FILE  = os.path.join(_DATA, "offline_cache.json")
 
+_learn_lock = threading.Lock()     # learn_command fon thread lardan chaqiriladi
+
 
 def _load(path, default):
     try:
@@ -32,14 +34,15 @@ def _save(path, data):
 # ── Buyruqni o'rganish ────────────────────────────────────
 def learn_command(raw_cmd: str, intent: str, success: bool):
     """Har bir buyruqni saqlaydi"""
-    data = _load(LEARNED_FILE, {})
-    key  = raw_cmd.strip().lower()
-    if key not in data:
-        data[key] = {"intent": intent, "count": 0, "success": 0}
-    data[key]["count"]   += 1
-    data[key]["success"] += 1 if success else 0
-    data[key]["last"]     = datetime.now().isoformat()
-    _save(LEARNED_FILE, data)
+    with _learn_lock:
+        data = _load(LEARNED_FILE, {})
+        key  = raw_cmd.strip().lower()
+        if key not in data:
+            data[key] = {"intent": intent, "count": 0, "success": 0}
+        data[key]["count"]   += 1
+        data[key]["success"] += 1 if success else 0
+        data[key]["last"]     = datetime.now().isoformat()
+        _save(LEARNED_FILE, data)
 
 
 # ── STT xatosini o'rganish ────────────────────────────────
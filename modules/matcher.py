@@ -0,0 +1,116 @@
+"""
+JARVIS — Ko'p kalit so'zli moslashtiruvchi (Aho-Corasick)
+
+Bir nechta jadval (intent, realtime, saytlar, ilovalar ...) bitta
+avtomatga kompilyatsiya qilinadi. Buyruq bir marta o'qiladi va barcha
+mos kalit so'zlar topiladi — har bir jadval uchun alohida sikl yo'q.
+
+Semantika `kw in text` bilan bir xil (substring). Har bir kalit so'z
+(jadval, yorliq, daraja) ga bog'lanadi; daraja kichik — ustuvorligi
+yuqori. best() har jadvaldan eng ustuvor yorliqni qaytaradi, ya'ni
+eski "birinchi mos kelgan" tartibi saqlanadi.
+
+Foydalanish:
+    ac = Automaton()
+    ac.add("ob-havo", "realtime", "weather", 0)
+    ac.add("kurs",    "realtime", "currency", 1)
+    ac.build()
+    ac.best("dollar kursi qancha")   → {"realtime": "currency"}
+"""
+from collections import deque
+from typing import Hashable, Optional
+
+
+class Automaton:
+    """
+    _goto[node] — {belgi: keyingi tugun}
+    _fail[node] — eng uzun to'g'ri suffiks tuguni
+    _out[node]  — shu tugunda tugaydigan naqshlar (fail zanjiri bilan birlashtirilgan)
+    """
+    def __init__(self):
+        self._goto : list[dict[str, int]] = [{}]
+        self._fail : list[int] = [0]
+        self._out  : list[tuple[int, ...]] = [()]
+        self._pats : list[tuple[int, Hashable, Hashable, str]] = []
+        self._built = False
+
+    def __len__(self) -> int:
+        return len(self._pats)
+
+    def add(self, keyword: str, table: Hashable, label: Hashable, rank: int):
+        """build() dan oldin chaqiriladi"""
+        if not keyword:
+            return
+        node = 0
+        for ch in keyword:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+                self._goto[node][ch] = nxt
+            node = nxt
+        self._out[node] += (len(self._pats),)
+        self._pats.append((rank, table, label, keyword))
+        self._built = False
+
+    def add_table(self, table: Hashable, entries):
+        """entries — [(yorliq, [kalit so'zlar]), ...]; daraja = tartib raqami"""
+        for rank, (label, keywords) in enumerate(entries):
+            for kw in keywords:
+                self.add(kw, table, label, rank)
+
+    def build(self) -> "Automaton":
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        for child in queue:
+            fail[child] = 0
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                if out[fail[child]]:
+                    out[child] += out[fail[child]]
+                queue.append(child)
+        self._built = True
+        return self
+
+    # ── Qidiruv ──────────────────────────────────────────
+    def _scan(self, text: str) -> set[int]:
+        if not self._built:
+            self.build()
+        goto, fail, out = self._goto, self._fail, self._out
+        node  = 0
+        found : set[int] = set()
+        for ch in text:
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                found.update(out[node])
+        return found
+
+    def matches(self, text: str) -> list[tuple[Hashable, Hashable, str]]:
+        """Barcha moslar: [(jadval, yorliq, kalit so'z), ...] — ustuvorlik tartibida"""
+        pats = self._pats
+        hits = sorted((pats[i] for i in self._scan(text)),
+                      key=lambda p: (str(p[1]), p[0]))
+        return [(table, label, kw) for _, table, label, kw in hits]
+
+    def best(self, text: str) -> dict[Hashable, Hashable]:
+        """{jadval: eng ustuvor yorliq} — bitta o'tishda"""
+        pats = self._pats
+        top  : dict[Hashable, tuple[int, Hashable]] = {}
+        for i in self._scan(text):
+            rank, table, label, _ = pats[i]
+            cur = top.get(table)
+            if cur is None or rank < cur[0]:
+                top[table] = (rank, label)
+        return {table: label for table, (_, label) in top.items()}
+
+    def first(self, text: str, table: Hashable) -> Optional[Hashable]:
+        return self.best(text).get(table)
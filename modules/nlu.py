@@ -3,8 +3,11 @@ JARVIS — Natural Language Understanding
 normalize, wake word, intent detection, contact match, AI validation
 """
 import re, json
+from functools import lru_cache
 from typing import Optional, Tuple
 
+from modules.matcher import Automaton
+
 # ── Wake so'zlar ──────────────────────────────────────────
 WAKE_WORDS = {"jarvis", "джарвис", "жарвис", "jarwis", "jarvas", "garvis"}
 
@@ -32,30 +35,47 @@ _CYR = {
 }
 
 
-def normalize_text(text: str) -> str:
-    """Kiril → Lotin, kichik harf, tozalash — Bug #8"""
-    # Unicode apostroflarni normallashtirish
-    text = text.replace('\u2019', "'").replace('\u2018', "'").replace('\u02bc', "'")
-    result = []
-    for ch in text.lower():
-        result.append(_CYR.get(ch, ch))
-    text = re.sub(r'\s+', ' ', ''.join(result)).strip()
-    # STT xatoliklarini tuzatish
-    STT_FIXES = {
-        "tayyor qo'y": "taymer qo'y",
-        "tayyor qoy":  "taymer qo'y",
-        "tayyor koy":  "taymer qo'y",
-        "tayyor ko'y": "taymer qo'y",
-    }
-    for wrong, correct in STT_FIXES.items():
-        if wrong in text and any(w in text for w in ["daqiqa","soat","sekund","minut"]):
-            text = text.replace(wrong, correct)
-    # 'tayyor' yolg'iz holda ham taymer
-    if "tayyor" in text and any(w in text for w in ["daqiqa","soat","sekund","minut"]):
-        text = text.replace("tayyor", "taymer")
+# Apostroflar + Kiril → Lotin: bitta str.translate jadvali
+_TRANSLATE = str.maketrans({**_CYR, '\u2019': "'", '\u2018': "'", '\u02bc': "'"})
+
+# STT xatoliklari: "tayyor qo'y/qoy/koy/ko'y" → "taymer qo'y", yolg'iz "tayyor" → "taymer"
+# (faqat buyruqda vaqt birligi bo'lsa)
+_RE_TIME_UNIT = re.compile(r"daqiqa|soat|sekund|minut")
+_RE_TAYYOR    = re.compile(r"tayyor( (?:qo'y|qoy|koy|ko'y))?")
+
+
+def _fix_tayyor(m: re.Match) -> str:
+    return "taymer qo'y" if m.group(1) else "taymer"
+
+
+def _normalize(text: str) -> str:
+    text = " ".join(text.lower().translate(_TRANSLATE).split())
+    if "tayyor" in text and _RE_TIME_UNIT.search(text):
+        text = _RE_TAYYOR.sub(_fix_tayyor, text)
     return text
 
 
+@lru_cache(maxsize=1024)
+def normalize_text(text: str) -> str:
+    """Kiril → Lotin, kichik harf, tozalash — Bug #8 (takroriy gaplar keshdan)"""
+    return _normalize(text)
+
+
+def normalize_batch(texts) -> list[str]:
+    """
+    Korpus uchun: normalize_text keshini siqib chiqarmaydi,
+    to'plam ichidagi takrorlar bir marta hisoblanadi.
+    """
+    seen: dict[str, str] = {}
+    out = []
+    for t in texts:
+        r = seen.get(t)
+        if r is None:
+            r = seen[t] = _normalize(t)
+        out.append(r)
+    return out
+
+
 def is_wake_word(text: str) -> bool:
     return bool(set(text.lower().split()) & WAKE_WORDS)
 
@@ -79,22 +99,93 @@ def contact_match(name: str, cmd: str) -> bool:
     Bug #5 fix: O'zbek suffix bilan to'g'ri moslashtirish
     "ona" → "onaga" ✓, "onang" ✓  |  "abdulazizovka" ✗
     """
-    pattern = r"(?<!\w)" + re.escape(name.lower()) + _UZ_SUFFIXES + r"(?!\w)"
-    return bool(re.search(pattern, cmd.lower()))
+    return bool(_contact_re(name.lower()).search(cmd.lower()))
+
+
+@lru_cache(maxsize=256)
+def _contact_re(name: str) -> re.Pattern:
+    return re.compile(r"(?<!\w)" + re.escape(name) + _UZ_SUFFIXES + r"(?!\w)")
+
+
+def _trie_pattern(words) -> str:
+    """
+    So'zlar → prefiks daraxti → regex: ["ota", "ona", "onajon"] → o(?:ta|na(?:jon)?)
+    Python re alternativalarni ketma-ket sinaydi; daraxt ko'rinishida har
+    pozitsiyada faqat bitta shox tekshiriladi — minglab ism ham tez.
+    """
+    trie: dict = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node: dict) -> str:
+        alts = [re.escape(ch) + emit(child) for ch, child in node.items() if ch]
+        if not alts:
+            return ""
+        if "" in node:
+            return "(?:" + "|".join(alts) + ")?"
+        return alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+
+    return emit(trie)
+
+
+class ContactIndex:
+    """
+    Barcha kontaktlar bitta regex da: (?<!\w)(ism1|ism2|...)SUFFIX(?!\w)
+    Suffix grammatikasi bir marta qo'llanadi; find() — bitta o'tish.
+    Bir nechta ism mos kelsa — contacts.json dagi tartib bo'yicha birinchisi.
+    """
+    def __init__(self, names):
+        self._names: dict[str, tuple[int, str]] = {}
+        for rank, name in enumerate(names):
+            self._names.setdefault(name.lower(), (rank, name))
+        self._re = (re.compile(r"(?<!\w)(" + _trie_pattern(self._names) + ")"
+                               + _UZ_SUFFIXES + r"(?!\w)")
+                    if self._names else None)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def find(self, cmd: str) -> Optional[str]:
+        """Mos kontakt kaliti (contacts.json dagi ko'rinishida) yoki None"""
+        if self._re is None:
+            return None
+        best = None
+        for m in self._re.finditer(cmd.lower()):
+            hit = self._names[m.group(1)]
+            if best is None or hit[0] < best[0]:
+                best = hit
+        return best[1] if best else None
 
 
 def needs_realtime(cmd: str) -> Optional[str]:
     """Internet kerak bo'lgan so'rovlarni aniqlash"""
-    if any(w in cmd for w in ["ob-havo", "havo", "harorat", "yomg'ir", "qor"]):
-        return "weather"
-    CURRENCY = {"dollar","euro","evro","rubl","so'm","kurs","valyuta","tenge","lira","yuan"}
-    if any(w in cmd for w in CURRENCY):
-        return "currency"
-    if any(w in cmd for w in ["yangilik", "xabar", "news"]):
-        return "news"
-    if any(w in cmd for w in ["soat", "vaqt", "nechchi"]):
-        return "time"
-    return None
+    return scan_keywords(cmd).get("realtime")
+
+
+# ── Real-time so'rovlar — tartib = ustuvorlik ─────────────
+_REALTIME: list[tuple[str, list[str]]] = [
+    ("weather",  ["ob-havo", "havo", "harorat", "yomg'ir", "qor"]),
+    ("currency", ["dollar", "euro", "evro", "rubl", "so'm", "kurs", "valyuta",
+                  "tenge", "lira", "yuan"]),
+    ("news",     ["yangilik", "xabar", "news"]),
+    ("time",     ["soat", "vaqt", "nechchi"]),
+]
+
+# ── Kompyuter boshqaruvi va saytlar ───────────────────────
+SYSTEM_WORDS = ["kompyuterni o'chir", "hozir o'chir", "restart",
+                "qayta yoq", "uxlat", "qulfla", "o'chirishni bekor"]
+
+SITES = {
+    "google":    "https://www.google.com",
+    "gmail":     "https://mail.google.com",
+    "instagram": "https://www.instagram.com",
+    "github":    "https://www.github.com",
+    "chatgpt":   "https://chat.openai.com",
+    "tiktok":    "https://www.tiktok.com",
+}
 
 
 # ── Intent map — (intent, keywords[]) ─────────────────────
@@ -163,11 +254,62 @@ _INTENTS: list[tuple[str, list[str]]] = [
 
 def match_local_intent(cmd: str) -> Optional[str]:
     """Buyruqdan intent topish"""
+    return scan_keywords(cmd).get("intent")
+
+
+def match_site(cmd: str) -> Optional[str]:
+    return scan_keywords(cmd).get("site")
+
+
+def match_app(cmd: str) -> Optional[str]:
+    """config.APPS kaliti (dict tartibida birinchi mos)"""
+    return scan_keywords(cmd).get("app")
+
+
+def is_system_command(cmd: str) -> bool:
+    return "system" in scan_keywords(cmd)
+
+
+# ── Kompilyatsiya qilingan moslashtiruvchi ────────────────
+# Barcha jadvallar bitta Aho-Corasick avtomatida; process_command ketma-ket
+# needs_realtime / match_local_intent / match_site / match_app chaqirsa ham
+# buyruq bir marta skanerlanadi (oxirgi natija eslab qolinadi).
+_automaton : Optional[Automaton] = None
+_last      : tuple[str, dict] = ("", {})
+
+
+def _apps_table() -> list[tuple[str, list[str]]]:
+    try:
+        from config import APPS
+    except ImportError:
+        return []
+    return [(name, [name]) for name in APPS]
+
+
+def compile_keywords() -> Automaton:
+    """Jadvallarni qayta kompilyatsiya (config.APPS o'zgarsa ham chaqiriladi)"""
+    global _automaton, _last
+    ac = Automaton()
+    ac.add_table("intent",   _INTENTS)
+    ac.add_table("realtime", _REALTIME)
+    ac.add_table("system",   [("system", SYSTEM_WORDS)])
+    ac.add_table("site",     [(name, [name]) for name in SITES])
+    ac.add_table("app",      _apps_table())
+    ac.build()
+    _automaton, _last = ac, ("", {})
+    return ac
+
+
+def scan_keywords(cmd: str) -> dict[str, str]:
+    """{jadval: birinchi mos yorliq} — jadvallar: intent, realtime, system, site, app"""
+    global _last
     low = cmd.lower()
-    for intent, keywords in _INTENTS:
-        if any(kw in low for kw in keywords):
-            return intent
-    return None
+    last_cmd, hits = _last
+    if low == last_cmd:
+        return hits
+    hits  = (_automaton or compile_keywords()).best(low)
+    _last = (low, hits)
+    return hits
 
 
 def parse_ai_json(raw: str) -> dict:
@@ -0,0 +1,246 @@
+"""
+JARVIS — NLU regressiya harness (aniqlik + o'tkazuvchanlik)
+
+Korpus: corpus/nlu.jsonl — har qator bitta gap:
+  {"cmd": "ovozni 50 ga qo'y", "intent": "volume", "slots": {"number": 50}}
+  "intent" — kutilgan yo'nalish (intent nomi yoki volume/system/weather/
+  currency/news/time/site/app/contact/stop/stop_speaking/ai), "slots" — faqat
+  tekshiriladigan kalitlar. "review": true — logdan yangi olingan, hali
+  tekshirilmagan qator (hisobga kirmaydi).
+
+route_command() — _process_command tartibini yon ta'sirsiz takrorlaydi:
+normalize_text → stop → ovoz → tizim → real-time → intent → sayt → ilova →
+kontakt → fuzzy → klassifikator → AI. Slotlar — modules/slots.extract.
+
+Foydalanish:
+    python bench.py nlu                   → hisobot; bazadan yomonlashsa xato
+    python bench.py nlu --update-baseline → corpus/nlu_baseline.json ni yangilash
+    python bench.py nlu --seed            → logs/*.log dagi yangi USER: qatorlari
+"""
+import os, json, glob, time
+from typing import NamedTuple, Optional
+
+_BASE         = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPUS_FILE   = os.path.join(_BASE, "corpus", "nlu.jsonl")
+BASELINE_FILE = os.path.join(_BASE, "corpus", "nlu_baseline.json")
+LOG_GLOB      = os.path.join(_BASE, "logs", "*.log")
+
+# Regressiya chegaralari
+ACCURACY_DROP   = 0.01     # Umumiy aniqlik shuncha tushsa — xato
+INTENT_DROP     = 0.20     # Bitta intent (support >= _MIN_SUPPORT) aniqligi
+THROUGHPUT_DROP = 0.30     # buyruq/s bazadan 30% past — xato (mashina shovqini uchun zaxira)
+_MIN_SUPPORT    = 3
+
+_STOP_SPEAKING = ["toxta", "to'xta", "jim bo'l", "bas", "yetarli"]
+
+
+class Routed(NamedTuple):
+    label : str              # intent / yo'nalish
+    stage : str              # qaysi qatlam hal qildi
+    slots : dict
+
+
+def route_command(cmd: str, fuzzy: bool = True) -> Routed:
+    """Normallangan buyruq → (yo'nalish, qatlam, slotlar); hech narsa bajarilmaydi"""
+    from modules.nlu import (is_stop_command, is_system_command, needs_realtime,
+                             match_local_intent, match_site, match_app)
+    from modules.slots import extract
+    from modules.computer_control import volume_action, find_contact
+
+    slots = extract(cmd).as_dict() if cmd else {}
+    if not cmd:
+        return Routed("ai", "empty", slots)
+    if is_stop_command(cmd):
+        return Routed("stop", "stop", slots)
+    if any(w in cmd for w in _STOP_SPEAKING):
+        return Routed("stop_speaking", "stop", slots)
+    if volume_action(cmd):
+        return Routed("volume", "volume", slots)
+    if is_system_command(cmd):
+        return Routed("system", "system", slots)
+
+    intent = match_local_intent(cmd)
+    rt = needs_realtime(cmd)
+    if rt == "time" and intent == "reminder":
+        rt = None
+    if rt:
+        return Routed(rt, "realtime", slots)
+    if intent and not (intent == "volume" and not volume_action(cmd)):
+        return Routed(intent, "intent", slots)
+
+    site = match_site(cmd)
+    if site:
+        return Routed("site", "site", {**slots, "site": site})
+    app = match_app(cmd)
+    if app:
+        return Routed("app", "app", {**slots, "app": app})
+    contact = find_contact(cmd)
+    if contact:
+        return Routed("contact", "contact", {**slots, "contact": contact})
+    if "telegram" in cmd:
+        return Routed("app", "app", {**slots, "app": "telegram"})
+
+    if fuzzy:
+        from modules.fuzzy import correct_command
+        fixed = correct_command(cmd)
+        if fixed:
+            r = route_command(fixed[0], fuzzy=False)
+            return Routed(r.label, "fuzzy", r.slots)
+        from modules.classifier import classifier
+        guess = classifier.predict(cmd)
+        if guess:
+            return Routed(guess[0], "classifier", slots)
+    return Routed("ai", "ai", slots)
+
+
+# ══════════════════════════════════════════════════════════
+#  KORPUS
+# ══════════════════════════════════════════════════════════
+def load_corpus(path: str = CORPUS_FILE) -> list[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def log_utterances(pattern: str = LOG_GLOB) -> list[str]:
+    """logs/*.log dagi "USER:" qatorlari, takrorsiz, uchragan tartibda"""
+    out: dict[str, None] = {}
+    for path in sorted(glob.glob(pattern)):
+        with open(path, "r", encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if "USER:" in line:
+                    text = line.split("USER:", 1)[1].strip()
+                    if text:
+                        out.setdefault(text, None)
+    return list(out)
+
+
+def seed_from_logs(path: str = CORPUS_FILE, pattern: str = LOG_GLOB) -> int:
+    """
+    Korpusda yo'q log gaplarini joriy bashorat bilan qo'shish ("review": true).
+    Qo'lda tekshirib, "intent" ni to'g'rilab, "review" ni olib tashlash kerak.
+    """
+    from modules.nlu import normalize_text
+    known = {normalize_text(r["cmd"]) for r in load_corpus(path)}
+    rows  = []
+    for text in log_utterances(pattern):
+        norm = normalize_text(text)
+        if norm in known:
+            continue
+        known.add(norm)
+        rows.append({"cmd": text, "intent": route_command(norm).label,
+                     "source": "log", "review": True})
+    if rows:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for r in rows:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+    return len(rows)
+
+
+# ══════════════════════════════════════════════════════════
+#  BAHOLASH
+# ══════════════════════════════════════════════════════════
+def _clear_caches():
+    from modules import nlu, slots
+    nlu.normalize_text.cache_clear()
+    slots.extract.cache_clear()
+    nlu._last = ("", {})
+
+
+def evaluate(corpus: list[dict], rounds: int = 20) -> dict:
+    """
+    Aniqlik (intent + slot), chalkashlik juftlari va o'tkazuvchanlik.
+    O'tkazuvchanlik — har raundda keshlar tozalanadi (sovuq yo'l).
+    """
+    from modules.nlu import normalize_text
+    rows = [r for r in corpus if not r.get("review")]
+    if not rows:
+        return {}
+
+    per: dict[str, dict] = {}
+    confusion: dict[tuple[str, str], int] = {}
+    stages: dict[str, int] = {}
+    errors = []
+    correct = slot_rows = slot_ok = 0
+    for r in rows:
+        got  = route_command(normalize_text(r["cmd"]))
+        gold = r["intent"]
+        p = per.setdefault(gold, {"support": 0, "correct": 0})
+        p["support"] += 1
+        stages[got.stage] = stages.get(got.stage, 0) + 1
+        if got.label == gold:
+            p["correct"] += 1
+            correct += 1
+        else:
+            confusion[(gold, got.label)] = confusion.get((gold, got.label), 0) + 1
+            errors.append((r["cmd"], gold, got.label))
+        want = r.get("slots")
+        if want is not None:
+            slot_rows += 1
+            if all(got.slots.get(k) == v for k, v in want.items()):
+                slot_ok += 1
+            else:
+                errors.append((r["cmd"], f"slots {want}",
+                               f"{ {k: got.slots.get(k) for k in want} }"))
+
+    texts = [r["cmd"] for r in rows]
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        _clear_caches()
+        for t in texts:
+            route_command(normalize_text(t))
+    elapsed = time.perf_counter() - t0
+
+    for p in per.values():
+        p["accuracy"] = p["correct"] / p["support"]
+    return {
+        "n": len(rows),
+        "accuracy": correct / len(rows),
+        "slot_accuracy": slot_ok / slot_rows if slot_rows else 1.0,
+        "commands_per_sec": len(texts) * rounds / elapsed,
+        "per_intent": dict(sorted(per.items())),
+        "confusion": sorted(([g, p, n] for (g, p), n in confusion.items()),
+                            key=lambda x: -x[2]),
+        "stages": stages,
+        "errors": errors,
+    }
+
+
+def check_regression(report: dict, baseline: Optional[dict]) -> list[str]:
+    """Bazaga nisbatan yomonlashishlar (bo'sh ro'yxat — hammasi joyida)"""
+    if not baseline:
+        return []
+    fails = []
+    if report["accuracy"] < baseline["accuracy"] - ACCURACY_DROP:
+        fails.append(f"aniqlik {baseline['accuracy']:.3f} → {report['accuracy']:.3f}")
+    if report["slot_accuracy"] < baseline.get("slot_accuracy", 0) - ACCURACY_DROP:
+        fails.append(f"slot aniqligi {baseline['slot_accuracy']:.3f} → "
+                     f"{report['slot_accuracy']:.3f}")
+    if report["commands_per_sec"] < baseline["commands_per_sec"] * (1 - THROUGHPUT_DROP):
+        fails.append(f"o'tkazuvchanlik {baseline['commands_per_sec']:.0f} → "
+                     f"{report['commands_per_sec']:.0f} buyruq/s")
+    for label, old in baseline.get("per_intent", {}).items():
+        new = report["per_intent"].get(label)
+        if new and new["support"] >= _MIN_SUPPORT and new["accuracy"] < old - INTENT_DROP:
+            fails.append(f"{label}: {old:.2f} → {new['accuracy']:.2f}")
+    return fails
+
+
+def load_baseline(path: str = BASELINE_FILE) -> Optional[dict]:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_baseline(report: dict, path: str = BASELINE_FILE):
+    data = {"accuracy": round(report["accuracy"], 4),
+            "slot_accuracy": round(report["slot_accuracy"], 4),
+            "commands_per_sec": round(report["commands_per_sec"]),
+            "per_intent": {l: round(p["accuracy"], 4) for l, p in report["per_intent"].items()}}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write("\n")
@@ -0,0 +1,198 @@
+"""
+JARVIS — Sonlarni so'z bilan o'qish (o'zbek + rus)
+
+STT raqam o'rniga so'z qaytaradi: "ovozni ellik ga qo'y", "o'n besh
+daqiqadan keyin", "пятнадцать минут" → raqam regexlari ushlamaydi va
+buyruq AI ga ketadi. Bu modul normalize_text dan keyingi (lotin) so'zlarni
+songa aylantiradi:
+
+  • o'zbek: bir..to'qqiz, o'n..to'qson, yuz, ming, million, yarim
+  • rus:    odin..devyat, desyat..devyatnadtsat, dvadtsat..devyanosto,
+            sto..devyat'sot, tisyacha, million, poltora
+  • qo'shma: "ikki yuz ellik besh" → 255, "dvadtsat pyat" → 25
+  • qo'shimchalar: "ellikka", "beshda", "uchta", "o'n beshdan"
+  • tartib: "uchinchi", "yigirma birinchi", "tretiy" → 3, 21, 3
+
+Barcha so'z shakllari import paytida bitta lug'atga yig'iladi (kompilyatsiya),
+o'qish — so'zlar ustida bitta chiziqli o'tish.
+
+Foydalanish:
+    from modules.numwords import read_number, parse_number
+    parse_number("o'n besh daqiqadan keyin")   → 15
+    read_number(["ikki", "yuz", "ellikka"], 0) → NumberRun(250, 3, "ka", False, False)
+"""
+from typing import NamedTuple, Optional
+
+# Turlari: qo'shiluvchi (place — xona), ko'paytiruvchi (yuz), shkala (ming), yarim
+_ADD, _MUL, _SCALE, _HALF = range(4)
+
+# (so'z, qiymat, xona)
+_UZ_ADD = (
+    ("bir", 1, 1), ("ikki", 2, 1), ("uch", 3, 1), ("to'rt", 4, 1), ("besh", 5, 1),
+    ("olti", 6, 1), ("yetti", 7, 1), ("sakkiz", 8, 1), ("to'qqiz", 9, 1),
+    ("o'n", 10, 10), ("yigirma", 20, 10), ("o'ttiz", 30, 10), ("qirq", 40, 10),
+    ("ellik", 50, 10), ("oltmish", 60, 10), ("yetmish", 70, 10), ("sakson", 80, 10),
+    ("to'qson", 90, 10),
+)
+_RU_ADD = (
+    ("odin", 1, 1), ("odna", 1, 1), ("odno", 1, 1), ("dva", 2, 1), ("dve", 2, 1),
+    ("tri", 3, 1), ("chetire", 4, 1), ("pyat", 5, 1), ("shest", 6, 1), ("sem", 7, 1),
+    ("vosem", 8, 1), ("devyat", 9, 1),
+    ("desyat", 10, 1), ("odinnadtsat", 11, 1), ("dvenadtsat", 12, 1),
+    ("trinadtsat", 13, 1), ("chetirnadtsat", 14, 1), ("pyatnadtsat", 15, 1),
+    ("shestnadtsat", 16, 1), ("semnadtsat", 17, 1), ("vosemnadtsat", 18, 1),
+    ("devyatnadtsat", 19, 1),
+    ("dvadtsat", 20, 10), ("tridtsat", 30, 10), ("sorok", 40, 10),
+    ("pyat'desyat", 50, 10), ("shest'desyat", 60, 10), ("sem'desyat", 70, 10),
+    ("vosem'desyat", 80, 10), ("devyanosto", 90, 10),
+    ("sto", 100, 100), ("dvesti", 200, 100), ("trista", 300, 100),
+    ("chetiresta", 400, 100), ("pyat'sot", 500, 100), ("shest'sot", 600, 100),
+    ("sem'sot", 700, 100), ("vosem'sot", 800, 100), ("devyat'sot", 900, 100),
+)
+_SCALES = (("ming", 1000), ("tisyacha", 1000), ("tisyachi", 1000), ("tisyach", 1000),
+           ("million", 10 ** 6), ("milliona", 10 ** 6), ("millionov", 10 ** 6),
+           ("milliard", 10 ** 9))
+_RU_ORD = (("perv", 1), ("vtor", 2), ("tret", 3), ("chetvert", 4), ("chetvyort", 4),
+           ("pyat", 5), ("shest", 6), ("sed'm", 7), ("vos'm", 8), ("devyat", 9),
+           ("desyat", 10))
+_RU_ORD_ENDINGS = ("iy", "oy", "aya", "oe", "uyu", "ogo", "'ya", "'ye", "'yu", "'yego")
+
+# O'zbek qo'shimchalari: "ellikka", "beshda", "uchta", "o'ndan"
+_UZ_CASES = ("", "ga", "da", "dan", "ni", "ta", "taga", "tadan", "tasi", "tani")
+_ORD_CASES = ("", "si", "ga", "ni", "sini", "siga")
+
+# Yakka holda ko'pincha son emas: "bir oz", "birga", "on" (ingl.), "tort" (shirinlik)
+_WEAK = {"bir", "on", "tort"}
+
+
+class NumberRun(NamedTuple):
+    value   : float
+    end     : int        # Keyingi so'z indeksi
+    suffix  : str        # Oxirgi so'zdagi qo'shimcha ("ga", "da", "ta", ...)
+    ordinal : bool
+    weak    : bool       # Bitta noaniq so'z ("bir") — kontekst kerak
+
+
+def _uz_case_forms(word: str) -> list[tuple[str, str]]:
+    out = [(word + suf, suf) for suf in _UZ_CASES]
+    if word[-1] in "kq":                          # ellik+ga → ellikka, qirq+ga → qirqqa
+        g = "ka" if word[-1] == "k" else "qa"
+        out.append((word + g, g))
+    return out
+
+
+def _uz_ordinals(word: str) -> list[str]:
+    base = [word + ("nchi" if word[-1] in "aeiou" else "inchi")]
+    if word.endswith("k"):                        # ellik → elliginchi
+        base.append(word[:-1] + "ginchi")
+    return base
+
+
+def _compile() -> dict[str, tuple[float, int, int, str, bool]]:
+    """So'z shakli → (qiymat, xona, tur, qo'shimcha, tartibmi)"""
+    forms: dict[str, tuple[float, int, int, str, bool]] = {}
+
+    def put(word: str, entry):
+        forms.setdefault(word, entry)
+        if "'" in word:                           # STT apostrofni tashlab yuboradi
+            forms.setdefault(word.replace("'", ""), entry)
+
+    for word, value, place in _UZ_ADD:
+        for form, suf in _uz_case_forms(word):
+            put(form, (value, place, _ADD, suf, False))
+        for o in _uz_ordinals(word):
+            for suf in _ORD_CASES:
+                put(o + suf, (value, place, _ADD, suf, True))
+    for word, value, place in _RU_ADD:
+        put(word, (value, place, _ADD, "", False))
+    for stem, value in _RU_ORD:
+        for end in _RU_ORD_ENDINGS:
+            put(stem + end, (value, 1, _ADD, "", True))
+    for word, value in _SCALES:
+        forms_ = _uz_case_forms(word) if word in ("ming", "million", "milliard") else [(word, "")]
+        for form, suf in forms_:
+            put(form, (value, value, _SCALE, suf, False))
+        if word == "ming":
+            for o in _uz_ordinals(word):
+                put(o, (value, value, _SCALE, "", True))
+    for form, suf in _uz_case_forms("yuz"):
+        put(form, (100, 100, _MUL, suf, False))
+    for o in _uz_ordinals("yuz"):
+        put(o, (100, 100, _MUL, "", True))
+    for form, suf in _uz_case_forms("yarim"):
+        put(form, (0.5, 0, _HALF, suf, False))
+    put("poltora", (1.5, 1, _ADD, "", False))
+    return forms
+
+
+_FORMS = _compile()
+
+
+def is_number_word(word: str) -> bool:
+    return word in _FORMS
+
+
+def read_number(words: list[str], i: int) -> Optional[NumberRun]:
+    """
+    words[i] dan boshlanadigan son so'zlari ketma-ketligini o'qish.
+    Xona tartibi buzilsa ("besh olti") — to'xtaydi: ikkinchisi alohida son.
+    """
+    total = cur = 0.0
+    last  = scale = float("inf")     # oxirgi xona / oxirgi ming-million
+    j, n  = i, len(words)
+    suffix, ordinal = "", False
+    while j < n:
+        hit = _FORMS.get(words[j])
+        if hit is None:
+            break
+        value, place, kind, suf, ordn = hit
+        if kind == _HALF:
+            if j > i and cur % 1 == 0:            # "bir yarim" → 1.5
+                cur += 0.5
+            elif j == i:                          # "yarim soat" → 0.5
+                cur = 0.5
+            else:
+                break
+            j += 1; suffix = suf
+            break
+        if kind == _MUL:
+            if cur >= 10:
+                break
+            cur, last = (cur or 1) * value, place
+        elif kind == _SCALE:
+            if place >= scale:                    # "ming ming", "ming million"
+                break
+            total += (cur or 1) * value
+            cur, last, scale = 0.0, place, place
+        else:
+            if place >= last:
+                break
+            cur  += value
+            last  = place
+        j += 1
+        suffix, ordinal = suf, ordn
+        if suf or ordn:                           # Qo'shimcha so'zni yopadi
+            break
+    if j == i:
+        return None
+    base = words[i][:len(words[i]) - len(suffix)]       # "birga" → "bir"
+    weak = j == i + 1 and base in _WEAK and suffix != "ta"
+    return NumberRun(total + cur, j, suffix, ordinal, weak)
+
+
+def scale_of(word: str) -> Optional[tuple[int, str]]:
+    """Raqamdan keyingi ko'paytiruvchi: "ming" → (1000, ""), "mingga" → (1000, "ga")"""
+    hit = _FORMS.get(word)
+    return (int(hit[0]), hit[3]) if hit and hit[2] in (_MUL, _SCALE) and not hit[4] else None
+
+
+def parse_number(text: str) -> Optional[float]:
+    """Matndagi birinchi son — raqam yoki so'z bilan ("ellik" → 50, "15" → 15)"""
+    words = [w.strip(" ,.!?'\"") for w in text.lower().split()]
+    for i, w in enumerate(words):
+        if w.isdigit():
+            return float(w)
+        run = read_number(words, i)
+        if run and not run.weak:
+            return run.value
+    return None
@@ -0,0 +1,181 @@
+"""
+JARVIS — Ko'p buyruqli gaplarni rejalashtirish
+
+"Chrome ni och va ovozni 50 ga qo'y" — avval faqat birinchi mos shox
+ishlardi. Endi gap bog'lovchilar ("va", "keyin", "so'ng", vergul) bo'yicha
+bo'linadi va kichik reja tuziladi:
+
+  • har bir bo'lak o'zi mahalliy yo'nalishga tushishi kerak — aks holda
+    bo'linmaydi ("soat 15 da yig'ilish bor, eslatib qo'y" bitta eslatma)
+  • "30 daqiqadan keyin" dagi "keyin" bog'lovchi emas
+  • ketma-ket bir xil ma'lumot so'rovi qayta qo'shiladi
+    ("valyuta kurslari uzbek va dollar" — bitta valyuta so'rovi)
+  • reja — bosqichlar ro'yxati: bosqich ichidagi qadamlar parallel,
+    bosqichlar ketma-ket. Yangi bosqich: "keyin"/"so'ng", bir xil resurs
+    (ekran, ovoz, xotira fayllari) yoki tizim buyrug'i (o'chirish — oxirida)
+
+Bajarish umumiy executor da; har qadam gaplari yig'ilib, oxirida bitta
+umumiy javob aytiladi.
+
+Foydalanish:
+    from modules.planner import plan_command, run_plan, summarize
+    stages = plan_command("chrome ni och va ovozni 50 ga qo'y")
+    said   = run_plan(stages, run_step)     # run_step(text) → [gaplar]
+    speak(summarize(said))
+"""
+import re
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Callable, NamedTuple, Optional
+
+from modules.logger import logger
+
+# ", keyin" ham bitta bog'lovchi; faqat vergul — bog'lovchi None
+_RE_SPLIT   = re.compile(r"(?:\s*,\s*|\s+)(va|hamda|keyin|so'ng|undan keyin)\s+|\s*,\s*")
+_SEQUENTIAL = {"keyin", "so'ng", "undan keyin"}
+_MAX_STEPS  = 5
+_STEP_TIMEOUT = 30.0
+
+# Yo'nalish → resurs guruhi: bir guruhdagilar parallel ishlamaydi
+_GROUPS = {"app": "screen", "site": "screen", "contact": "screen", "window": "screen",
+           "folder_open": "screen", "youtube": "screen", "screenshot": "screen",
+           "volume": "audio", "media": "audio",
+           "task": "memory", "journal": "memory", "memory": "memory"}
+# Bir gapda bog'lovchi bilan sanalgan ma'lumotlar — bitta so'rov
+_DATA_ROUTES = {"weather", "currency", "news", "time"}
+# Yakuniy javobga kirmaydigan oraliq gaplar
+_FILLERS = {"bir daqiqa..."}
+
+
+class Step(NamedTuple):
+    text  : str
+    route : str
+
+
+def route_of(cmd: str) -> Optional[str]:
+    """
+    _process_command tartibida mahalliy yo'nalish nomi; None — mahalliy
+    yo'nalish yo'q (AI ga ketadi yoki bo'lak mustaqil buyruq emas).
+    """
+    from modules.nlu import (is_stop_command, is_system_command, needs_realtime,
+                             match_local_intent, match_site, match_app)
+    from modules.slots import extract
+    if not cmd or is_stop_command(cmd):
+        return None
+    if "ovoz" in cmd:
+        return "volume"
+    if is_system_command(cmd):
+        return "system"
+    intent = match_local_intent(cmd)
+    rt = needs_realtime(cmd)
+    if rt == "time":
+        # "soat 15 da yig'ilish" — vaqt so'rovi emas, boshqa buyruqning argumenti
+        s = extract(cmd)
+        if intent == "reminder" or s.clock or s.duration:
+            rt = None
+    if rt:
+        return rt
+    if intent:
+        head = intent.split("_", 1)[0]
+        return ("window" if head == "win" else
+                head if head in ("media", "task", "journal", "memory") else intent)
+    if match_site(cmd):
+        return "site"
+    if match_app(cmd):
+        return "app"
+    from modules.computer_control import find_contact
+    if find_contact(cmd):
+        return "contact"
+    return None
+
+
+def split_command(cmd: str) -> list[tuple[str, Optional[str]]]:
+    """Gap → [(bo'lak, oldingi bog'lovchi)]; vergul uchun bog'lovchi None"""
+    pieces = _RE_SPLIT.split(cmd)
+    parts  = [(pieces[0].strip(), None)]
+    for i in range(1, len(pieces) - 1, 2):
+        conn, text = pieces[i], pieces[i + 1].strip()
+        prev = parts[-1][0]
+        # "30 daqiqadan keyin" — vaqt iborasi, bog'lovchi emas
+        if conn in _SEQUENTIAL and prev.endswith("dan"):
+            parts[-1] = (f"{prev} {conn} {text}", parts[-1][1])
+            continue
+        parts.append((text, conn))
+    return [(t, c) for t, c in parts if t]
+
+
+def plan_command(cmd: str) -> Optional[list[list[Step]]]:
+    """
+    Bir nechta mustaqil buyruq bo'lsa — bosqichlar ro'yxati, aks holda None
+    (oddiy yo'l bilan bajariladi).
+    """
+    parts = split_command(cmd)
+    if len(parts) < 2 or len(parts) > _MAX_STEPS:
+        return None
+
+    steps: list[tuple[Step, Optional[str]]] = []
+    for text, conn in parts:
+        route = route_of(text)
+        if route is None:
+            return None
+        if steps and route in _DATA_ROUTES and steps[-1][0].route == route:
+            prev, pconn = steps[-1]
+            steps[-1] = (Step(f"{prev.text} {conn or ','} {text}", route), pconn)
+            continue
+        steps.append((Step(text, route), conn))
+    if len(steps) < 2:
+        return None
+
+    stages: list[list[Step]] = []
+    for step, conn in steps:
+        group = _GROUPS.get(step.route, step.route)
+        cur   = stages[-1] if stages else None
+        if (cur is None or conn in _SEQUENTIAL or step.route == "system"
+                or any(s.route == "system" or _GROUPS.get(s.route, s.route) == group
+                       for s in cur)):
+            stages.append([step])
+        else:
+            cur.append(step)
+    return stages
+
+
+def run_plan(stages: list[list[Step]], run_step: Callable[[str], list[str]],
+             timeout: float = _STEP_TIMEOUT) -> list[str]:
+    """
+    Bosqichma-bosqich bajarish. Bosqich ichidagilar executor da parallel,
+    natijalar (gaplar) reja tartibida qaytadi.
+    """
+    from modules.core import executor
+    said: list[str] = []
+    for stage in stages:
+        if len(stage) == 1:
+            said.extend(_safe(run_step, stage[0]))
+            continue
+        jobs = [(step, *executor.submit(_safe, run_step, step, timeout=timeout))
+                for step in stage]
+        for step, fut, token in jobs:
+            try:
+                said.extend(fut.result(timeout))
+            except FutureTimeout:
+                executor.abandon(fut, token)
+                logger.warning(f"PLAN: '{step.text}' {timeout:.0f} s da tugamadi")
+                said.append(f"{step.text} — javob kechikdi")
+    return said
+
+
+def _safe(run_step: Callable[[str], list[str]], step: Step) -> list[str]:
+    try:
+        return run_step(step.text)
+    except Exception as e:
+        logger.error(f"PLAN '{step.text}': {e}")
+        return [f"{step.text} — bajarib bo'lmadi"]
+
+
+def summarize(said: list[str]) -> str:
+    """Qadamlar gaplari → bitta javob"""
+    out = []
+    for text in said:
+        text = text.strip()
+        if not text or text.lower() in _FILLERS:
+            continue
+        out.append(text if text[-1] in ".!?" else text + ".")
+    return " ".join(out)
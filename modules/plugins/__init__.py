@@ -0,0 +1,135 @@
+"""
+JARVIS — Handler plaginlari: manifest + kechiktirilgan yuklash
+
+Avval modules/handlers.py barcha handler'larni va ularning og'ir
+bog'liqliklarini (pycaw/comtypes, spotipy, psutil, deep_translator,
+requests, tkinter) jarvis.py importida yuklardi — "Salom" dan oldin.
+Endi bu yerda faqat manifest: nom, "modul:funksiya", kalit so'zlar,
+ustuvorlik. Plagin moduli birinchi chaqiruvda import qilinadi
+(command_router.plugin), warm_up() esa ularni fonda oldindan yuklaydi.
+
+Plaginlar (og'ir bog'liqlik bo'yicha guruhlangan):
+    voice    — stop, to'xta                         (tts)
+    control  — ovoz, tizim, skrinshot, ilova, kontakt (pycaw, pyautogui)
+    info     — vaqt, sana, ob-havo, valyuta, yangilik, internet, tarjima
+                                                     (requests, deep_translator)
+    desktop  — media, oynalar, clipboard, YouTube, saytlar (spotipy, pygetwindow)
+    files    — statistika, jarayonlar, papkalar        (psutil)
+    notes    — eslatma, vazifa, kundalik, xotira
+    ui       — sozlamalar, tarix, dashboard oynalari   (tkinter)
+
+Ustuvorlik (kichik — oldin):
+    0 stop, 10 stop_speaking, 20 volume, 30 system, 40 real-time,
+    50 mahalliy intentlar (nlu._INTENTS nomlari), 60 site, 70 app,
+    80 contact, 90 telegram
+Intent va real-time kalit so'zlari nlu jadvallarida — _scanned() manbasi
+orqali (bitta avtomat o'tishi) handler nomiga aylanadi.
+
+Foydalanish:
+    import modules.plugins                      # manifest reyestrga yoziladi
+    from modules.plugins import warm_up
+    executor.submit(run_as_background, warm_up)
+"""
+from modules.command_router import plugin, add_source, load_module, loaded
+from modules.nlu import is_stop_command, scan_keywords
+from modules.logger import logger
+
+# Ustuvorlik darajalari
+P_STOP, P_STOP_SPEAKING, P_VOLUME, P_SYSTEM = 0, 10, 20, 30
+P_REALTIME, P_INTENT, P_SITE, P_APP, P_CONTACT, P_TELEGRAM = 40, 50, 60, 70, 80, 90
+
+# Fon handler'lari uchun deadline (soniya): limiter kutishi + HTTP timeout
+D_WEATHER, D_CURRENCY, D_NEWS, D_INTERNET, D_TRANSLATE = 10.0, 10.0, 12.0, 8.0, 10.0
+
+_INTENT = {"priority": P_INTENT, "learn": True}
+
+# (nom, "plagin:funksiya", kalit so'zlar, opsiyalar)
+MANIFEST = (
+    ("stop",          "voice:h_stop",            (), {"priority": P_STOP, "when": is_stop_command}),
+    ("stop_speaking", "voice:h_stop_speaking",
+                      ("toxta", "to'xta", "jim bo'l", "bas", "yetarli"),
+                      {"priority": P_STOP_SPEAKING}),
+    ("volume",        "control:h_volume",        ("ovoz",), {"priority": P_VOLUME}),
+    ("system",        "control:h_computer",      (), {"priority": P_SYSTEM}),
+    ("shutdown",      "control:h_computer",      (), _INTENT),
+    ("restart",       "control:h_computer",      (), _INTENT),
+    ("sleep",         "control:h_computer",      (), _INTENT),
+    ("lock",          "control:h_computer",      (), _INTENT),
+
+    ("weather",       "info:h_weather",          (), {"priority": P_REALTIME, "deadline": D_WEATHER}),
+    ("time",          "info:h_time",             (), {"priority": P_REALTIME}),
+    ("currency",      "info:h_currency",         (), {"priority": P_REALTIME, "deadline": D_CURRENCY}),
+    ("news",          "info:h_news",             (), {"priority": P_REALTIME, "deadline": D_NEWS}),
+
+    ("date",          "info:h_date",             (), _INTENT),
+    ("screenshot",    "control:h_screenshot",    (), _INTENT),
+    ("stats",         "files:h_stats",           (), _INTENT),
+    ("internet",      "info:h_internet",         (), dict(_INTENT, deadline=D_INTERNET)),
+    ("media_next",    "desktop:h_media_next",    (), _INTENT),
+    ("media_prev",    "desktop:h_media_prev",    (), _INTENT),
+    ("media_pause",   "desktop:h_media_pause",   (), _INTENT),
+    ("media_play",    "desktop:h_media_play",    (), _INTENT),
+    ("win_min_all",   "desktop:h_win_min_all",   (), _INTENT),
+    ("win_minimize",  "desktop:h_win_minimize",  (), _INTENT),
+    ("win_maximize",  "desktop:h_win_maximize",  (), _INTENT),
+    ("win_close",     "desktop:h_win_close",     (), _INTENT),
+    ("folder_open",   "files:h_folder_open",     (), _INTENT),
+    ("file_recent",   "files:h_file_recent",     (), _INTENT),
+    ("reminder_list", "notes:h_reminder_list",   (), _INTENT),
+    ("reminder",      "notes:h_reminder",        (), _INTENT),
+    ("task_add",      "notes:h_task_add",        (), _INTENT),
+    ("task_list",     "notes:h_task_list",       (), _INTENT),
+    ("task_done",     "notes:h_task_done",       (), _INTENT),
+    ("journal_add",   "notes:h_journal_add",     (), _INTENT),
+    ("journal_read",  "notes:h_journal_read",    (), _INTENT),
+    ("memory_save",   "notes:h_memory_save",     (), _INTENT),
+    ("memory_read",   "notes:h_memory_read",     (), _INTENT),
+    ("translate",     "info:h_translate",        (), dict(_INTENT, deadline=D_TRANSLATE)),
+    ("youtube",       "desktop:h_youtube",       (), _INTENT),
+    ("clipboard",     "desktop:h_clipboard",     (), _INTENT),
+    ("processes",     "files:h_processes",       (), _INTENT),
+    ("settings",      "ui:h_settings",           (), _INTENT),
+    ("history",       "ui:h_history",            (), _INTENT),
+    ("dashboard",     "ui:h_dashboard",          (), _INTENT),
+
+    ("site",          "desktop:h_site",          (), {"priority": P_SITE}),
+    ("app",           "control:h_app",           (), {"priority": P_APP}),
+    ("contact",       "control:h_contact",       (),
+                      {"priority": P_CONTACT, "when": "modules.computer_control:find_contact"}),
+    ("telegram",      "control:h_telegram",      ("telegram",), {"priority": P_TELEGRAM}),
+)
+
+# Fonda oldindan yuklanadigan plaginlar — ko'p ishlatiladigani birinchi
+WARM = ("info", "control", "notes", "files", "desktop", "ui")
+
+
+def _scanned(cmd: str):
+    """nlu avtomati (bitta o'tish): intent/realtime yorlig'i yoki jadval nomi → handler"""
+    hits = scan_keywords(cmd)
+    for table in ("realtime", "intent"):
+        if table in hits:
+            yield hits[table]
+    for table in ("system", "site", "app"):
+        if table in hits:
+            yield table
+
+
+def _register():
+    for name, target, keywords, opts in MANIFEST:
+        plugin(f"{__name__}.{target}", *keywords, name=name, **opts)
+    add_source(_scanned)
+
+
+def warm_up(extra: tuple[str, ...] = ()):
+    """Plaginlar (va extra modullar) ni fonda import qilish — birinchi buyruq kutmasin"""
+    done = loaded()
+    for mod in tuple(f"{__name__}.{p}" for p in WARM) + tuple(extra):
+        if mod in done:
+            continue
+        try:
+            load_module(mod, how="fon")
+        except Exception as e:
+            logger.error(f"Warm-up {mod}: {e}")
+
+
+_register()
@@ -0,0 +1,34 @@
+"""
+Plagin: ovoz, kompyuter, skrinshot, ilovalar, Telegram (pycaw, pyautogui)
+"""
+from modules.command_router import SKIP
+from modules.computer_control import (control_volume, control_computer,
+                                      take_screenshot, open_app,
+                                      find_contact, open_telegram_contact)
+from modules import history
+
+
+def h_volume(cmd: str):
+    return None if control_volume(cmd) else SKIP
+
+
+def h_computer(cmd: str):
+    return None if control_computer(cmd) else SKIP
+
+
+def h_screenshot(cmd: str):
+    take_screenshot(); history.record(cmd, "screenshot")
+
+
+def h_app(cmd: str):
+    if not open_app(cmd):
+        return SKIP
+    history.record(cmd, "app open")
+
+
+def h_contact(cmd: str):
+    return open_telegram_contact(cmd, find_contact(cmd))
+
+
+def h_telegram(cmd: str):
+    open_app("telegram")
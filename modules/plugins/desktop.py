@@ -0,0 +1,80 @@
+"""
+Plagin: media, oynalar, clipboard, YouTube va saytlar (spotipy, pygetwindow, pyperclip)
+"""
+import re, webbrowser
+
+from modules.tts import speak
+from modules import history
+from modules.nlu import scan_keywords, SITES
+from modules.slots import extract
+from modules.media_control import (media_play_pause, media_next, media_prev,
+                                   minimize_window, maximize_window, close_window,
+                                   minimize_all_windows, get_clipboard)
+
+
+def h_media_next(cmd: str):
+    media_next(); speak("Keyingi qo'shiq"); history.record(cmd, "next")
+
+
+def h_media_prev(cmd: str):
+    media_prev(); speak("Oldingi qo'shiq"); history.record(cmd, "prev")
+
+
+def h_media_pause(cmd: str):
+    media_play_pause(); speak("Bajarildi"); history.record(cmd, "media_pause")
+
+
+def h_media_play(cmd: str):
+    media_play_pause(); speak("Bajarildi"); history.record(cmd, "media_play")
+
+
+def h_win_min_all(cmd: str) -> str:
+    return minimize_all_windows()
+
+
+def h_win_minimize(cmd: str) -> str:
+    name = (extract(cmd).app or re.sub(r'\b(minimlashtir|kichrayt)\b','',cmd).strip()
+            or "Chrome")
+    return minimize_window(name)
+
+
+def h_win_maximize(cmd: str) -> str:
+    name = (extract(cmd).app
+            or re.sub(r"\b(to'liq ekran|kattalashtir|maximize)\b",'',cmd).strip() or "Chrome")
+    return maximize_window(name)
+
+
+def h_win_close(cmd: str) -> str:
+    name = (extract(cmd).app
+            or re.sub(r"\b(oynani yop|oynani o'chir)\b",'',cmd).strip() or "Chrome")
+    return close_window(name)
+
+
+def h_clipboard(cmd: str) -> str:
+    text = get_clipboard()
+    return f"Clipboardda: {text[:80]}" if text else "Clipboard bo'sh"
+
+
+def h_youtube(cmd: str):
+    q = cmd
+    for w in ["youtube","yutub","utub"]: q = q.replace(w,"")
+    q = re.sub(r"\b(ga|da|kir|och|ni)\b",'',q).strip()
+    if q:
+        webbrowser.open(f"https://www.youtube.com/results?search_query={q.replace(' ','+')}")
+        speak(f"YouTube da {q} ochilmoqda")
+    else:
+        webbrowser.open("https://www.youtube.com"); speak("YouTube ochilmoqda")
+    history.record(cmd,"youtube")
+
+
+def h_site(cmd: str):
+    site = scan_keywords(cmd)["site"]
+    # Google qidiruv
+    if site == "google":
+        m = re.search(r'google(?:\s+da)?\s+(.+?)\s*(?:qidir|search)?$', cmd)
+        if m:
+            webbrowser.open(f"https://www.google.com/search?q={m.group(1).replace(' ','+')}")
+            speak(f"{m.group(1)} qidirilmoqda"); history.record(cmd,"google"); return
+    webbrowser.open(SITES[site])
+    speak(f"{site.capitalize()} ochilmoqda")
+    history.record(cmd, site)
@@ -0,0 +1,26 @@
+"""
+Plagin: tizim statistikasi, jarayonlar, papkalar va fayllar (psutil)
+"""
+from modules.tts import speak
+from modules import history
+from modules.file_manager import (open_folder, parse_folder_from_cmd,
+                                  get_recent_download, get_top_processes,
+                                  format_system_stats,
+                                  get_system_stats as fm_get_stats, DESKTOP)
+
+
+def h_stats(cmd: str) -> str:
+    return format_system_stats(fm_get_stats())
+
+
+def h_processes(cmd: str):
+    resp = get_top_processes(); speak(resp[:200]); history.record(cmd,resp)
+
+
+def h_folder_open(cmd: str) -> str:
+    folder = parse_folder_from_cmd(cmd)
+    return open_folder(folder or DESKTOP)
+
+
+def h_file_recent(cmd: str) -> str:
+    return get_recent_download()
@@ -0,0 +1,96 @@
+"""
+Plagin: vaqt, sana, ob-havo, valyuta, yangiliklar, internet, tarjima
+(requests, deep_translator — tarmoqqa chiqadiganlar fonda, deadline bilan)
+"""
+import re, datetime
+
+from modules.command_router import SKIP
+from modules.nlu import match_local_intent
+from modules.web_services import (parse_currency_cmd, get_news_rss,
+                                  parse_translate_cmd, check_internet_speed)
+from config import CITY_NAME
+
+# ── Vaqt/sana ────────────────────────────────────────────
+_MONTHS = ["","yanvar","fevral","mart","aprel","may","iyun",
+           "iyul","avgust","sentabr","oktabr","noyabr","dekabr"]
+_DAYS   = ["dushanba","seshanba","chorshanba","payshanba",
+           "juma","shanba","yakshanba"]
+
+def _time_str() -> str:
+    n = datetime.datetime.now()
+    p = ("tong" if 5<=n.hour<12 else "kunduz" if n.hour<17
+         else "kechqurun" if n.hour<21 else "tun")
+    return f"Hozir soat {n.hour}:{n.minute:02d}. {p.capitalize()}."
+
+def _date_str() -> str:
+    n = datetime.datetime.now()
+    return f"Bugun {_DAYS[n.weekday()]}, {n.day} {_MONTHS[n.month]}, {n.year} yil."
+
+# ── Ob-havo (cache) ───────────────────────────────────────
+def get_weather(city: str = CITY_NAME) -> str:
+    from modules.core import smart_cache, limiters, RateLimited
+    import requests
+    from config import WEATHER_API_KEY
+
+    if not WEATHER_API_KEY:
+        return "Ob-havo API sozlanmagan"
+
+    def _load() -> str:
+        if not limiters["openweather"].acquire(timeout=3):
+            raise RateLimited("openweather")
+        url  = (f"https://api.openweathermap.org/data/2.5/weather"
+                f"?q={city}&appid={WEATHER_API_KEY}&units=metric&lang=uz")
+        data = requests.get(url, timeout=5).json()
+        t    = round(data["main"]["temp"])
+        desc = data["weather"][0]["description"]
+        wind = round(data["wind"]["speed"])
+        return f"{city}da hozir {t} daraja, {desc}. Shamol {wind} m/s."
+
+    # Bir vaqtdagi so'rovlar bitta HTTP ga birlashadi, eskirgani darhol qaytadi
+    try:
+        return smart_cache.get_or_compute(f"weather_{city.lower()}", "weather", _load)
+    except Exception:
+        return "Ob-havo ma'lumotini olib bo'lmadi"
+
+
+def weather_city(cmd: str) -> str:
+    """ "samarqandda ob-havo" → "Samarqand" (bo'lmasa CITY_NAME)"""
+    city_m = re.search(r'(\w+)da\s+(?:ob-havo|havo)', cmd)
+    return city_m.group(1).capitalize() if city_m else CITY_NAME
+
+
+def news_topic(cmd: str):
+    """ "sport haqida yangilik" → "sport" (mavzu yo'q — None)"""
+    topic = re.sub(r'\b(yangilik|xabar|news|haqida)\b','',cmd).strip()
+    return topic if len(topic)>3 else None
+
+
+def h_weather(cmd: str) -> str:
+    return get_weather(weather_city(cmd))
+
+
+def h_time(cmd: str):
+    # "soat 9 da ... eslatib qo'y" — vaqt so'rovi emas, eslatma
+    if match_local_intent(cmd) == "reminder":
+        return SKIP
+    return _time_str()
+
+
+def h_currency(cmd: str) -> str:
+    return parse_currency_cmd(cmd)
+
+
+def h_news(cmd: str) -> str:
+    return get_news_rss(news_topic(cmd))
+
+
+def h_date(cmd: str) -> str:
+    return _date_str()
+
+
+def h_internet(cmd: str) -> str:
+    return check_internet_speed()
+
+
+def h_translate(cmd: str) -> str:
+    return parse_translate_cmd(cmd)
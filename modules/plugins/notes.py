@@ -0,0 +1,87 @@
+"""
+Plagin: eslatmalar, vazifalar, kundalik va xotira
+"""
+import re, time
+
+from modules.tts import speak
+from modules import history
+from modules.slots import extract
+from modules.memory_manager import (save_memory, get_all_memory,
+                                    add_journal, get_journal,
+                                    add_task, complete_task,
+                                    get_tasks, format_tasks_text)
+from modules.reminders import (set_reminder, set_recurring, list_reminders,
+                               parse_recurrence, parse_duration,
+                               parse_reminder_message, format_time_left)
+
+
+def h_reminder_list(cmd: str) -> str:
+    rows = list_reminders()
+    return ("Hech qanday eslatma yo'q" if not rows
+            else "Eslatmalar: " + ", ".join(f"{i}. {format_time_left(s)}: {m}"
+                                             for i,(rid,s,m) in enumerate(rows,1)))
+
+
+def h_reminder(cmd: str):
+    rule = parse_recurrence(cmd)
+    if rule:
+        msg  = parse_reminder_message(cmd)
+        nxt  = rule.next_after(time.time())
+        rid  = set_recurring(rule, msg, speak) if nxt else None
+        return (f"Takroriy eslatma o'rnatildi: «{msg}», birinchisi "
+                f"{format_time_left(int(nxt - time.time()))} dan keyin"
+                if rid else "Bu jadval hech qachon ishlamaydi")
+    dur = parse_duration(cmd)
+    if dur:
+        msg  = parse_reminder_message(cmd)
+        set_reminder(dur, msg, speak)
+        return f"Eslatma o'rnatildi: {format_time_left(dur)} dan keyin «{msg}»"
+    speak("Qancha vaqtdan keyin eslatish kerak?")
+
+
+def h_task_add(cmd: str) -> str:
+    text = re.sub(r"\b(vazifa|todo|qo'sh|qosh|task)\b",'',cmd).strip(" ,.-")
+    if text:
+        add_task(text); return f"Vazifa qo'shildi: {text[:50]}"
+    return "Qanday vazifa?"
+
+
+def h_task_list(cmd: str):
+    resp = format_tasks_text(get_tasks())
+    speak(resp[:200]); history.record(cmd,resp)
+
+
+def h_task_done(cmd: str) -> str:
+    tid = extract(cmd).number
+    if tid is None:
+        return "Qaysi vazifa raqamini ayting"
+    return f"{tid}-vazifa bajarildi" if complete_task(tid) else "Bunday vazifa topilmadi"
+
+
+def h_journal_add(cmd: str) -> str:
+    text = re.sub(r"\b(kundalikka|yoz|qo'y|journal)\b",'',cmd).strip(" ,.-")
+    if text:
+        add_journal(text); return "Kundalikka yozildi"
+    return "Nima yozishni aytmadingiz"
+
+
+def h_journal_read(cmd: str) -> str:
+    entries = get_journal()
+    return ("Bugun kundalikda hech narsa yo'q" if not entries
+            else "Bugungi kundalik: " + ". ".join(e["text"] for e in entries[:3]))
+
+
+def h_memory_save(cmd: str) -> str:
+    m = re.search(r'(mening\s+)?(.+?)\s+(eslab|yodlab|xotirla)', cmd)
+    if not m:
+        return "Nima eslab qolishimni aytmadingiz"
+    raw = m.group(2).strip().split()
+    key = raw[0]; val = " ".join(raw[1:]) if len(raw)>1 else m.group(2)
+    save_memory(key, val)
+    return f"Eslab qolindi: {key} = {val}"
+
+
+def h_memory_read(cmd: str) -> str:
+    data = get_all_memory()
+    return ("Xotiramda: " + ", ".join(f"{k}: {v}" for k,v in list(data.items())[:5])
+            if data else "Xotiramda hech narsa yo'q")
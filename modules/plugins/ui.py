@@ -0,0 +1,26 @@
+"""
+Plagin: sozlamalar, tarix va dashboard oynalari (tkinter / pywebview)
+"""
+import threading
+
+from modules.tts import speak
+from modules import history
+from modules.animation import (open_settings_window, open_history_window,
+                               open_dashboard_window)
+
+
+def _window(target, said: str, tag: str, cmd: str):
+    threading.Thread(target=target, daemon=True).start()
+    speak(said); history.record(cmd, tag)
+
+
+def h_settings(cmd: str):
+    _window(open_settings_window, "Sozlamalar ochildi", "settings", cmd)
+
+
+def h_history(cmd: str):
+    _window(open_history_window, "Buyruqlar tarixi ochildi", "history", cmd)
+
+
+def h_dashboard(cmd: str):
+    _window(open_dashboard_window, "Dashboard ochildi", "dashboard", cmd)
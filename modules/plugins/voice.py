@@ -0,0 +1,18 @@
+"""
+Plagin: nutqni to'xtatish va fonga o'tish (faqat tts — yengil)
+"""
+from modules.command_router import cancel_pending
+from modules.tts import speak, stop_speaking
+from modules import history
+
+
+def h_stop(cmd: str):
+    cancel_pending()
+    speak("Xop, fonga o'tdim. Kerak bo'lsa chaqiring.")
+    history.record(cmd, "BACKGROUND")
+    return False
+
+
+def h_stop_speaking(cmd: str):
+    cancel_pending()             # Kelayotgan javoblar ham aytilmasin
+    stop_speaking(); history.record(cmd, "STOP")
@@ -0,0 +1,156 @@
+"""
+JARVIS — Qisman transkript bo'yicha spekulyativ prefetch
+
+"Samarqandda ob-havo" — avval STT yakuniy natijasi kelgunicha kutilar,
+OpenWeather so'rovi undan keyin boshlanardi. Endi stt gapning boshini
+(PARTIAL_SEC audio) fonda alohida taniydi va matnni shu yerga beradi:
+
+  • needs_realtime() kategoriyasi weather/currency/news bo'lsa va ishonchli
+    bo'lsa — kuchli kalit so'z bor, boshqa jadval (intent, tizim, sayt,
+    ilova) urilmagan — handler ishlatadigan o'sha fetch funksiyasi fonda
+    chaqiriladi va smart_cache ni isitadi
+  • yakuniy buyruq settle() ga beriladi: kaliti mos prefetch — foydali,
+    qolganlari (yoki TTL ichida buyruq kelmagani) — behuda
+  • handler o'sha kesh kalitini so'raydi: so'rov tugagan bo'lsa — hit,
+    hali ketayotgan bo'lsa — single-flight orqali o'shani kutadi
+
+"soat" (mahalliy), "xabar yubor" (xabar — yangilik emas), "eslab qol
+mashinam qora" (intent bilan to'qnashuv) — prefetch qilinmaydi.
+
+Foydalanish:
+    from modules.prefetch import prefetcher
+    prefetcher.feed("samarqandda ob-havo")     # qisman transkript
+    prefetcher.settle(["samarqandda ob-havo qanday"])
+    prefetcher.stats()  → {started, used, wasted, skipped, failed, pending}
+"""
+import time
+import threading
+from typing import Callable, Iterable, NamedTuple, Optional
+
+from modules.core import executor, run_as_background
+from modules.logger import logger
+
+# Qisman matnda shu so'zlardan biri bo'lmasa — kategoriya ishonchsiz
+# ("havo", "kurs", "xabar", "qor" yolg'iz — boshqa ma'noda ham keladi)
+_STRONG = {
+    "weather":  ("ob-havo", "harorat", "yomg'ir"),
+    "currency": ("dollar", "euro", "evro", "rubl", "valyuta", "tenge", "lira", "yuan"),
+    "news":     ("yangilik", "news"),
+}
+_OTHER_TABLES = ("intent", "system", "site", "app")
+_TTL = 20.0        # Shu vaqtda yakuniy buyruq kelmasa — behuda
+
+
+class Fetch(NamedTuple):
+    key  : str                   # "weather:samarqand" — handler so'raydigan ma'lumot
+    fn   : Callable
+    args : tuple
+
+
+def plan_fetch(text: str) -> Optional[Fetch]:
+    """Normallangan matn → fetch (kategoriya ishonchli bo'lsa), aks holda None"""
+    fetch = fetch_for(text)
+    if fetch is None:
+        return None
+    from modules.nlu import scan_keywords
+    hits = scan_keywords(text)
+    if any(t in hits for t in _OTHER_TABLES):
+        return None
+    category = fetch.key.split(":", 1)[0]
+    if not any(w in text for w in _STRONG[category]):
+        return None
+    return fetch
+
+
+def fetch_for(text: str) -> Optional[Fetch]:
+    """Buyruq handler'i so'raydigan ma'lumot (ishonch tekshirilmaydi)"""
+    from modules.nlu import needs_realtime
+    category = needs_realtime(text)
+    if category == "weather":
+        from modules.plugins.info import weather_city, get_weather
+        city = weather_city(text)
+        return Fetch(f"weather:{city.lower()}", get_weather, (city,))
+    if category == "currency":
+        from modules.slots import extract
+        from modules.web_services import get_currency_rate
+        pair = extract(text).currency_pair
+        if not pair:
+            return None
+        return Fetch(f"currency:{pair[0]}", get_currency_rate, pair)
+    if category == "news":
+        from modules.plugins.info import news_topic
+        from modules.web_services import get_news_rss
+        topic = news_topic(text)
+        return Fetch(f"news:{topic or ''}", get_news_rss, (topic,))
+    return None
+
+
+class Prefetcher:
+    """Boshlangan prefetch lar va ularning taqdiri (foydali / behuda)"""
+
+    def __init__(self, planner: Callable[[str], Optional[Fetch]] = plan_fetch,
+                 ttl: float = _TTL):
+        self._plan    = planner
+        self._ttl     = ttl
+        self._pending : dict[str, float] = {}          # kalit → boshlangan vaqt
+        self._stats   = {"started": 0, "used": 0, "wasted": 0,
+                         "skipped": 0, "failed": 0}
+        self._lock    = threading.Lock()
+
+    def feed(self, text: str) -> Optional[str]:
+        """Qisman transkript → fonda fetch; boshlangan (yoki allaqachon ketayotgan) kalit"""
+        from modules.nlu import normalize_text
+        fetch = self._plan(normalize_text(text)) if text else None
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            if fetch is None:
+                self._stats["skipped"] += 1
+                return None
+            if fetch.key in self._pending:
+                return fetch.key
+            self._pending[fetch.key] = now
+            self._stats["started"] += 1
+        logger.info(f"PREFETCH: {text} → {fetch.key}")
+        executor.submit(run_as_background, self._run, fetch)
+        return fetch.key
+
+    def settle(self, cmds: Iterable[str]):
+        """Yakuniy buyruq(lar): mos prefetch — foydali, qolgan hammasi — behuda"""
+        with self._lock:
+            if not self._pending:
+                return
+        wanted = set()
+        for cmd in cmds:
+            fetch = fetch_for(cmd)
+            if fetch:
+                wanted.add(fetch.key)
+        with self._lock:
+            for key in self._pending:
+                self._stats["used" if key in wanted else "wasted"] += 1
+            self._pending.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            self._expire(time.monotonic())
+            return dict(self._stats, pending=len(self._pending))
+
+    # ── Ichki ─────────────────────────────────────────────
+    def _run(self, fetch: Fetch):
+        try:
+            fetch.fn(*fetch.args)           # Natija smart_cache da qoladi
+        except Exception as e:
+            with self._lock:
+                self._stats["failed"] += 1
+            logger.warning(f"Prefetch {fetch.key}: {e}")
+
+    def _expire(self, now: float):
+        """Lock ichida: TTL dan o'tganlar — yakuniy buyruq kelmadi, behuda"""
+        for key, t0 in list(self._pending.items()):
+            if now - t0 > self._ttl:
+                del self._pending[key]
+                self._stats["wasted"] += 1
+
+
+# ── Singleton ─────────────────────────────────────────────
+prefetcher = Prefetcher()
@@ -3,15 +3,30 @@ JARVIS — Eslatmalar (Reminder) moduli
 
 Foydalanish:
   set_reminder(seconds=1800, message="Choy iching", speak_fn=speak)
+  set_recurring(parse_recurrence("har kuni soat 9 da"), "Dori ich", speak)
   list_reminders()   → [(id, vaqt_qoldi, xabar), ...]
   cancel_reminder(id)
+  load_reminders(speak_fn=speak)   → ishga tushganda bir marta
+
+Saqlash: data/reminders.jsonl — append-only jurnal (WAL).
+  {"op": "add", "id": 3, "at": 1760000000.0, "msg": "..."}
+  {"op": "add", "id": 4, "at": ..., "msg": "...", "rule": "cron 0 9 * * *"}
+  {"op": "del", "id": 3}
+Har bir o'zgarish bitta qator qo'shadi, butun fayl qayta yozilmaydi.
+Keraksiz qatorlar ko'payganda jurnal siqiladi (compaction).
 """
+import json
+import os
 import re
 import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Callable, Optional
 
+from modules.scheduler import Recurrence, scheduler
+from modules.slots     import extract
+from modules.numwords  import is_number_word, parse_number
+
 try:
     from win10toast import ToastNotifier
     _TOAST = ToastNotifier()
@@ -19,11 +34,100 @@ try:
 except ImportError:
     TOAST_OK = False
 
-# Faol eslatmalar: {id: {"timer": Timer, "msg": str, "fire_at": datetime}}
+_BASE     = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_DATA_DIR = os.path.join(_BASE, "data")      # Birinchi yozishda yaratiladi (_append)
+
+REMINDERS_FILE = os.path.join(_DATA_DIR, "reminders.jsonl")
+_COMPACT_MIN   = 200     # Shundan kam qatorli jurnal siqilmaydi
+
+# Faol eslatmalar: {id: {"msg": str, "fire_at": datetime, "rule": Recurrence|None}}
+# Vaqt bo'yicha navbat — scheduler da (bitta thread, min-heap)
 _reminders: dict[int, dict] = {}
 _lock = threading.Lock()
 _next_id = 1
 
+_wal       = None   # Ochiq jurnal fayli (append rejimi)
+_wal_lines = 0
+_loaded    = False
+
+
+# ── Jurnal (WAL) ─────────────────────────────────────────────────────
+def _record(entry: dict) -> dict:
+    """Lock ostida: xotiradagi yozuv → jurnal qatori"""
+    rec = {"op": "add", "id": entry["id"],
+           "at": entry["fire_at"].timestamp(), "msg": entry["msg"]}
+    if entry.get("rule"):
+        rec["rule"] = entry["rule"].spec
+    return rec
+
+
+def _append(rec: dict):
+    """Lock ostida: bitta qator qo'shish, kerak bo'lsa siqish"""
+    global _wal, _wal_lines
+    try:
+        if _wal is None:
+            os.makedirs(os.path.dirname(REMINDERS_FILE), exist_ok=True)
+            _wal = open(REMINDERS_FILE, "a", encoding="utf-8")
+        _wal.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        _wal.flush()
+        _wal_lines += 1
+    except OSError as e:
+        from modules.logger import logger
+        logger.error(f"Eslatma jurnali: {e}")
+        return
+    if _wal_lines > _COMPACT_MIN and _wal_lines > 2 * len(_reminders):
+        _compact()
+
+
+def _compact():
+    """Lock ostida: faqat tirik eslatmalarni yangi faylga yozib almashtirish"""
+    global _wal, _wal_lines
+    tmp = REMINDERS_FILE + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(REMINDERS_FILE), exist_ok=True)
+        with open(tmp, "w", encoding="utf-8") as f:
+            for entry in _reminders.values():
+                f.write(json.dumps(_record(entry), ensure_ascii=False) + "\n")
+        if _wal:
+            _wal.close()
+            _wal = None
+        os.replace(tmp, REMINDERS_FILE)
+        _wal_lines = len(_reminders)
+    except OSError as e:
+        from modules.logger import logger
+        logger.error(f"Eslatma jurnalini siqib bo'lmadi: {e}")
+
+
+def _arm(rid: int, fire_ts: float, message: str,
+         speak_fn: Optional[Callable], rule: Optional[Recurrence] = None):
+    """Lock ostida: xotiraga, jurnalga va scheduler ga yozish"""
+    _reminders[rid] = {
+        "id": rid,
+        "msg": message,
+        "fire_at": datetime.fromtimestamp(fire_ts),
+        "rule": rule,
+    }
+    _append(_record(_reminders[rid]))
+    scheduler.schedule(("reminder", rid), fire_ts,
+                       _fire, rid, message, speak_fn)
+
+
+def _fire(rid: int, message: str, speak_fn: Optional[Callable] = None):
+    """Scheduler thread idan chaqiriladi"""
+    with _lock:
+        entry = _reminders.pop(rid, None)
+        if entry is None:
+            return                          # Bekor qilingan
+        rule = entry["rule"]
+        nxt  = rule.next_after(entry["fire_at"].timestamp()) if rule else None
+        if nxt is not None and nxt <= time.time():
+            nxt = rule.next_after(time.time())   # Uyqudan keyin — o'tkazib yuborish
+        if nxt is None:
+            _append({"op": "del", "id": rid})
+        else:
+            _arm(rid, nxt, message, speak_fn, rule)
+    _notify(message, speak_fn)
+
 
 def _notify(message: str, speak_fn: Optional[Callable] = None):
     """Eslatma vaqti kelganda chaqiriladi"""
@@ -56,47 +160,120 @@ def set_reminder(seconds: int, message: str,
     Returns: eslatma ID si
     """
     global _next_id
-    rid = _next_id
-    _next_id += 1
-
-    fire_at = datetime.now() + timedelta(seconds=seconds)
-    timer = threading.Timer(seconds, _notify, args=(message, speak_fn))
-    timer.daemon = True
+    fire_ts = time.time() + seconds
 
     with _lock:
-        _reminders[rid] = {
-            "timer": timer,
-            "msg": message,
-            "fire_at": fire_at
-        }
+        rid = _next_id
+        _next_id += 1
+        _arm(rid, fire_ts, message, speak_fn)
+    return rid
+
 
-    timer.start()
+def set_recurring(rule: Recurrence, message: str,
+                  speak_fn: Optional[Callable] = None) -> Optional[int]:
+    """
+    Takroriy eslatma. Keyingi vaqt har safar qoidadan hisoblanadi.
+    Returns: eslatma ID si (qoida hech qachon ishlamasa — None)
+    """
+    global _next_id
+    fire_ts = rule.next_after(time.time())
+    if fire_ts is None:
+        return None
+
+    with _lock:
+        rid = _next_id
+        _next_id += 1
+        _arm(rid, fire_ts, message, speak_fn, rule)
     return rid
 
 
 def cancel_reminder(rid: int) -> bool:
     with _lock:
-        if rid in _reminders:
-            _reminders[rid]["timer"].cancel()
-            del _reminders[rid]
-            return True
-    return False
+        if rid not in _reminders:
+            return False
+        del _reminders[rid]
+        _append({"op": "del", "id": rid})
+    scheduler.cancel(("reminder", rid))
+    return True
+
+
+def load_reminders(speak_fn: Optional[Callable] = None) -> int:
+    """
+    Ishga tushganda jurnalni bir o'qishda tiklash.
+    Kelajakdagilar qayta rejalashtiriladi, o'tib ketganlar bitta
+    "catch-up" bildirishnomada aytiladi.
+    Returns: o'tkazib yuborilgan eslatmalar soni
+    """
+    global _next_id, _loaded
+    with _lock:
+        if _loaded:
+            return 0
+        _loaded = True
+        try:
+            with open(REMINDERS_FILE, "r", encoding="utf-8") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return 0
+
+        live: dict[int, dict] = {}
+        for line in raw.splitlines():
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue          # Yiqilish paytida chala yozilgan qator
+            if rec.get("op") == "add":
+                live[rec["id"]] = rec
+            elif rec.get("op") == "del":
+                live.pop(rec.get("id"), None)
+            _next_id = max(_next_id, int(rec.get("id", 0)) + 1)
+
+        now    = time.time()
+        missed = []
+        for rid, rec in sorted(live.items(), key=lambda kv: kv[1]["at"]):
+            at   = rec["at"]
+            rule = None
+            if rec.get("rule"):
+                try:
+                    rule = Recurrence.from_spec(rec["rule"])
+                except ValueError:
+                    continue
+            if at <= now:
+                missed.append(rec["msg"])
+                at = rule.next_after(now) if rule else None
+                if at is None:
+                    continue
+            _reminders[rid] = {
+                "id": rid,
+                "msg": rec["msg"],
+                "fire_at": datetime.fromtimestamp(at),
+                "rule": rule,
+            }
+            scheduler.schedule(("reminder", rid), at,
+                               _fire, rid, rec["msg"], speak_fn)
+        _compact()
+
+    if missed:
+        _notify("O'tkazib yuborilgan: " + "; ".join(missed), speak_fn)
+    return len(missed)
 
 
 def list_reminders() -> list[tuple[int, int, str]]:
-    """[(id, sekundlar_qoldi, xabar), ...]"""
-    now = datetime.now()
+    """
+    [(id, sekundlar_qoldi, xabar), ...]
+    scheduler.pending() vaqt bo'yicha tartiblab beradi.
+    """
+    now = time.time()
     rows: list[tuple[int, int, str]] = []
 
     with _lock:
-        for rid, info in list(_reminders.items()):
-            diff = (info["fire_at"] - now).total_seconds()
+        for (kind, rid), fire_ts in scheduler.pending():
+            if kind != "reminder" or rid not in _reminders:
+                continue
+            diff = fire_ts - now
             if diff > 0:
-                rows.append((rid, int(diff), info["msg"]))
-            else:
-                del _reminders[rid]  # O'tib ketgan
+                rows.append((rid, int(diff), _reminders[rid]["msg"]))
 
-    return sorted(rows, key=lambda x: x[1])
+    return rows
 
 
 def format_time_left(seconds: int) -> str:
@@ -118,38 +295,102 @@ def parse_duration(cmd: str) -> Optional[int]:
     "30 daqiqadan keyin" → 1800
     "2 soatdan keyin"    → 7200
     "45 sekunddan keyin" → 45
+    "1 soat 30 daqiqadan" → 5400
     "ertaga soat 9 da"   → soniyalar soni (bugundan)
     None → topa olmadi
     """
+    return extract(cmd).seconds()
+
+
+_WEEKDAYS = {
+    "dushanba": 0, "seshanba": 1, "chorshanba": 2, "payshanba": 3,
+    "juma": 4, "shanba": 5, "yakshanba": 6,
+}
+_UNITS = {"soniya": 1, "sekund": 1, "daqiqa": 60, "minut": 60, "soat": 3600}
+
+_RE_CRON   = re.compile(r"cron\s+(\S+\s+\S+\s+\S+\s+\S+\s+\S+)")
+# "har 30 daqiqada", "har o'n besh daqiqada", "har yarim soatda"
+_RE_EVERY  = re.compile(r"\bhar\s+((?:[\w',.]+\s+){0,4}?)(soniya|sekund|daqiqa|minut|soat)\w*")
+_RE_CLOCK  = re.compile(r"(?:soat\s+(\d{1,2})(?::(\d{2}))?|\b(\d{1,2}):(\d{2}))")
+_RE_DAY    = re.compile(r"\b(" + "|".join(_WEEKDAYS) + r")")
+# Eslatma matnidan olib tashlanadigan takrorlash iboralari
+_RE_RECUR_PHRASE = re.compile(
+    r"\bhar\s+(?:ish\s+)?kuni\b|\bish\s+kunlari\b|\bdam\s+olish\s+kunlari\b"
+    r"|\bhar\s+(?:" + "|".join(_WEEKDAYS) + r")\w*"
+    r"|\b(?:" + "|".join(_WEEKDAYS) + r")(?:\s*(?:,|va)\s*(?:" + "|".join(_WEEKDAYS)
+    + r"))*\s+kunlari\b"
+    r"|" + _RE_CRON.pattern,
+    re.IGNORECASE,
+)
+
+
+def _every(cmd: str) -> Optional[tuple[int, int, int]]:
+    """'har N birlik' → (soniyalar, boshi, oxiri); N raqam yoki so'z bilan, bo'lmasa 1"""
+    for m in _RE_EVERY.finditer(cmd):
+        count = m.group(1).split()
+        if count and not all(w.isdigit() or is_number_word(w) for w in count):
+            continue                        # "har kuni soat 9 da" — bu davriy emas
+        n = parse_number(m.group(1)) if count else 1
+        if n:
+            return int(n * _UNITS[m.group(2)]), m.start(), m.end()
+    return None
+
+
+def _strip_recurrence(text: str) -> str:
+    """Eslatma matnidan takrorlash iboralarini olib tashlash"""
+    text = _RE_RECUR_PHRASE.sub("", text)
+    m = _every(text.lower())
+    return text[:m[1]] + text[m[2]:] if m else text
+
+
+def parse_recurrence(cmd: str) -> Optional[Recurrence]:
+    """
+    Takroriy jadvalni bir marta qoida obyektiga aylantirish.
+    "har 30 daqiqada"              → every 1800
+    "har o'n besh daqiqada"        → every 900
+    "har kuni soat 9 da"           → cron 0 9 * * *
+    "ish kunlari soat 8:30 da"     → cron 30 8 * * 1,2,3,4,5
+    "har dushanba soat 10 da"      → cron 0 10 * * 1
+    "cron 0 9 * * 1-5"             → o'zi
+    None → takrorlanuvchi emas
+    """
     cmd = cmd.lower()
 
-    # "soat X da" — absolyut vaqt
-    m = re.search(r"soat\s+(\d{1,2})(?::(\d{2}))?\s*da", cmd)
+    m = _RE_CRON.search(cmd)
     if m:
-        target_h = int(m.group(1))
-        target_m = int(m.group(2) or 0)
-        now = datetime.now()
-        target = now.replace(hour=target_h, minute=target_m, second=0, microsecond=0)
-        if target <= now:
-            target += timedelta(days=1)  # Ertaga
-        return int((target - now).total_seconds())
-
-    # Nisbiy vaqt
-    patterns = [
-        (r"(\d+)\s*soat", 3600),
-        (r"(\d+)\s*daqiqa", 60),
-        (r"(\d+)\s*soniya", 1),
-        (r"(\d+)\s*minut", 60),
-        (r"(\d+)\s*hour", 3600),
-        (r"(\d+)\s*minute", 60),
-        (r"(\d+)\s*second", 1),
-    ]
-    for pattern, multiplier in patterns:
-        m = re.search(pattern, cmd)
-        if m:
-            return int(m.group(1)) * multiplier
+        try:
+            return Recurrence.parse_cron(m.group(1))
+        except ValueError:
+            return None
 
-    return None
+    m = _every(cmd)
+    if m:
+        return Recurrence.every(m[0])
+
+    if re.search(r"\bish\s+kun", cmd):
+        days = [0, 1, 2, 3, 4]
+    elif re.search(r"\bdam\s+olish\s+kun", cmd):
+        days = [5, 6]
+    elif re.search(r"\bhar\s+kuni\b", cmd):
+        days = None
+    else:
+        found = [_WEEKDAYS[d] for d in _RE_DAY.findall(cmd)]
+        if not found or not re.search(r"\bhar\b|lari\b", cmd):
+            return None
+        days = found
+
+    clock = extract(cmd).clock                # "soat to'qqizda" ham
+    if clock:
+        hour, minute = clock
+    else:
+        m = _RE_CLOCK.search(cmd)
+        if not m:
+            return None
+        hour   = int(m.group(1) or m.group(3))
+        minute = int(m.group(2) or m.group(4) or 0)
+    if hour > 23 or minute > 59:
+        return None
+    return Recurrence.daily(hour, minute, days)
 
 
 def parse_reminder_message(cmd: str) -> str:
@@ -180,25 +421,14 @@ def parse_reminder_message(cmd: str) -> str:
 
             if candidate:
                 # vaqt qismlarini tozalab beramiz
-                candidate = re.sub(
-                    r"\d+\s*(soat|daqiqa|soniya|minut|hour|minute|second)dan?\s*keyin",
-                    "",
-                    candidate,
-                    flags=re.IGNORECASE
-                )
-                candidate = re.sub(r"soat\s+\d{1,2}(:\d{2})?\s*da", "", candidate, flags=re.IGNORECASE)
+                candidate = _strip_recurrence(candidate)
+                candidate = extract(candidate).without_time()
                 candidate = re.sub(r"\b(keyin)\b", "", candidate, flags=re.IGNORECASE)
                 return candidate.strip(" ,.-") or "Eslatma!"
 
     # 2) Trigger bo'lmasa: vaqt qismlarini olib tashlash
-    cleaned = original
-    cleaned = re.sub(
-        r"\d+\s*(soat|daqiqa|soniya|minut|hour|minute|second)dan?\s*keyin",
-        "",
-        cleaned,
-        flags=re.IGNORECASE
-    )
-    cleaned = re.sub(r"soat\s+\d{1,2}(:\d{2})?\s*da", "", cleaned, flags=re.IGNORECASE)
+    cleaned = _strip_recurrence(original)
+    cleaned = extract(cleaned).without_time()
 
     # 3) Keywordlarni olib tashlash (qo'y / qoy / eslatma...)
     cleaned = re.sub(
@@ -0,0 +1,289 @@
+"""
+JARVIS — Rejalashtiruvchi (Scheduler)
+
+Bitta timer thread + min-heap. Har bir eslatma uchun alohida
+threading.Timer ochilmaydi — 10 000 ta kutilayotgan vazifa ham
+bitta OS thread da turadi.
+
+Foydalanish:
+    from modules.scheduler import scheduler
+
+    scheduler.schedule("r1", time.time() + 30, speak, "Choy iching")
+    scheduler.cancel("r1")
+    scheduler.pending()   → [(key, fire_at), ...]  (vaqt bo'yicha tartiblangan)
+
+Takroriy vazifalar uchun Recurrence:
+    rule = Recurrence.parse_cron("30 9 * * 1-5")   # ish kunlari 09:30
+    rule.next_after(time.time())                   → keyingi vaqt (epoch)
+"""
+import heapq
+import itertools
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Callable, Hashable, Optional
+
+from modules.logger import logger
+
+
+class Scheduler:
+    """
+    heap  — timer thread uchun: eng yaqin vazifa doim [0] da, O(log n) push/pop
+    _jobs — key → heap yozuvi; pending() tartibni faqat so'ralganda quradi
+            (UI uchun), issiq yo'lda ro'yxat siljitilmaydi
+    Bekor qilish: heap yozuvi "o'lik" deb belgilanadi (lazy delete),
+    o'liklar yarmidan oshsa heap siqiladi.
+    """
+    _MAX_WAIT = 30.0    # Soat o'zgarsa (uyqu, NTP) qayta tekshirish uchun
+
+    def __init__(self, name: str = "jarvis-scheduler"):
+        self._name   = name
+        self._heap   : list[list] = []
+        self._jobs   : dict[Hashable, list] = {}
+        self._seq    = itertools.count()
+        self._dead   = 0
+        self._cond   = threading.Condition(threading.Lock())
+        self._thread : Optional[threading.Thread] = None
+        self._running = True
+
+    # ── Public API ────────────────────────────────────────
+    def schedule(self, key: Hashable, fire_at: float,
+                 fn: Callable, *args: Any) -> Hashable:
+        """
+        fire_at — time.time() formatidagi absolyut vaqt.
+        Shu key bilan vazifa bo'lsa — almashtiriladi.
+        """
+        with self._cond:
+            if key in self._jobs:
+                self._remove(key)
+            entry = [fire_at, next(self._seq), key, fn, args, True]
+            heapq.heappush(self._heap, entry)
+            self._jobs[key] = entry
+            self._ensure_thread()
+            # Yangi vazifa eng yaqini bo'lsa — threadni uyg'otish
+            if self._heap[0] is entry:
+                self._cond.notify()
+        return key
+
+    def cancel(self, key: Hashable) -> bool:
+        with self._cond:
+            if key not in self._jobs:
+                return False
+            self._remove(key)
+            return True
+
+    def fire_at(self, key: Hashable) -> Optional[float]:
+        with self._cond:
+            entry = self._jobs.get(key)
+            return entry[0] if entry else None
+
+    def pending(self) -> list[tuple[Hashable, float]]:
+        """[(key, fire_at), ...] — fire_at bo'yicha o'sish tartibida"""
+        with self._cond:
+            live = sorted(self._jobs.values(), key=lambda e: (e[0], e[1]))
+        return [(e[2], e[0]) for e in live]
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._jobs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._cond:
+            return key in self._jobs
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+
+    # ── Ichki ─────────────────────────────────────────────
+    def _remove(self, key: Hashable):
+        """Lock ostida chaqiriladi"""
+        entry = self._jobs.pop(key)
+        entry[5] = False
+        self._dead += 1
+        if self._dead > 64 and self._dead * 2 > len(self._heap):
+            self._heap = [e for e in self._heap if e[5]]
+            heapq.heapify(self._heap)
+            self._dead = 0
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=self._name,
+                                            daemon=True)
+            self._thread.start()
+
+    def _pop_due(self, now: float) -> list[list]:
+        """Lock ostida: vaqti kelgan barcha tirik vazifalarni olish"""
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if not entry[5]:
+                self._dead -= 1
+                continue
+            entry[5] = False
+            del self._jobs[entry[2]]
+            due.append(entry)
+        return due
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._running:
+                    return
+                due = self._pop_due(time.time())
+                if not due:
+                    while self._heap and not self._heap[0][5]:
+                        heapq.heappop(self._heap)
+                        self._dead -= 1
+                    wait = (self._heap[0][0] - time.time()
+                            if self._heap else None)
+                    self._cond.wait(self._MAX_WAIT if wait is None
+                                    else min(max(wait, 0.0), self._MAX_WAIT))
+                    continue
+            # Callback lar lock tashqarisida — ular qayta schedule qilishi mumkin
+            for _, _, key, fn, args, _ in due:
+                try:
+                    fn(*args)
+                except Exception as e:
+                    logger.error(f"Scheduler [{key}]: {e}")
+
+
+# ══════════════════════════════════════════════════════════
+#  RECURRENCE — takroriy qoida
+# ══════════════════════════════════════════════════════════
+class Recurrence:
+    """
+    Ikki xil qoida:
+      every — har N soniyada        (spec: "every 1800")
+      cron  — 5 maydonli cron ifoda (spec: "cron 30 9 * * 1-5")
+    "har kuni 09:30" va "ish kunlari" ham cron ga keltiriladi.
+
+    Keyingi vaqt oldingisidan hisoblanadi: cron maydonlari bo'yicha
+    sakrab o'tiladi (oy → kun → soat → daqiqa), kalendar daqiqama-daqiqa
+    skanerlanmaydi.
+    """
+    __slots__ = ("interval", "minutes", "hours", "days", "months", "dows",
+                 "_dom_any", "_dow_any", "_spec")
+
+    _FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))   # dow: 0 va 7 — yakshanba
+    _LIMIT  = 5 * 366     # Imkonsiz ifoda (31-fevral) uchun chegara
+
+    def __init__(self, interval: Optional[float] = None,
+                 fields: Optional[list[tuple[int, ...]]] = None,
+                 spec: str = ""):
+        self.interval = interval
+        self._spec    = spec
+        if fields:
+            self.minutes, self.hours, self.days, self.months, self.dows = fields
+            self._dom_any = len(self.days) == 31
+            self._dow_any = len(self.dows) == 7
+
+    # ── Konstruktorlar ───────────────────────────────────
+    @classmethod
+    def every(cls, seconds: float) -> "Recurrence":
+        if seconds <= 0:
+            raise ValueError("Interval musbat bo'lishi kerak")
+        return cls(interval=float(seconds), spec=f"every {seconds:g}")
+
+    @classmethod
+    def daily(cls, hour: int, minute: int = 0,
+              weekdays: Optional[list[int]] = None) -> "Recurrence":
+        """weekdays — Python weekday() (dushanba=0); None → har kuni"""
+        dow = ("*" if weekdays is None
+               else ",".join(str((d + 1) % 7) for d in sorted(set(weekdays))))
+        return cls.parse_cron(f"{minute} {hour} * * {dow}")
+
+    @classmethod
+    def parse_cron(cls, expr: str) -> "Recurrence":
+        parts = expr.split()
+        if len(parts) != 5:
+            raise ValueError(f"Cron 5 maydondan iborat bo'lishi kerak: {expr!r}")
+        fields = [cls._parse_field(p, lo, hi)
+                  for p, (lo, hi) in zip(parts, cls._FIELDS)]
+        return cls(fields=fields, spec="cron " + " ".join(parts))
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "Recurrence":
+        kind, _, rest = spec.partition(" ")
+        if kind == "every":
+            return cls.every(float(rest))
+        if kind == "cron":
+            return cls.parse_cron(rest)
+        raise ValueError(f"Noma'lum qoida: {spec!r}")
+
+    @staticmethod
+    def _parse_field(field: str, lo: int, hi: int) -> tuple[int, ...]:
+        values: set[int] = set()
+        for part in field.split(","):
+            rng, _, step = part.partition("/")
+            if rng == "*":
+                a, b = lo, hi
+            elif "-" in rng:
+                a, b = (int(x) for x in rng.split("-", 1))
+            else:
+                a = b = int(rng)
+                if step:
+                    b = hi
+            if not (lo <= a <= hi and lo <= b <= hi and a <= b):
+                raise ValueError(f"Cron maydoni chegaradan tashqarida: {field!r}")
+            if step and not (step.isdigit() and int(step) > 0):
+                raise ValueError(f"Cron qadami musbat butun son bo'lishi kerak: {field!r}")
+            values.update(range(a, b + 1, int(step) if step else 1))
+        if hi == 7:
+            values = {v % 7 for v in values}
+        return tuple(sorted(values))
+
+    # ── Hisoblash ────────────────────────────────────────
+    @property
+    def spec(self) -> str:
+        return self._spec
+
+    def next_after(self, ts: float) -> Optional[float]:
+        """ts dan keyingi birinchi ishga tushish vaqti (epoch); topilmasa None"""
+        if self.interval is not None:
+            return ts + self.interval
+        t = (datetime.fromtimestamp(ts).replace(second=0, microsecond=0)
+             + timedelta(minutes=1))
+        for _ in range(self._LIMIT * 4):
+            if t.month not in self.months:
+                i = bisect_right(self.months, t.month)
+                year = t.year + (i == len(self.months))
+                t = datetime(year, self.months[i % len(self.months)], 1)
+                continue
+            if not self._day_ok(t):
+                t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                continue
+            if t.hour not in self.hours:
+                i = bisect_right(self.hours, t.hour)
+                if i == len(self.hours):
+                    t = datetime(t.year, t.month, t.day) + timedelta(days=1)
+                else:
+                    t = t.replace(hour=self.hours[i], minute=0)
+                continue
+            if t.minute not in self.minutes:
+                i = bisect_right(self.minutes, t.minute)
+                if i == len(self.minutes):
+                    t = t.replace(minute=0) + timedelta(hours=1)
+                else:
+                    t = t.replace(minute=self.minutes[i])
+                continue
+            return t.timestamp()
+        return None
+
+    def _day_ok(self, t: datetime) -> bool:
+        dom = t.day in self.days
+        dow = (t.weekday() + 1) % 7 in self.dows
+        # Cron qoidasi: ikkalasi ham cheklangan bo'lsa — YOKI
+        if not self._dom_any and not self._dow_any:
+            return dom or dow
+        return dom and dow
+
+    def __repr__(self) -> str:
+        return f"Recurrence({self._spec!r})"
+
+
+# ── Singleton ─────────────────────────────────────────────
+scheduler = Scheduler()
@@ -0,0 +1,303 @@
+"""
+JARVIS — Slot ajratuvchi (bitta o'tish)
+
+Har bir handler o'z regex lari bilan buyruqni qayta-qayta titkilardi:
+parse_duration, parse_currency_cmd, parse_translate_cmd, control_volume,
+task_done, oyna nomlari... Endi normallangan buyruq bir marta tokenlarga
+bo'linadi va bitta chiziqli o'tishda turlangan slotlar chiqadi:
+
+  duration   — nisbiy vaqt, soniyada ("1 soat 30 daqiqadan keyin" → 5400)
+  clock      — soat vaqti (soat, daqiqa) ("soat 9:30 da" → (9, 30))
+  amount     — birinchi erkin son (float) ("1 000 so'm" → 1000.0)
+  currencies — valyuta kodlari, uchragan tartibda; currency_pair — (dan, ga)
+  languages  — til kodlari, uchragan tartibda
+  app        — config.APPS dagi ilova/oyna nomi
+  number     — birinchi erkin butun son ("3-vazifa", "uchinchi vazifa" → 3)
+
+Sonlar so'z bilan ham bo'lishi mumkin ("o'n besh daqiqa", "ovozni ellikka",
+"пять минут") — modules/numwords.py tokenlash paytida ularni songa aylantiradi.
+
+Natija buyruq bo'yicha keshlanadi — bir buyruqni bir nechta handler
+so'rasa ham tahlil bir marta bo'ladi.
+
+Foydalanish:
+    from modules.slots import extract
+    s = extract("100 dollar necha so'm")
+    s.amount, s.currency_pair      → 100.0, ("USD", "UZS")
+"""
+import re
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Optional
+
+from modules.numwords import read_number, scale_of
+
+# ══════════════════════════════════════════════════════════
+#  LUG'ATLAR
+# ══════════════════════════════════════════════════════════
+# Til → valyuta kodi xaritasi
+CURRENCY_NAMES = {
+    "dollar": "USD", "usd": "USD", "amerikan": "USD",
+    "euro": "EUR", "evro": "EUR", "yevro": "EUR",
+    "rub": "RUB", "rubl": "RUB", "rossiya": "RUB",
+    "som": "UZS", "so'm": "UZS", "uzs": "UZS",
+    "tenge": "KZT", "kazak": "KZT",
+    "lira": "TRY", "turk": "TRY",
+    "yuan": "CNY", "xitoy": "CNY",
+    "pound": "GBP", "funt": "GBP", "britaniya": "GBP",
+    "yen": "JPY", "yapon": "JPY",
+    "dirham": "AED", "arab": "AED",
+}
+
+LANG_MAP = {
+    "ingliz": "en", "inglizcha": "en", "english": "en", "en": "en",
+    "o'zbek": "uz", "o'zbekcha": "uz", "uzbek": "uz", "uz": "uz",
+    "rus": "ru", "ruscha": "ru", "russian": "ru", "ru": "ru",
+    "nemis": "de", "nemischa": "de", "german": "de",
+    "fransuz": "fr", "fransuzcha": "fr", "french": "fr",
+    "arab": "ar", "arabcha": "ar", "arabic": "ar",
+    "xitoy": "zh-CN", "xitoycha": "zh-CN", "chinese": "zh-CN",
+    "yapon": "ja", "yaponcha": "ja", "japanese": "ja",
+    "turk": "tr", "turkcha": "tr", "turkish": "tr",
+    "koreys": "ko", "koreyscha": "ko", "korean": "ko",
+    "ispan": "es", "ispancha": "es", "spanish": "es",
+}
+
+# Vaqt birliklari — so'z boshi bo'yicha ("daqiqadan", "soatga", "minutes")
+_UNITS = (("soniya", 1), ("sekund", 1), ("second", 1),
+          ("daqiqa", 60), ("minut", 60),
+          ("soat", 3600), ("hour", 3600), ("chas", 3600))
+
+# Kelishik qo'shimchalari: "dollarga", "evrodan", "so'mni", "inglizchaga"
+_CASES      = ("", "ga", "ka", "ni", "da", "dan", "ning", "i", "si", "lar", "larni")
+_LANG_CASES = _CASES + ("cha", "chaga", "chadan", "chani", "chada", "chasi", "tili", "tiliga")
+# "100 dollarlik", "evrolikni" — qiymat qo'shimchasi
+_CUR_CASES  = _CASES + ("lik", "likni", "likka", "likda", "likdan", "ligi", "ligini")
+
+
+def _forms(table: dict[str, str], cases: tuple[str, ...]) -> dict[str, tuple[str, str]]:
+    """So'z shakli → (kod, qo'shimcha). Ikki harfli kodlar ("en", "ru") faqat o'zi."""
+    out: dict[str, tuple[str, str]] = {}
+    for name, code in sorted(table.items(), key=lambda kv: len(kv[0])):
+        for suf in (cases if len(name) > 2 else ("",)):
+            out[name + suf] = (code, suf)       # Uzunroq nom ustun turadi
+    return out
+
+
+_CURRENCY_FORMS = _forms(CURRENCY_NAMES, _CUR_CASES)
+_LANG_FORMS     = _forms(LANG_MAP, _LANG_CASES)
+
+_CLOCK_MARKERS = ("da", "ga")
+_AFTER_WORDS   = ("keyin", "so'ng", "song")
+_ASK_WORDS     = ("necha", "qancha")           # "necha dollar" — dollar maqsad
+
+# son (+ ":MM") | so'z (apostrof bilan: "so'm", "qo'y")
+_TOKEN = re.compile(r"(\d+(?:[.,]\d+)?)(?::(\d{2}))?|([^\W\d_]+(?:'[^\W\d_]+)*)")
+
+
+# ══════════════════════════════════════════════════════════
+#  SLOTLAR
+# ══════════════════════════════════════════════════════════
+class Slots:
+    """Bitta buyruqning turlangan slotlari (o'zgarmas; keshdan qaytadi)"""
+    __slots__ = ("text", "duration", "clock", "amount", "currencies", "currency_pair",
+                 "languages", "app", "number", "numbers", "_time_spans")
+
+    def __init__(self, text: str):
+        self.text          = text
+        self.duration      : Optional[int] = None
+        self.clock         : Optional[tuple[int, int]] = None
+        self.amount        : Optional[float] = None
+        self.currencies    : tuple[str, ...] = ()
+        self.currency_pair : Optional[tuple[str, str]] = None
+        self.languages     : tuple[str, ...] = ()
+        self.app           : Optional[str] = None
+        self.number        : Optional[int] = None
+        self.numbers       : tuple[float, ...] = ()
+        self._time_spans   : tuple[tuple[int, int], ...] = ()
+
+    @property
+    def language(self) -> Optional[str]:
+        return self.languages[0] if self.languages else None
+
+    def seconds(self, now: Optional[datetime] = None) -> Optional[int]:
+        """Eslatmagacha soniyalar: soat vaqti (o'tib ketgan bo'lsa — ertaga) yoki nisbiy"""
+        if self.clock:
+            now    = now or datetime.now()
+            target = now.replace(hour=self.clock[0], minute=self.clock[1],
+                                 second=0, microsecond=0)
+            if target <= now:
+                target += timedelta(days=1)
+            return int((target - now).total_seconds())
+        return self.duration
+
+    def without_time(self) -> str:
+        """Vaqt iboralari ("30 daqiqadan keyin", "soat 9 da") olib tashlangan matn"""
+        if not self._time_spans:
+            return self.text
+        parts, pos = [], 0
+        for s, e in self._time_spans:
+            parts.append(self.text[pos:s])
+            pos = e
+        parts.append(self.text[pos:])
+        return " ".join("".join(parts).split())
+
+    def as_dict(self) -> dict:
+        """Golden korpus bilan solishtirish uchun (bo'sh slotlar tashlanadi)"""
+        out = {"duration": self.duration, "clock": list(self.clock) if self.clock else None,
+               "amount": self.amount, "currencies": list(self.currencies),
+               "currency_pair": list(self.currency_pair) if self.currency_pair else None,
+               "languages": list(self.languages), "app": self.app, "number": self.number}
+        return {k: v for k, v in out.items() if v not in (None, [])}
+
+    def __repr__(self) -> str:
+        return f"Slots({self.as_dict()})"
+
+
+def _unit(word: str) -> int:
+    for stem, mult in _UNITS:
+        if word.startswith(stem):
+            return mult
+    return 0
+
+
+def _currency_pair(found: list[tuple[str, str]]) -> Optional[tuple[str, str]]:
+    """
+    (kod, rol) ro'yxatidan yo'nalish. "-dan" — manba, "-ga"/"necha X" — maqsad,
+    qolganlari uchragan tartibda bo'sh o'rinlarni to'ldiradi.
+    """
+    if not found:
+        return None
+    src = next((c for c, r in found if r == "src"), None)
+    dst = next((c for c, r in found if r == "dst" and c != src), None)
+    rest = list(dict.fromkeys(c for c, _ in found if c not in (src, dst)))
+    if src is None:
+        src = rest.pop(0) if rest else ("USD" if dst == "UZS" else "UZS")
+    if dst is None:
+        dst = rest.pop(0) if rest else ("USD" if src == "UZS" else "UZS")
+    return src, dst
+
+
+def _num_str(v: float) -> str:
+    return str(int(v)) if v == int(v) else str(v)
+
+
+def _tokens(text: str) -> list[tuple]:
+    """
+    (son, daqiqa, so'z, boshi, oxiri, qo'shimcha). Shu o'tishda:
+      "1 000 000"          → bitta son
+      "o'n besh", "ellikka" → son (qo'shimchasi bilan)
+      "5 ming", "1,5 mln"  → ko'paytirilgan son
+    """
+    raw   = [(m.group(1), m.group(2), m.group(3), m.start(), m.end())
+             for m in _TOKEN.finditer(text)]
+    words = [t[2] or "" for t in raw]
+    n     = len(raw)
+    out   : list[tuple] = []
+    i = 0
+    while i < n:
+        num, mins, word, start, end = raw[i]
+        if word is not None:
+            run = read_number(words, i)
+            # Yakka "bir"/"on" faqat vaqt birligi oldida son: "bir soat"
+            if run and (not run.weak or (run.end < n and _unit(words[run.end]))):
+                out.append((_num_str(run.value), None, None, start, raw[run.end - 1][4],
+                            run.suffix))
+                i = run.end
+                continue
+            out.append((None, None, word, start, end, ""))
+            i += 1
+            continue
+        j = i + 1
+        if not mins and num.isdigit() and len(num) <= 3:
+            while (j < n and raw[j][0] and raw[j][0].isdigit() and len(raw[j][0]) == 3
+                   and not raw[j][1] and text[end:raw[j][3]] == " "):
+                num, end = num + raw[j][0], raw[j][4]
+                j += 1
+        suffix = ""
+        if not mins and j < n and (scale := scale_of(words[j])):
+            num = _num_str(float(num.replace(",", ".")) * scale[0])
+            end, suffix = raw[j][4], scale[1]
+            j += 1
+        out.append((num, mins, None, start, end, suffix))
+        i = j
+    return out
+
+
+@lru_cache(maxsize=512)
+def extract(cmd: str) -> Slots:
+    """Buyruq → Slots. Tokenlar ustida bitta chiziqli o'tish."""
+    text = cmd.lower()
+    s    = Slots(text)
+    toks = _tokens(text)
+    n    = len(toks)
+
+    duration = 0
+    spans    : list[tuple[int, int]] = []
+    numbers  : list[float] = []
+    currency : list[tuple[str, str]] = []
+    langs    : list[str] = []
+    i = 0
+    while i < n:
+        num, mins, word, start, end, suffix = toks[i]
+        nxt = toks[i + 1] if i + 1 < n else None
+
+        if word is not None:
+            # "soat 9 da", "soat 9:30 da" — soat vaqti
+            if word == "soat" and nxt and nxt[0] and "," not in nxt[0] and "." not in nxt[0]:
+                h, m = int(nxt[0]), int(nxt[1] or 0)
+                marker = toks[i + 2] if i + 2 < n else None
+                glued  = nxt[5] in _CLOCK_MARKERS                 # "soat beshda"
+                has_marker = glued or (marker is not None and marker[2] in _CLOCK_MARKERS)
+                if h <= 23 and m <= 59 and (has_marker or nxt[1]):
+                    s.clock = (h, m)
+                    stop = marker[4] if has_marker and not glued else nxt[4]
+                    spans.append((start, stop))
+                    i += 3 if has_marker and not glued else 2
+                    continue
+            hit = _CURRENCY_FORMS.get(word)
+            if hit:
+                code, suf = hit
+                asked = i > 0 and toks[i - 1][2] in _ASK_WORDS
+                role  = ("dst" if asked or suf in ("ga", "ka")
+                         else "src" if suf == "dan" else "")
+                currency.append((code, role))
+            hit = _LANG_FORMS.get(word)
+            if hit and hit[0] not in langs:
+                langs.append(hit[0])
+            i += 1
+            continue
+
+        value = float(num.replace(",", "."))
+
+        # "9:30 da" — soat so'zisiz soat vaqti
+        if mins and nxt and nxt[2] in _CLOCK_MARKERS and value <= 23 and int(mins) <= 59:
+            s.clock = (int(value), int(mins))
+            spans.append((start, nxt[4]))
+            i += 2
+            continue
+
+        # "30 daqiqa(dan keyin)" — nisbiy vaqt, birliklar qo'shiladi
+        mult = _unit(nxt[2]) if nxt and nxt[2] else 0
+        if mult and not mins:
+            duration += int(value * mult)
+            stop, i = nxt[4], i + 2
+            if i < n and toks[i][2] in _AFTER_WORDS:
+                stop, i = toks[i][4], i + 1
+            spans.append((start, stop))
+            continue
+
+        numbers.append(value)
+        i += 1
+
+    from modules.nlu import match_app
+    s.duration      = duration or None
+    s.numbers       = tuple(numbers)
+    s.amount        = numbers[0] if numbers else None
+    s.number        = next((int(v) for v in numbers if v.is_integer()), None)
+    s.currencies    = tuple(dict.fromkeys(c for c, _ in currency))
+    s.currency_pair = _currency_pair(currency)
+    s.languages     = tuple(langs)
+    s.app           = match_app(text)
+    s._time_spans   = tuple(spans)
+    return s
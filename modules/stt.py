@@ -15,7 +15,9 @@ except ImportError:
     sr = None; _recognizer = None; SR_OK = False
 
 from modules.nlu import normalize_text, is_wake_word
-from modules.core import State, state_manager, MicGuard
+from modules.core import State, state_manager, MicGuard, tracer, executor, run_as_background
+
+PARTIAL_SEC = 1.5      # Shuncha audio yig'ilgach — gap boshini fonda tanish (prefetch)
 
 
 def _get_listen_lang():
@@ -23,6 +25,48 @@ def _get_listen_lang():
     return LISTEN_LANG
 
 
+def _partial_enabled() -> bool:
+    from config import PARTIAL_STT
+    return PARTIAL_STT
+
+
+def _recognize_partial(audio):
+    """Gap boshi → prefetcher (xato bo'lsa jim — yakuniy natija baribir keladi)"""
+    t0 = time.monotonic()
+    try:
+        raw = _recognizer.recognize_google(audio, language=_get_listen_lang())
+    except Exception:
+        return
+    tracer.record("listen_command.partial", t0, time.monotonic())
+    from modules.prefetch import prefetcher
+    prefetcher.feed(normalize_text(raw))
+
+
+def _capture(source, timeout: int, phrase_limit: int):
+    """
+    Buyruq audiosi. Oqim rejimida (speech_recognition >= 3.10) PARTIAL_SEC
+    yig'ilishi bilan gap boshi fonda tanishga yuboriladi, yozish davom etadi.
+    """
+    if not _partial_enabled():
+        return _recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_limit)
+    try:
+        stream = _recognizer.listen(source, timeout=timeout,
+                                    phrase_time_limit=phrase_limit, stream=True)
+    except TypeError:                      # Eski versiya — oqim yo'q
+        return _recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_limit)
+
+    rate, width = source.SAMPLE_RATE, source.SAMPLE_WIDTH
+    frames, size, sent = [], 0, False
+    for chunk in stream:
+        frames.append(chunk.frame_data)
+        size += len(chunk.frame_data)
+        if not sent and size >= PARTIAL_SEC * rate * width:
+            sent = True
+            executor.submit(run_as_background, _recognize_partial,
+                            sr.AudioData(b"".join(frames), rate, width))
+    return sr.AudioData(b"".join(frames), rate, width)
+
+
 def listen_command(timeout: int = 7, phrase_limit: int = 10) -> str | None:
     """
     Ovozli buyruq tinglash
@@ -35,20 +79,23 @@ def listen_command(timeout: int = 7, phrase_limit: int = 10) -> str | None:
 
     # Bug #1: Jarvis gapirayotsa kutish
     if state_manager.is_speaking.is_set():
-        state_manager.is_speaking.wait(timeout=5)
+        state_manager.wait_until_not_speaking(timeout=5)
         time.sleep(0.2)
 
+    t0 = time.monotonic()
     try:
         with MicGuard(sr) as source:
             _recognizer.adjust_for_ambient_noise(source, duration=0.1)
-            audio = _recognizer.listen(
-                source,
-                timeout=timeout,
-                phrase_time_limit=phrase_limit
-            )
+            t1 = time.monotonic()
+            tracer.record("listen_command.calibrate", t0, t1)
+            audio = _capture(source, timeout, phrase_limit)
+        t2 = time.monotonic()
+        tracer.record("listen_command.capture", t1, t2)
 
         raw  = _recognizer.recognize_google(audio, language=_get_listen_lang())
+        tracer.record("listen_command.recognize", t2, time.monotonic())
         text = normalize_text(raw)
+        tracer.record("listen_command", t0, time.monotonic())
 
         # Bug #10: juda uzun = ikki kishi gapirgan
         if len(text.split()) > 12:
@@ -82,6 +129,7 @@ def listen_wake_word() -> bool:
     if state_manager.is_speaking.is_set():
         return False
 
+    t0 = time.monotonic()
     try:
         with MicGuard(sr) as source:
             _recognizer.adjust_for_ambient_noise(source, duration=0.15)
@@ -91,6 +139,9 @@ def listen_wake_word() -> bool:
         text = normalize_text(raw)
 
         if is_wake_word(text):
+            # Trace wake word tinglash boshidan boshlanadi
+            tracer.begin(t0)
+            tracer.record("listen_wake_word", t0, time.monotonic())
             state_manager.set(State.LISTENING)
             return True
         return False
@@ -3,6 +3,7 @@ JARVIS — Text-to-Speech
 Dedicated asyncio event loop — shutdown crash yo'q (Bug #asyncio fix)
 """
 import asyncio, threading, time, queue
+from contextlib import contextmanager
 
 try:
     import edge_tts; ET_OK = True
@@ -23,15 +24,16 @@ except ImportError:
 
 # ── Lazy import (circular prevent) ───────────────────────
 def _get_deps():
-    from modules.core import State, state_manager, temp_manager
+    from modules.core import State, state_manager, temp_manager, tracer
     from modules.logger import logger
     from config import EDGE_VOICE
-    return State, state_manager, temp_manager, logger, EDGE_VOICE
+    return State, state_manager, temp_manager, tracer, logger, EDGE_VOICE
 
 
 # ── Dedicated event loop — Bug asyncio fix ───────────────
 _speech_queue = queue.Queue()
 _speech_loop  = asyncio.new_event_loop()
+_collect      = threading.local()     # collect_speech() ichidagi thread lar gaplari
 
 
 async def _tts_async(text: str, voice: str, path: str):
@@ -39,8 +41,8 @@ async def _tts_async(text: str, voice: str, path: str):
     await communicate.save(path)
 
 
-def _do_speak(text: str):
-    State, state_manager, temp_manager, logger, EDGE_VOICE = _get_deps()
+def _do_speak(text: str, trace_id: str | None = None):
+    State, state_manager, temp_manager, tracer, logger, EDGE_VOICE = _get_deps()
 
     print(f"\n🤖 Jarvis: {text}\n")
     logger.info(f"SPEAK: {text}")
@@ -56,13 +58,15 @@ def _do_speak(text: str):
     try:
         tmp = temp_manager.create(".mp3")
         # Bug fix: dedicated loop, asyncio.run() EMAS
-        _speech_loop.run_until_complete(_tts_async(text, EDGE_VOICE, tmp))
+        with tracer.span("tts_synthesis", trace_id, chars=len(text)):
+            _speech_loop.run_until_complete(_tts_async(text, EDGE_VOICE, tmp))
 
-        pygame.mixer.music.load(tmp)
-        pygame.mixer.music.play()
-        while pygame.mixer.music.get_busy():
-            time.sleep(0.05)
-        pygame.mixer.music.unload()
+        with tracer.span("tts_playback", trace_id):
+            pygame.mixer.music.load(tmp)
+            pygame.mixer.music.play()
+            while pygame.mixer.music.get_busy():
+                time.sleep(0.05)
+            pygame.mixer.music.unload()
 
     except Exception as e:
         logger.error(f"TTS xatosi: {e}")
@@ -77,23 +81,43 @@ def _do_speak(text: str):
 def _speak_worker():
     asyncio.set_event_loop(_speech_loop)
     while True:
-        text = _speech_queue.get()
-        if text is None:
+        item = _speech_queue.get()
+        if item is None:
             break
-        _do_speak(text)
+        _do_speak(*item)
         _speech_queue.task_done()
 
 
 # ── Public API ────────────────────────────────────────────
 def speak(text: str):
     """Ovozli chiqish — non-blocking"""
-    _speech_queue.put(text)
+    buf = getattr(_collect, "buf", None)
+    if buf is not None:
+        buf.append(text)
+        return
+    from modules.core import tracer
+    # Trace ID navbatga qo'yilgan paytda olinadi — ijro keyinroq bo'lsa ham
+    _speech_queue.put((text, tracer.current()))
 
 
 def speak_and_wait(text: str):
     """Sinxron ovozli chiqish — tugaguncha kutadi"""
     speak(text)
-    _speech_queue.join()
+    if getattr(_collect, "buf", None) is None:
+        _speech_queue.join()
+
+
+@contextmanager
+def collect_speech():
+    """
+    Joriy thread dagi speak() chaqiruvlari navbatga emas, ro'yxatga tushadi —
+    ko'p qadamli reja oxirida bitta umumiy javob aytish uchun.
+    """
+    prev, _collect.buf = getattr(_collect, "buf", None), []
+    try:
+        yield _collect.buf
+    finally:
+        _collect.buf = prev
 
 
 def stop_speaking():
@@ -7,6 +7,10 @@ JARVIS — Web Xizmatlari
 • Trafik             — nominatim.openstreetmap.org (bepul)
 """
 import re
+
+from modules.core  import smart_cache, limiters, RateLimited
+from modules.slots import CURRENCY_NAMES, LANG_MAP, extract
+
 try:
     import requests
     REQUESTS_OK = True
@@ -23,53 +27,56 @@ except ImportError:
 # ══════════════════════════════════════════════════════════════════════
 #  VALYUTA KURSLARI
 # ══════════════════════════════════════════════════════════════════════
-# Til → valyuta kodi xaritasi
-CURRENCY_NAMES = {
-    "dollar": "USD", "usd": "USD", "amerikan": "USD",
-    "euro": "EUR", "evro": "EUR", "yevro": "EUR",
-    "rub": "RUB", "rubl": "RUB", "rossiya": "RUB",
-    "som": "UZS", "so'm": "UZS", "uzs": "UZS",
-    "tenge": "KZT", "kazak": "KZT",
-    "lira": "TRY", "turk": "TRY",
-    "yuan": "CNY", "xitoy": "CNY",
-    "pound": "GBP", "funt": "GBP", "britaniya": "GBP",
-    "yen": "JPY", "yapon": "JPY",
-    "dirham": "AED", "arab": "AED",
-}
+# Valyuta/til lug'atlari (CURRENCY_NAMES, LANG_MAP) — modules/slots.py da
+
+class RatesUnavailable(Exception):
+    """er-api "success" qaytarmadi"""
+
+
+def _fetch_rates(base: str) -> dict:
+    """Bitta bazaviy valyuta uchun barcha kurslar (keshga tushadi)"""
+    if not limiters["er-api"].acquire(timeout=3):
+        raise RateLimited("er-api")
+    url  = f"https://open.er-api.com/v6/latest/{base.upper()}"
+    data = requests.get(url, timeout=6).json()
+    if data.get("result") != "success":
+        raise RatesUnavailable(base)
+    return data.get("rates", {})
 
 
 def get_currency_rate(from_cur: str = "USD", to_cur: str = "UZS",
                       amount: float = 1.0) -> str:
-    """Valyuta kursini olish"""
+    """Valyuta kursini olish (kurslar jadvali bazaviy valyuta bo'yicha keshlanadi)"""
     if not REQUESTS_OK:
         return "requests kutubxonasi o'rnatilmagan"
     try:
-        url  = f"https://open.er-api.com/v6/latest/{from_cur.upper()}"
-        resp = requests.get(url, timeout=6)
-        data = resp.json()
-        if data.get("result") != "success":
-            return "Valyuta ma'lumotini olib bo'lmadi"
-        rates = data.get("rates", {})
-        to_upper = to_cur.upper()
-        if to_upper not in rates:
-            return f"{to_upper} valyutasi topilmadi"
-        rate   = rates[to_upper]
-        result = rate * amount
-        if result > 1000:
-            return (f"1 {from_cur.upper()} = "
-                    f"{rate:,.0f} {to_upper}. "
-                    f"{amount:g} {from_cur.upper()} = "
-                    f"{result:,.0f} {to_upper}")
-        else:
-            return (f"1 {from_cur.upper()} = "
-                    f"{rate:.4f} {to_upper}. "
-                    f"{amount:g} {from_cur.upper()} = "
-                    f"{result:.4f} {to_upper}")
+        rates = smart_cache.get_or_compute(f"rates_{from_cur.upper()}", "currency",
+                                           lambda: _fetch_rates(from_cur))
     except requests.Timeout:
         return "Internetga ulanib bo'lmadi"
+    except RateLimited:
+        return "Juda ko'p so'rov, biroz kuting"
+    except RatesUnavailable:
+        return "Valyuta ma'lumotini olib bo'lmadi"
     except Exception as e:
         return f"Xato: {e}"
 
+    to_upper = to_cur.upper()
+    if to_upper not in rates:
+        return f"{to_upper} valyutasi topilmadi"
+    rate   = rates[to_upper]
+    result = rate * amount
+    if result > 1000:
+        return (f"1 {from_cur.upper()} = "
+                f"{rate:,.0f} {to_upper}. "
+                f"{amount:g} {from_cur.upper()} = "
+                f"{result:,.0f} {to_upper}")
+    else:
+        return (f"1 {from_cur.upper()} = "
+                f"{rate:.4f} {to_upper}. "
+                f"{amount:g} {from_cur.upper()} = "
+                f"{result:.4f} {to_upper}")
+
 
 def parse_currency_cmd(cmd: str) -> str:
     """
@@ -78,33 +85,11 @@ def parse_currency_cmd(cmd: str) -> str:
     "1000 so'm necha dollar" → UZS → USD, 1000
     "evrodan dollarga" → EUR → USD
     """
-    # Miqdorni ajratish
-    amount = 1.0
-    m = re.search(r'(\d[\d\s,.]*)', cmd)
-    if m:
-        try:
-            amount = float(m.group(1).replace(" ", "").replace(",", "."))
-        except ValueError:
-            pass
-
-    # Valyutalarni topish
-    found = []
-    for name, code in CURRENCY_NAMES.items():
-        if name in cmd:
-            if code not in found:
-                found.append(code)
-
-    if not found:
+    slots = extract(cmd)
+    if not slots.currency_pair:
         return "Qaysi valyutani ko'rishni xohlaysiz?"
-
-    from_cur = found[0] if len(found) >= 1 else "USD"
-    to_cur   = found[1] if len(found) >= 2 else "UZS"
-
-    # "necha dollar" iborasi bo'lsa — yo'nalishni teskari qilish
-    if any(w in cmd for w in ["necha dollar", "necha euro", "necha evro"]):
-        from_cur, to_cur = to_cur, from_cur
-
-    return get_currency_rate(from_cur, to_cur, amount)
+    from_cur, to_cur = slots.currency_pair
+    return get_currency_rate(from_cur, to_cur, slots.amount or 1.0)
 
 
 # ══════════════════════════════════════════════════════════════════════
@@ -144,35 +129,44 @@ def get_news(topic: str | None = None, count: int = 3) -> str:
         return f"Yangiliklar olib bo'lmadi: {e}"
 
 
-def get_news_rss(topic: str | None = None, count: int = 3) -> str:
-    """RSS orqali yangiliklar (API key shart emas)"""
-    if not REQUESTS_OK:
-        return "requests kutubxonasi yo'q"
-    try:
-        import xml.etree.ElementTree as ET
+def _fetch_news_rss(topic: str | None, count: int) -> str:
+    """Google News RSS → o'qiladigan matn (keshga tushadi)"""
+    import xml.etree.ElementTree as ET
 
-        if topic:
-            url = f"https://news.google.com/rss/search?q={topic}&hl=ru&gl=UZ"
-        else:
-            url = "https://news.google.com/rss?hl=ru&gl=UZ&ceid=UZ:ru"
+    if not limiters["google-rss"].acquire(timeout=3):
+        raise RateLimited("google-rss")
+    if topic:
+        url = f"https://news.google.com/rss/search?q={topic}&hl=ru&gl=UZ"
+    else:
+        url = "https://news.google.com/rss?hl=ru&gl=UZ&ceid=UZ:ru"
 
-        resp = requests.get(url, timeout=8,
-                            headers={"User-Agent": "Mozilla/5.0"})
-        root = ET.fromstring(resp.content)
-        items = root.findall(".//item")[:count]
+    resp = requests.get(url, timeout=8,
+                        headers={"User-Agent": "Mozilla/5.0"})
+    root = ET.fromstring(resp.content)
+    items = root.findall(".//item")[:count]
 
-        if not items:
-            return "Yangiliklar topilmadi"
+    if not items:
+        return "Yangiliklar topilmadi"
 
-        lines = []
-        for i, item in enumerate(items, 1):
-            title = item.findtext("title", "—")
-            # Google RSS da <source> kelib qo'shiladi — tozalaymiz
-            title = re.sub(r'\s*-\s*[^-]+$', '', title)[:90]
-            lines.append(f"{i}. {title}")
+    lines = []
+    for i, item in enumerate(items, 1):
+        title = item.findtext("title", "—")
+        # Google RSS da <source> kelib qo'shiladi — tozalaymiz
+        title = re.sub(r'\s*-\s*[^-]+$', '', title)[:90]
+        lines.append(f"{i}. {title}")
+
+    return "Yangiliklar:\n" + "\n".join(lines)
 
-        return "Yangiliklar:\n" + "\n".join(lines)
 
+def get_news_rss(topic: str | None = None, count: int = 3) -> str:
+    """RSS orqali yangiliklar (API key shart emas; mavzu bo'yicha keshlanadi)"""
+    if not REQUESTS_OK:
+        return "requests kutubxonasi yo'q"
+    key = f"news_{(topic or '').lower()}_{count}"
+    try:
+        return smart_cache.get_or_compute(key, "news", lambda: _fetch_news_rss(topic, count))
+    except RateLimited:
+        return "Juda ko'p so'rov, biroz kuting"
     except Exception as e:
         return f"Yangiliklar olib bo'lmadi: {e}"
 
@@ -180,21 +174,6 @@ def get_news_rss(topic: str | None = None, count: int = 3) -> str:
 # ══════════════════════════════════════════════════════════════════════
 #  TARJIMA
 # ══════════════════════════════════════════════════════════════════════
-LANG_MAP = {
-    "ingliz": "en", "inglizcha": "en", "english": "en", "en": "en",
-    "o'zbek": "uz", "o'zbekcha": "uz", "uzbek": "uz", "uz": "uz",
-    "rus": "ru", "ruscha": "ru", "russian": "ru", "ru": "ru",
-    "nemis": "de", "nemischa": "de", "german": "de",
-    "fransuz": "fr", "fransuzcha": "fr", "french": "fr",
-    "arab": "ar", "arabcha": "ar", "arabic": "ar",
-    "xitoy": "zh-CN", "xitoycha": "zh-CN", "chinese": "zh-CN",
-    "yapon": "ja", "yaponcha": "ja", "japanese": "ja",
-    "turk": "tr", "turkcha": "tr", "turkish": "tr",
-    "koreys": "ko", "koreyscha": "ko", "korean": "ko",
-    "ispan": "es", "ispancha": "es", "spanish": "es",
-}
-
-
 def translate_text(text: str, target_lang: str = "en",
                    source_lang: str = "auto") -> str:
     """
@@ -219,12 +198,8 @@ def parse_translate_cmd(cmd: str) -> str:
     "bu matnni ruscha tarjima qil" → translate(text, "ru")
     "tarjima qil: ..." → translate(...)
     """
-    # Maqsad tilni topish
-    target = "en"   # Default
-    for lang_name, lang_code in LANG_MAP.items():
-        if lang_name in cmd:
-            target = lang_code
-            break
+    # Maqsad til — birinchi tilga ishora, aks holda ingliz
+    target = extract(cmd).language or "en"
 
     # Tarjima qilinishi kerak bo'lgan matnni topish
     text = ""
@@ -24,7 +24,7 @@ python -m pip install --upgrade pip --quiet
 echo [2/4] Asosiy kutubxonalar o'rnatilmoqda...
 pip install edge-tts pygame SpeechRecognition requests anthropic --quiet
 pip install pyautogui pycaw comtypes Pillow --quiet
-pip install psutil pygetwindow pyperclip --quiet
+pip install psutil pygetwindow pyperclip numpy --quiet
 pip install deep-translator spotipy win10toast python-dotenv --quiet
 echo [OK] Asosiy kutubxonalar tayyor
 